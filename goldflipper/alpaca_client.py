@@ -3,6 +3,7 @@ import os
 import logging
 from alpaca.trading.client import TradingClient
 from goldflipper.config.config import config
+from goldflipper.brokerage.client_registry import get_client_registry
 
 # Debugging output - only log if needed
 # print(f"Python path: {sys.path}")
@@ -13,28 +14,20 @@ from goldflipper.config.config import config
 # ==================================================
 # This module sets up the Alpaca trading client to allow Goldflipper to place real
 # buy and sell orders. The API key, secret key, and base URL are loaded from
-# the configuration file locally within the get_alpaca_client function.
+# the configuration file by the client registry (goldflipper.brokerage.client_registry).
 
-_client_instance = None
+def get_alpaca_client(account_name=None):
+    """
+    Shared trading client for the active account (or a named account).
 
-def get_alpaca_client():
-    active_account = config.get('alpaca', 'active_account')
-    account = config.get('alpaca', 'accounts')[active_account]
-    
-    # Only create new instance in debug mode, otherwise use singleton
-    if logging.getLogger().getEffectiveLevel() <= logging.DEBUG:
-        logging.debug(f"Creating new Alpaca client for account: '{active_account}' (debug mode: new instance per call)")
-        return create_client_from_account(account, active_account)
-    
-    global _client_instance
-    if _client_instance is None:
-        logging.info(f"Initializing Alpaca client for account: '{active_account}'")
-        _client_instance = create_client_from_account(account, active_account)
-    return _client_instance
+    Clients are pooled by the client registry and reused across calls,
+    including in debug mode.
+    """
+    return get_client_registry().get('trading', account_name)
 
 def reset_client():
-    global _client_instance
-    _client_instance = None
+    """Re-resolve the active account and credentials on next use (after an account switch or settings reload)"""
+    get_client_registry().reset()
     logging.debug("Alpaca trading client reset")
 
 def create_client_from_account(account, active_account):
@@ -0,0 +1 @@
+# Brokerage state snapshots and order handling
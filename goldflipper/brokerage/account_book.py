@@ -0,0 +1,122 @@
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from goldflipper.alpaca_client import get_alpaca_client
+from goldflipper.brokerage.client_registry import current_account
+from goldflipper.config.config import config
+
+
+class AccountBook:
+    """
+    Buying power from one get_account call, less locally reserved order notional.
+
+    Every entry order reserves its notional before it is submitted, so plays
+    triggering in the same cycle are admitted against what the others are
+    about to commit without asking the broker again. Reservations made before
+    a snapshot are dropped on refresh, since the broker's buying power already
+    reflects those orders. Without a snapshot every order is admitted and the
+    broker has the final say.
+    """
+
+    def __init__(self):
+        self.buying_power: Optional[float] = None
+        self.taken_at: Optional[datetime] = None
+        self.reservations: Dict[str, Tuple[float, datetime]] = {}
+        self.rejections = 0
+        self._lock = threading.Lock()
+
+    def refresh(self, client=None) -> Optional[float]:
+        """Re-read buying power from the broker; returns it, or None if the call failed"""
+        client = client or get_alpaca_client()
+        taken_at = datetime.now(timezone.utc)
+        try:
+            account = client.get_account()
+        except Exception as e:
+            logging.warning(f"Account snapshot failed, admitting orders without a buying power check: {str(e)}")
+            with self._lock:
+                self.buying_power = None
+                self.taken_at = None
+            return None
+
+        buying_power = getattr(account, 'options_buying_power', None) or account.buying_power
+        with self._lock:
+            self.buying_power = float(buying_power)
+            self.taken_at = taken_at
+            self.reservations = {
+                key: reservation for key, reservation in self.reservations.items()
+                if reservation[1] >= taken_at
+            }
+        logging.debug(f"Account snapshot: buying power ${self.buying_power:,.2f}")
+        return self.buying_power
+
+    def available(self) -> Optional[float]:
+        """Buying power less outstanding reservations, or None without a snapshot"""
+        with self._lock:
+            return self._available()
+
+    def _available(self) -> Optional[float]:
+        if self.buying_power is None:
+            return None
+        return self.buying_power - sum(notional for notional, _ in self.reservations.values())
+
+    def reserve(self, key: str, notional: float) -> bool:
+        """
+        Reserve buying power for an order.
+
+        Args:
+            key: Identifies the order (e.g. the play id); reserving again replaces it
+            notional: Dollar amount the order can commit
+
+        Returns:
+            bool: True if the order fits in the available buying power
+        """
+        with self._lock:
+            self.reservations.pop(key, None)
+            available = self._available()
+            if available is not None and notional > available:
+                self.rejections += 1
+                return False
+            self.reservations[key] = (notional, datetime.now(timezone.utc))
+            return True
+
+    def release(self, key: str):
+        """Drop a reservation (e.g. the order was never placed)"""
+        with self._lock:
+            self.reservations.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'buying_power': self.buying_power,
+                'available': self._available(),
+                'reservations': len(self.reservations),
+                'rejections': self.rejections
+            }
+
+
+# One book per account (see client_registry.use_account)
+_account_books: Dict[str, AccountBook] = {}
+_account_books_lock = threading.Lock()
+
+
+def account_book_enabled() -> bool:
+    return config.get('orders', 'buying_power_check', 'enabled', default=False)
+
+
+def get_account_book() -> AccountBook:
+    """Account book for the current account"""
+    account = current_account()
+    with _account_books_lock:
+        if account not in _account_books:
+            _account_books[account] = AccountBook()
+        return _account_books[account]
+
+
+def refresh_account_book(client=None) -> Optional[AccountBook]:
+    """Refresh the current account's book if the buying power check is enabled"""
+    if not account_book_enabled():
+        return None
+    book = get_account_book()
+    book.refresh(client)
+    return book
@@ -0,0 +1,183 @@
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+from goldflipper.config.config import config
+from goldflipper.brokerage.client_registry import current_account
+
+
+@dataclass(order=True)
+class RetryAction:
+    """A brokerage action retried until it succeeds, runs out of attempts or passes its deadline"""
+    next_attempt_at: float
+    seq: int
+    key: str = field(compare=False)
+    func: Callable[[], Any] = field(compare=False)
+    deadline: float = field(compare=False)
+    max_attempts: int = field(compare=False)
+    attempts: int = field(default=0, compare=False)
+    on_failure: Optional[Callable[['RetryAction'], None]] = field(default=None, compare=False)
+
+
+class ActionQueue:
+    """
+    Background retry queue for brokerage actions such as closes and cancels.
+
+    Actions are keyed (e.g. by play) so the same action is never queued twice,
+    and callers can skip work whose retry is still in flight. A worker thread
+    runs each action when it is due; an action succeeds when it returns a
+    truthy value and is otherwise rescheduled with exponential backoff and
+    jitter, so retries overlap with the monitoring loop instead of blocking it.
+    """
+
+    def __init__(self, base_delay: float = 2.0, max_delay: float = 30.0, jitter: float = 0.25):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.logger = logging.getLogger(__name__)
+        self._heap = []
+        self._keys = set()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._worker = None
+        self.metrics: Dict[str, int] = {
+            'submitted': 0,
+            'retries': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'expired': 0
+        }
+
+    def submit(self, key: str, func: Callable[[], Any], delay: Optional[float] = None,
+               deadline_seconds: float = 60.0, max_attempts: int = 3,
+               on_failure: Optional[Callable[[RetryAction], None]] = None) -> bool:
+        """
+        Queue an action to run in the background.
+
+        Args:
+            key: Identifies the action; a key that is already queued is not queued again
+            func: Callable returning truthy on success
+            delay: Seconds before the first attempt (defaults to base_delay)
+            deadline_seconds: Give up once this much time has passed since submission
+            max_attempts: Give up after this many attempts
+            on_failure: Called with the action when it is abandoned
+
+        Returns:
+            bool: True if queued, False if an action with this key is already pending
+        """
+        now = time.monotonic()
+        # Run the action in the caller's context (e.g. its account)
+        func = lambda ctx=copy_context(), target=func: ctx.run(target)
+        with self._cond:
+            if key in self._keys:
+                return False
+            action = RetryAction(
+                next_attempt_at=now + (self.base_delay if delay is None else delay),
+                seq=next(self._seq),
+                key=key,
+                func=func,
+                deadline=now + deadline_seconds,
+                max_attempts=max_attempts,
+                on_failure=on_failure
+            )
+            heapq.heappush(self._heap, action)
+            self._keys.add(key)
+            self.metrics['submitted'] += 1
+            self._ensure_worker()
+            self._cond.notify()
+        return True
+
+    def is_pending(self, key: str) -> bool:
+        """Whether an action with this key is queued or running"""
+        with self._cond:
+            return key in self._keys
+
+    def depth(self) -> int:
+        """Number of queued or running actions"""
+        with self._cond:
+            return len(self._keys)
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and retry counters"""
+        with self._cond:
+            return dict(self.metrics, depth=len(self._keys))
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before the next attempt after `attempts` failures"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+            self._worker.start()
+
+    def _next_due(self) -> RetryAction:
+        with self._cond:
+            while True:
+                if self._heap:
+                    wait = self._heap[0].next_attempt_at - time.monotonic()
+                    if wait <= 0:
+                        return heapq.heappop(self._heap)
+                    self._cond.wait(timeout=wait)
+                else:
+                    self._cond.wait()
+
+    def _worker_loop(self):
+        while True:
+            action = self._next_due()
+            action.attempts += 1
+            try:
+                succeeded = bool(action.func())
+            except Exception as e:
+                self.logger.error(f"Queued action {action.key} raised on attempt {action.attempts}: {str(e)}")
+                succeeded = False
+            self._finish(action, succeeded)
+
+    def _finish(self, action: RetryAction, succeeded: bool):
+        now = time.monotonic()
+        abandoned = None
+        with self._cond:
+            if succeeded:
+                self.metrics['succeeded'] += 1
+                self._keys.discard(action.key)
+                self.logger.info(f"Queued action {action.key} succeeded on attempt {action.attempts}")
+            elif action.attempts >= action.max_attempts or now >= action.deadline:
+                self.metrics['failed' if action.attempts >= action.max_attempts else 'expired'] += 1
+                self._keys.discard(action.key)
+                abandoned = action
+            else:
+                self.metrics['retries'] += 1
+                action.next_attempt_at = min(now + self.backoff(action.attempts), action.deadline)
+                heapq.heappush(self._heap, action)
+
+        if abandoned:
+            self.logger.error(f"Queued action {action.key} abandoned after {action.attempts} attempts")
+            if abandoned.on_failure:
+                try:
+                    abandoned.on_failure(abandoned)
+                except Exception as e:
+                    self.logger.error(f"Failure handler for {action.key} raised: {str(e)}")
+
+
+# One queue per account (see client_registry.use_account)
+_action_queues: Dict[str, ActionQueue] = {}
+_action_queues_lock = threading.Lock()
+
+
+def get_action_queue() -> ActionQueue:
+    """Action queue for the current account, configured from monitoring settings"""
+    account = current_account()
+    with _action_queues_lock:
+        if account not in _action_queues:
+            _action_queues[account] = ActionQueue(
+                base_delay=config.get('monitoring', 'retry_delay', default=2),
+                max_delay=config.get('monitoring', 'action_queue', 'max_delay', default=30),
+                jitter=config.get('monitoring', 'action_queue', 'jitter', default=0.25)
+            )
+        return _action_queues[account]
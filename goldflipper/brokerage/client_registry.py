@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from alpaca.data.historical import StockHistoricalDataClient
+from alpaca.data.historical.option import OptionHistoricalDataClient
+from goldflipper.config.config import config
+
+CLIENT_TYPES = ('trading', 'stock_data', 'option_data')
+
+# Account the current thread / task is working for (multi-account mode); None means the active account
+_account_override: ContextVar[Optional[str]] = ContextVar('goldflipper_account', default=None)
+
+
+@contextmanager
+def use_account(account_name: str):
+    """Route get_alpaca_client() and per-account state to an account within this context"""
+    token = _account_override.set(account_name)
+    try:
+        yield account_name
+    finally:
+        _account_override.reset(token)
+
+
+def current_account() -> str:
+    """Account the caller is working for"""
+    return get_client_registry().active_account()
+
+
+def _fingerprint(account: dict) -> str:
+    """Identifies an account's credentials without keeping them in a cache key"""
+    raw = f"{account.get('api_key')}|{account.get('secret_key')}|{account.get('base_url')}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ClientRegistry:
+    """
+    Shared Alpaca clients keyed by (account, client type).
+
+    All clients for an account share one HTTP session, so the trading and
+    data APIs reuse pooled keep-alive connections instead of handshaking per
+    client. The active account is resolved once and cached until reset()
+    (account switch or settings reload); clients are rebuilt only for
+    accounts whose credentials changed.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._active_account: Optional[str] = None
+        self._lock = threading.RLock()
+        # Optional wrapper applied to new trading clients, as wrapper(client, account_name)
+        self.trading_client_wrapper: Optional[Callable[[Any, str], Any]] = None
+
+    def _make_session(self) -> requests.Session:
+        pool_size = config.get('alpaca', 'connection_pool', 'pool_size', default=10)
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=False)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Connection'] = 'keep-alive'
+        return session
+
+    def _account_settings(self, account_name: str) -> dict:
+        accounts = config.get('alpaca', 'accounts') or {}
+        if account_name not in accounts:
+            raise KeyError(f"Alpaca account '{account_name}' is not configured")
+        return accounts[account_name]
+
+    def _check_credentials(self, account_name: str, account: dict):
+        """Drop an account's clients and session if its credentials changed"""
+        fingerprint = _fingerprint(account)
+        if self._fingerprints.get(account_name) not in (None, fingerprint):
+            logging.info(f"Credentials changed for account '{account_name}', rebuilding clients")
+            self._drop_account(account_name)
+        self._fingerprints[account_name] = fingerprint
+
+    def _drop_account(self, account_name: str):
+        for key in [key for key in self._clients if key[0] == account_name]:
+            del self._clients[key]
+        session = self._sessions.pop(account_name, None)
+        if session:
+            session.close()
+
+    def active_account(self) -> str:
+        """
+        Name of the account in use: the use_account() override if set,
+        otherwise the configured active account (resolved once per reset).
+        """
+        override = _account_override.get()
+        if override:
+            return override
+        with self._lock:
+            if self._active_account is None:
+                self._active_account = config.get('alpaca', 'active_account')
+                self._check_credentials(self._active_account, self._account_settings(self._active_account))
+            return self._active_account
+
+    def account_credentials(self, account_name: Optional[str] = None) -> dict:
+        """Settings (api_key, secret_key, base_url, ...) for an account"""
+        return self._account_settings(account_name or self.active_account())
+
+    def get(self, client_type: str = 'trading', account_name: Optional[str] = None):
+        """
+        Shared client of the given type for an account (default: the active account).
+
+        Args:
+            client_type: 'trading', 'stock_data' or 'option_data'
+            account_name: Account key under alpaca.accounts
+        """
+        if client_type not in CLIENT_TYPES:
+            raise ValueError(f"Unknown client type '{client_type}'")
+
+        with self._lock:
+            account_name = account_name or self.active_account()
+            key = (account_name, client_type)
+            client = self._clients.get(key)
+            if client is not None:
+                return client
+
+            account = self._account_settings(account_name)
+            self._check_credentials(account_name, account)
+            client = self._create(client_type, account_name, account)
+            session = self._sessions.get(account_name)
+            if session is None:
+                session = self._sessions[account_name] = self._make_session()
+            client._session = session
+            if client_type == 'trading' and self.trading_client_wrapper:
+                client = self.trading_client_wrapper(client, account_name)
+            self._clients[key] = client
+            return client
+
+    def _create(self, client_type: str, account_name: str, account: dict):
+        if client_type == 'trading':
+            # Imported here: alpaca_client delegates to this registry
+            from goldflipper.alpaca_client import create_client_from_account
+            return create_client_from_account(account, account_name)
+
+        logging.debug(f"Creating Alpaca {client_type} client for account: '{account_name}'")
+        client_cls = StockHistoricalDataClient if client_type == 'stock_data' else OptionHistoricalDataClient
+        return client_cls(api_key=account['api_key'], secret_key=account['secret_key'])
+
+    def reset(self, account_name: Optional[str] = None):
+        """
+        Forget the active account and re-read settings on next use.
+
+        With an account name, that account's clients are also discarded.
+        """
+        with self._lock:
+            self._active_account = None
+            if account_name:
+                self._drop_account(account_name)
+                self._fingerprints.pop(account_name, None)
+
+
+_client_registry: Optional[ClientRegistry] = None
+
+
+def get_client_registry() -> ClientRegistry:
+    """Shared client registry"""
+    global _client_registry
+    if _client_registry is None:
+        _client_registry = ClientRegistry()
+    return _client_registry
@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional
+from alpaca.trading.models import OptionContract
+from alpaca.trading.requests import GetOptionContractsRequest
+from alpaca.trading.enums import AssetStatus
+from goldflipper.alpaca_client import get_alpaca_client
+from goldflipper.utils.atomic_io import atomic_write_json
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'state', 'contract_cache.json')
+
+# Largest page Alpaca serves for option contract listings
+CONTRACTS_PAGE_LIMIT = 10000
+
+
+class ContractCache:
+    """
+    Process-wide option contract metadata, keyed by OCC symbol.
+
+    Contracts are prefetched in bulk for all new plays and kept for one
+    trading day; the cache (and its on-disk copy) is discarded when the date
+    changes so status and tradability are re-read daily.
+    """
+
+    def __init__(self, cache_file: Optional[str] = DEFAULT_CACHE_FILE):
+        self.cache_file = cache_file
+        self.contracts: Dict[str, OptionContract] = {}
+        self.refreshed_on: Optional[date] = None
+        self.prefetched_on: Optional[date] = None
+        self.api_calls = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            if data.get('refreshed_on') != date.today().isoformat():
+                return
+            self.contracts = {
+                symbol: OptionContract.model_validate(contract)
+                for symbol, contract in data.get('contracts', {}).items()
+            }
+            self.refreshed_on = date.today()
+            if data.get('prefetched_on') == date.today().isoformat():
+                self.prefetched_on = date.today()
+            logging.info(f"Loaded {len(self.contracts)} cached option contracts")
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable contract cache {self.cache_file}: {str(e)}")
+
+    def _save(self):
+        if not self.cache_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            atomic_write_json(self.cache_file, {
+                'refreshed_on': self.refreshed_on.isoformat() if self.refreshed_on else None,
+                'prefetched_on': self.prefetched_on.isoformat() if self.prefetched_on else None,
+                'contracts': {
+                    symbol: contract.model_dump(mode='json')
+                    for symbol, contract in self.contracts.items()
+                }
+            })
+        except Exception as e:
+            logging.warning(f"Could not save contract cache: {str(e)}")
+
+    def _roll_day(self):
+        if self.refreshed_on != date.today():
+            self.contracts = {}
+            self.refreshed_on = date.today()
+
+    def is_prefetched(self) -> bool:
+        """Whether today's bulk prefetch has run"""
+        return self.prefetched_on == date.today()
+
+    def get(self, occ_symbol: Optional[str]) -> Optional[OptionContract]:
+        """Cached contract for an OCC symbol, or None"""
+        if not occ_symbol:
+            return None
+        with self._lock:
+            self._roll_day()
+            return self.contracts.get(occ_symbol)
+
+    def put(self, contract: OptionContract):
+        with self._lock:
+            self._roll_day()
+            self.contracts[contract.symbol] = contract
+            self._save()
+
+    def prefetch(self, plays: Iterable[dict], client=None) -> int:
+        """
+        Fetch contracts for many plays with one listing per underlying, expiry and type.
+
+        Returns:
+            int: Number of plays whose contract is now cached
+        """
+        client = client or get_alpaca_client()
+        groups = defaultdict(list)
+        for play in plays:
+            try:
+                key = (
+                    play['symbol'],
+                    datetime.strptime(play['expiration_date'], "%m/%d/%Y").date(),
+                    play['trade_type'].lower()
+                )
+                groups[key].append(play)
+            except (KeyError, ValueError, AttributeError) as e:
+                logging.warning(f"Skipping contract prefetch for malformed play: {str(e)}")
+
+        fetched = {}
+        for (symbol, expiration_date, contract_type), group in groups.items():
+            strikes = [float(play['strike_price']) for play in group]
+            page_token = None
+            try:
+                while True:
+                    req = GetOptionContractsRequest(
+                        underlying_symbols=[symbol],
+                        expiration_date=expiration_date,
+                        strike_price_gte=str(min(strikes)),
+                        strike_price_lte=str(max(strikes)),
+                        type=contract_type,
+                        status=AssetStatus.ACTIVE,
+                        limit=CONTRACTS_PAGE_LIMIT,
+                        page_token=page_token
+                    )
+                    self.api_calls += 1
+                    res = client.get_option_contracts(req)
+                    for contract in res.option_contracts or []:
+                        fetched[contract.symbol] = contract
+                    page_token = getattr(res, 'next_page_token', None)
+                    if not page_token:
+                        break
+            except Exception as e:
+                logging.warning(f"Contract prefetch failed for {symbol} {expiration_date} {contract_type}: {str(e)}")
+
+        with self._lock:
+            self._roll_day()
+            self.contracts.update(fetched)
+            self.prefetched_on = date.today()
+            self._save()
+
+        wanted = {play.get('option_contract_symbol') for group in groups.values() for play in group}
+        cached = len([symbol for symbol in wanted if symbol in self.contracts])
+        logging.info(f"Contract prefetch: {cached}/{len(wanted)} play contracts cached "
+                     f"({len(fetched)} contracts, {self.api_calls} listing calls)")
+        return cached
+
+
+_contract_cache: Optional[ContractCache] = None
+
+
+def get_contract_cache() -> ContractCache:
+    """Shared contract cache"""
+    global _contract_cache
+    if _contract_cache is None:
+        _contract_cache = ContractCache()
+    return _contract_cache
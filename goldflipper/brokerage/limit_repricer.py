@@ -0,0 +1,126 @@
+import logging
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from alpaca.trading.requests import ReplaceOrderRequest
+from goldflipper.config.config import config
+
+# Order states in which a limit order is still working and can be replaced
+WORKING_ORDER_STATUSES = {'new', 'accepted', 'pending_new', 'partially_filled'}
+
+
+def round_to_tick(price: float) -> float:
+    """Round a buy limit up to the option tick size ($0.05 at or above $3, else $0.01)"""
+    tick = 0.05 if price >= 3 else 0.01
+    return round(math.ceil(round(price / tick, 6)) * tick, 2)
+
+
+class LimitRepricer:
+    """
+    Walks working limit entry orders toward the mid or ask over a time budget.
+
+    The budget is split into equal steps; at step n of N the limit is moved
+    n/N of the way from the original price to the current target quote. An order is cancelled
+    once the budget runs out, or when the next price would exceed the maximum
+    slippage from the original limit. Repricing state is kept in the play's
+    status so it survives restarts.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = settings or config.get('orders', 'limit_order', default={}) or {}
+        self.enabled = settings.get('timeout_enabled', False)
+        self.max_duration = settings.get('max_duration_minutes', 5) * 60
+        self.check_interval = settings.get('check_interval_seconds', 30)
+        self.target = settings.get('reprice_target', 'mid')
+        self.steps = max(1, settings.get('reprice_steps', 5))
+        self.max_slippage_pct = settings.get('max_slippage_pct', 10.0)
+
+    def plan(self, reprice_state: Dict[str, Any], current_limit: float, quote: Dict[str, float],
+             elapsed: float, since_last_check: Optional[float]) -> Dict[str, Any]:
+        """
+        Decide what to do with a working order.
+
+        Returns:
+            dict: {'action': 'wait' | 'hold' | 'replace' | 'cancel', 'price': float, 'reason': str}
+        """
+        if since_last_check is not None and since_last_check < self.check_interval:
+            return {'action': 'wait', 'reason': 'check interval not reached'}
+        if elapsed >= self.max_duration:
+            return {'action': 'cancel', 'reason': f"unfilled after {self.max_duration / 60:.1f} minutes"}
+
+        initial = reprice_state.get('initial_price', current_limit)
+        target = quote.get(self.target) or quote.get('ask')
+        if not target or target <= 0:
+            return {'action': 'hold', 'reason': f"no {self.target} quote"}
+
+        ceiling = initial * (1 + self.max_slippage_pct / 100)
+        step = min(self.steps, int(elapsed / (self.max_duration / self.steps)) + 1)
+        price = round_to_tick(initial + max(0.0, target - initial) * step / self.steps)
+        if price > ceiling:
+            return {'action': 'cancel', 'price': price,
+                    'reason': f"${price:.2f} exceeds max slippage (${ceiling:.2f})"}
+        if price <= current_limit:
+            return {'action': 'hold', 'price': current_limit, 'reason': 'limit already at step price'}
+        return {'action': 'replace', 'price': price, 'reason': f"step toward {self.target} ${target:.2f}"}
+
+    def reprice(self, client, play: Dict[str, Any], order, quote: Optional[Dict[str, float]],
+                now: Optional[datetime] = None) -> Optional[str]:
+        """
+        Reprice or cancel a play's working limit entry order.
+
+        Args:
+            client: Trading client
+            play: Play data; status fields are updated in place
+            order: Current Alpaca order for the play's entry
+            quote: The cycle's option quote for the contract
+
+        Returns:
+            The action taken ('replace' / 'cancel'), or None if nothing changed
+        """
+        if not self.enabled or order.status not in WORKING_ORDER_STATUSES or not order.limit_price:
+            return None
+
+        now = now or datetime.now(timezone.utc)
+        status = play.setdefault('status', {})
+        state = status.setdefault('reprice', {})
+        state.setdefault('initial_price', float(order.limit_price))
+        state.setdefault('started_at', (order.submitted_at or now).isoformat())
+        state.setdefault('base_client_order_id', status.get('client_order_id'))
+
+        started_at = datetime.fromisoformat(state['started_at'])
+        last_check = datetime.fromisoformat(state['last_check_at']) if state.get('last_check_at') else None
+        decision = self.plan(
+            state,
+            float(order.limit_price),
+            quote or {},
+            (now - started_at).total_seconds(),
+            (now - last_check).total_seconds() if last_check else None
+        )
+        if decision['action'] == 'wait':
+            return None
+        state['last_check_at'] = now.isoformat()
+
+        if decision['action'] == 'cancel':
+            logging.info(f"Cancelling limit entry {order.id} for {order.symbol}: {decision['reason']}")
+            client.cancel_order_by_id(order.id)
+            state['cancelled_reason'] = decision['reason']
+            return 'cancel'
+
+        if decision['action'] == 'replace':
+            steps = state.get('steps', 0) + 1
+            base_id = state.get('base_client_order_id')
+            client_order_id = f"{base_id}-r{steps}" if base_id else None
+            new_order = client.replace_order_by_id(
+                order.id,
+                ReplaceOrderRequest(limit_price=decision['price'], client_order_id=client_order_id)
+            )
+            logging.info(f"Repriced limit entry for {order.symbol}: ${float(order.limit_price):.2f} -> "
+                         f"${decision['price']:.2f} ({decision['reason']})")
+            state['steps'] = steps
+            status.update({
+                'order_id': str(new_order.id),
+                'order_status': new_order.status,
+                'client_order_id': new_order.client_order_id
+            })
+            return 'replace'
+        return None
@@ -0,0 +1,95 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+from alpaca.trading.requests import GetOrdersRequest
+from alpaca.trading.enums import QueryOrderStatus
+from goldflipper.alpaca_client import get_alpaca_client
+from goldflipper.config.config import config
+
+# Alpaca caps a single orders listing at 500 results
+MAX_ORDERS_PER_REQUEST = 500
+
+
+class OrderSnapshot:
+    """
+    Orders fetched in one listing call, indexed by order id and client_order_id.
+
+    Lookups for ids that are not in the snapshot fall back to an individual
+    get_order_by_id call, and the result is added to the snapshot.
+    """
+
+    def __init__(self, orders: Iterable[Any] = (), client=None):
+        self.client = client
+        self.by_id: Dict[str, Any] = {}
+        self.by_client_order_id: Dict[str, Any] = {}
+        self.fallback_lookups = 0
+        for order in orders:
+            self._add(order)
+
+    def _add(self, order):
+        self.by_id[str(order.id)] = order
+        if getattr(order, 'client_order_id', None):
+            self.by_client_order_id[order.client_order_id] = order
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, order_id) -> bool:
+        return str(order_id) in self.by_id
+
+    def get_order(self, order_id):
+        """Order by Alpaca id, from the snapshot or an individual lookup"""
+        order = self.by_id.get(str(order_id))
+        if order is not None:
+            return order
+
+        self.fallback_lookups += 1
+        logging.debug(f"Order {order_id} not in snapshot, fetching individually")
+        order = (self.client or get_alpaca_client()).get_order_by_id(order_id)
+        self._add(order)
+        return order
+
+    def get_by_client_order_id(self, client_order_id: str):
+        """Order by our client_order_id, or None if it is not in the snapshot"""
+        return self.by_client_order_id.get(client_order_id)
+
+
+def fetch_order_snapshot(symbols: Optional[Iterable[str]] = None, lookback_hours: Optional[float] = None,
+                         client=None) -> OrderSnapshot:
+    """
+    Fetch open and recently closed orders in a single request.
+
+    Args:
+        symbols: Optional contract symbols to restrict the listing to
+        lookback_hours: Only include orders submitted within this window
+                        (defaults to orders.reconciliation.lookback_hours)
+        client: Optional trading client (defaults to the active account's client)
+
+    Returns:
+        OrderSnapshot: Indexed orders. If the listing fails, the snapshot is
+                       empty and every lookup falls back to an individual call.
+    """
+    client = client or get_alpaca_client()
+    if lookback_hours is None:
+        lookback_hours = config.get('orders', 'reconciliation', 'lookback_hours', default=72)
+
+    symbols = sorted(set(s for s in (symbols or []) if s))
+    request = GetOrdersRequest(
+        status=QueryOrderStatus.ALL,
+        after=datetime.now(timezone.utc) - timedelta(hours=lookback_hours),
+        limit=MAX_ORDERS_PER_REQUEST,
+        symbols=symbols or None,
+        nested=False
+    )
+
+    try:
+        orders = client.get_orders(filter=request)
+    except Exception as e:
+        logging.warning(f"Order snapshot failed, falling back to per-order lookups: {str(e)}")
+        return OrderSnapshot(client=client)
+
+    if len(orders) >= MAX_ORDERS_PER_REQUEST:
+        logging.warning(f"Order snapshot hit the {MAX_ORDERS_PER_REQUEST}-order limit; "
+                        f"older orders will be fetched individually")
+    logging.debug(f"Order snapshot: {len(orders)} orders for {len(symbols)} symbols")
+    return OrderSnapshot(orders, client=client)
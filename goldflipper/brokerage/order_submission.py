@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from goldflipper.config.config import config
+
+# Orders in these states will never fill, so their client_order_id is spent
+DEAD_ORDER_STATUSES = {'canceled', 'expired', 'rejected', 'replaced', 'done_for_day', 'stopped', 'suspended'}
+
+# Upper bound on client_order_id attempts probed for one submission
+MAX_SUBMIT_ATTEMPTS = 10
+
+
+def make_client_order_id(play_id: str, action: str, attempt: int = 1) -> str:
+    """
+    Deterministic client_order_id for a play's order.
+
+    The same play, action ('open' / 'close') and attempt always produce the
+    same id, so a resubmission after a timeout can never create a second order.
+    """
+    digest = hashlib.sha1(play_id.encode('utf-8')).hexdigest()[:20]
+    return f"gf-{action}-{digest}-{attempt}"
+
+
+class LatencyRecorder:
+    """Rolling record of order submit latencies"""
+
+    def __init__(self, maxlen: int = 1000):
+        self._samples = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, symbol: str, seconds: float, ok: bool):
+        with self._lock:
+            self._samples.append((symbol, seconds, ok))
+        logging.info(f"Order submit latency for {symbol}: {seconds * 1000:.0f} ms{'' if ok else ' (failed)'}")
+
+    def summary(self) -> Dict[str, float]:
+        """Count, median, 95th percentile and max latency in milliseconds"""
+        with self._lock:
+            latencies = sorted(seconds * 1000 for _, seconds, _ in self._samples)
+        if not latencies:
+            return {'count': 0}
+        return {
+            'count': len(latencies),
+            'p50_ms': latencies[len(latencies) // 2],
+            'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            'max_ms': latencies[-1]
+        }
+
+
+submit_latency = LatencyRecorder()
+
+
+def _recoverable(order) -> bool:
+    """
+    Whether an existing order for our client_order_id is the one we meant to place.
+
+    Any live or filled order is: the id is derived from this play, so a fill
+    under it is the play's own position however long ago it was submitted.
+    """
+    return str(getattr(order.status, 'value', order.status)) not in DEAD_ORDER_STATUSES
+
+
+def _is_stale_fill(order, recovery_window: timedelta) -> bool:
+    """Whether an order filled longer ago than the recovery window (e.g. adopted after a restart)"""
+    if str(getattr(order.status, 'value', order.status)) != 'filled':
+        return False
+    submitted_at = getattr(order, 'submitted_at', None) or getattr(order, 'created_at', None)
+    return submitted_at is None or datetime.now(timezone.utc) - submitted_at > recovery_window
+
+
+def submit_order_idempotent(client, build_request: Callable[[str], Any], play_id: str, action: str,
+                            start_attempt: int = 1, symbol: Optional[str] = None) -> Tuple[Any, int]:
+    """
+    Submit an order under a deterministic client_order_id.
+
+    If the submit call fails (timeout, dropped connection, duplicate id), the
+    order is looked up by its client_order_id. A live or filled order is
+    returned as the result of the submission, however old the fill (a crash
+    between submit and saving the play must not open a second position). An
+    id already spent on a dead order moves on to the next attempt number.
+
+    Args:
+        client: Trading client
+        build_request: Builds the order request for a given client_order_id
+        play_id: Play identifier the id is derived from
+        action: 'open' or 'close'
+        start_attempt: First attempt number to try (the play's last used attempt)
+        symbol: Contract symbol, for latency records
+
+    Returns:
+        Tuple of (order, attempt number used)
+    """
+    window = timedelta(minutes=config.get('orders', 'submission', 'recovery_window_minutes', default=15))
+    attempt = start_attempt
+    for attempt in range(start_attempt, start_attempt + MAX_SUBMIT_ATTEMPTS):
+        client_order_id = make_client_order_id(play_id, action, attempt)
+        started = time.perf_counter()
+        try:
+            order = client.submit_order(build_request(client_order_id))
+            submit_latency.record(symbol or play_id, time.perf_counter() - started, True)
+            return order, attempt
+        except Exception as submit_error:
+            submit_latency.record(symbol or play_id, time.perf_counter() - started, False)
+            try:
+                existing = client.get_order_by_client_id(client_order_id)
+            except Exception:
+                raise submit_error
+            if _recoverable(existing):
+                if _is_stale_fill(existing, window):
+                    logging.warning(f"Submit for {client_order_id} failed ({submit_error}); adopting order "
+                                    f"{existing.id}, filled more than {window} ago (the play was likely not "
+                                    f"saved after an earlier submit)")
+                else:
+                    logging.warning(f"Submit for {client_order_id} failed ({submit_error}); "
+                                    f"using existing order {existing.id}")
+                return existing, attempt
+            logging.info(f"client_order_id {client_order_id} already used by a {existing.status} order, "
+                         f"trying next attempt")
+    raise RuntimeError(f"No free client_order_id for {play_id} after {MAX_SUBMIT_ATTEMPTS} attempts")
+
+
+class SubmissionEngine:
+    """
+    Runs independent submission jobs concurrently on a small worker pool.
+
+    Jobs are passed in groups; jobs within a group run one after another on
+    the same worker (for orders that depend on each other), while separate
+    groups run in parallel.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, max_workers)
+
+    def run(self, groups: Iterable[List[Any]], job: Callable[[Any], Any]) -> List[Any]:
+        """Run job(item) for every item, returning results in input order"""
+        groups = [list(group) for group in groups if group]
+        if self.max_workers == 1 or len(groups) <= 1:
+            return [job(item) for group in groups for item in group]
+
+        def run_group(group):
+            return [job(item) for item in group]
+
+        # Each group runs in a copy of the caller's context (e.g. its account)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(groups))) as pool:
+            futures = [pool.submit(copy_context().run, run_group, group) for group in groups]
+            results = [future.result() for future in futures]
+        return [result for group_results in results for result in group_results]
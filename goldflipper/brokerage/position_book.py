@@ -0,0 +1,118 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+from goldflipper.alpaca_client import get_alpaca_client
+from goldflipper.brokerage.client_registry import current_account
+from goldflipper.config.config import config
+
+
+def _is_missing_position_error(error: Exception) -> bool:
+    """Whether a get_open_position error means there is simply no position"""
+    return "position does not exist" in str(error) or getattr(error, 'status_code', None) == 404
+
+
+class PositionBook:
+    """
+    Open positions fetched in one get_all_positions call, indexed by contract symbol.
+
+    The book is rebuilt once per monitoring cycle. Symbols we trade during the
+    cycle are invalidated, and the next lookup for them goes to the broker
+    directly. A book without a snapshot (live=True) always looks up directly.
+    """
+
+    def __init__(self, positions: Iterable[Any] = (), taken_at: Optional[datetime] = None,
+                 client=None, live: bool = False):
+        self.client = client
+        self.live = live
+        self.taken_at = taken_at or datetime.now(timezone.utc)
+        self.positions: Dict[str, Any] = {position.symbol: position for position in positions}
+        self.invalidated = set()
+        self.live_lookups = 0
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, symbol) -> bool:
+        return self.get_position(symbol) is not None
+
+    def get_position(self, symbol: str):
+        """
+        Position for a contract symbol, or None if there is no open position.
+
+        Raises:
+            Exception: If a direct lookup fails for any reason other than
+                       the position not existing.
+        """
+        if not symbol:
+            return None
+        if not self.live and symbol not in self.invalidated:
+            return self.positions.get(symbol)
+
+        self.live_lookups += 1
+        try:
+            position = (self.client or get_alpaca_client()).get_open_position(symbol)
+        except Exception as e:
+            if not _is_missing_position_error(e):
+                raise
+            position = None
+
+        if not self.live:
+            if position is None:
+                self.positions.pop(symbol, None)
+            else:
+                self.positions[symbol] = position
+            self.invalidated.discard(symbol)
+        return position
+
+    def invalidate(self, symbol: str):
+        """Mark a symbol as changed by one of our orders since the snapshot"""
+        if symbol:
+            self.invalidated.add(symbol)
+
+    def note_fill(self, symbol: str, filled_at: Optional[datetime] = None):
+        """
+        Invalidate a symbol if an order filled after the snapshot was taken.
+
+        Fills that predate the snapshot are already reflected in it.
+        """
+        if filled_at is None or filled_at.tzinfo is None or filled_at >= self.taken_at:
+            self.invalidate(symbol)
+
+
+# One book per account (see client_registry.use_account)
+_position_books: Dict[str, PositionBook] = {}
+
+
+def refresh_position_book(client=None) -> PositionBook:
+    """
+    Rebuild the shared position book from a single get_all_positions call.
+
+    When the book is disabled or the listing fails, the shared book falls
+    back to direct per-symbol lookups.
+    """
+    account = current_account()
+    client = client or get_alpaca_client()
+
+    if not config.get('monitoring', 'position_book', 'enabled', default=True):
+        book = _position_books[account] = PositionBook(client=client, live=True)
+        return book
+
+    taken_at = datetime.now(timezone.utc)
+    try:
+        positions = client.get_all_positions()
+    except Exception as e:
+        logging.warning(f"Position snapshot failed, falling back to per-position lookups: {str(e)}")
+        book = _position_books[account] = PositionBook(client=client, live=True)
+        return book
+
+    book = _position_books[account] = PositionBook(positions, taken_at=taken_at, client=client)
+    logging.debug(f"Position snapshot for {account}: {len(book)} open positions")
+    return book
+
+
+def get_position_book() -> PositionBook:
+    """Position book for the current account and cycle (direct lookups until first refresh)"""
+    account = current_account()
+    if account not in _position_books:
+        _position_books[account] = PositionBook(live=True)
+    return _position_books[account]
@@ -0,0 +1,154 @@
+import logging
+import queue
+import threading
+from contextvars import copy_context
+from alpaca.trading.stream import TradingStream
+from goldflipper.brokerage.client_registry import get_client_registry
+
+# Trade update events that can settle a pending play
+SETTLING_EVENTS = {'fill', 'canceled', 'expired', 'rejected'}
+
+# Queue marker asking the worker to reconcile every pending play over REST
+_GAP_FILL = object()
+
+
+class _ReconnectAwareStream(TradingStream):
+    """TradingStream that reports every (re)connection"""
+
+    def __init__(self, *args, on_connect=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_connect = on_connect
+
+    async def _start_ws(self):
+        await super()._start_ws()
+        if self._on_connect:
+            self._on_connect()
+
+
+def create_trading_stream(on_connect=None) -> TradingStream:
+    """Create a trade updates stream for the active account"""
+    registry = get_client_registry()
+    active_account = registry.active_account()
+    account = registry.account_credentials(active_account)
+    return _ReconnectAwareStream(
+        api_key=account['api_key'],
+        secret_key=account['secret_key'],
+        paper='paper' in active_account.lower(),
+        on_connect=on_connect
+    )
+
+
+class TradeUpdateListener:
+    """
+    Background listener that settles pending plays as soon as their orders
+    fill, cancel or expire.
+
+    The websocket runs on its own thread; events are handed to a worker
+    thread so play transitions never block the stream. The SDK reconnects on
+    its own, and after every reconnect the worker reconciles all pending plays
+    over REST to cover events missed while disconnected.
+    """
+
+    def __init__(self, plays_dir, stream_factory=create_trading_stream):
+        self.plays_dir = plays_dir
+        self.stream_factory = stream_factory
+        self.stream = None
+        self.running = False
+        self.connections = 0
+        self.events_applied = 0
+        self.logger = logging.getLogger(__name__)
+        self._events = queue.Queue()
+        self._stream_thread = None
+        self._worker_thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the stream and worker threads if not already running"""
+        with self._lock:
+            if self.running:
+                self.logger.warning("Trade update listener already running")
+                return
+            self.running = True
+            self.stream = self.stream_factory(on_connect=self._on_connect)
+            self.stream.subscribe_trade_updates(self._on_trade_update)
+            # The worker settles plays for the account that started the listener
+            self._worker_thread = threading.Thread(target=copy_context().run, args=(self._worker_loop,), daemon=True)
+            self._stream_thread = threading.Thread(target=self._stream_loop, daemon=True)
+            self._worker_thread.start()
+            self._stream_thread.start()
+            self.logger.info("Trade update listener started")
+
+    def stop(self):
+        """Stop the stream and worker threads"""
+        with self._lock:
+            if not self.running:
+                return
+            self.running = False
+            try:
+                self.stream.stop()
+            except Exception as e:
+                self.logger.warning(f"Error stopping trade update stream: {str(e)}")
+            self._events.put(None)
+            for thread in (self._stream_thread, self._worker_thread):
+                if thread:
+                    thread.join(timeout=5)
+            self.logger.info("Trade update listener stopped")
+
+    def _stream_loop(self):
+        try:
+            self.stream.run()
+        except Exception as e:
+            self.logger.error(f"Trade update stream exited: {str(e)}")
+        finally:
+            if self.running:
+                self.logger.warning("Trade update stream ended unexpectedly; pending plays fall back to polling")
+
+    def _on_connect(self):
+        self.connections += 1
+        if self.connections > 1:
+            self.logger.warning("Trade update stream reconnected; reconciling pending plays")
+        self._events.put(_GAP_FILL)
+
+    async def _on_trade_update(self, update):
+        event = str(getattr(update.event, 'value', update.event))
+        order = update.order
+        if event == 'partial_fill':
+            self.logger.info(f"Partial fill for order {order.id} ({order.symbol}): "
+                             f"{order.filled_qty}/{order.qty} filled")
+        elif event in SETTLING_EVENTS:
+            self._events.put(order)
+
+    def _worker_loop(self):
+        # Imported here because core imports the brokerage package
+        from goldflipper.core import apply_order_update, manage_pending_plays
+        from goldflipper.brokerage.account_book import refresh_account_book
+
+        while self.running:
+            item = self._events.get()
+            if item is None:
+                break
+            try:
+                if item is _GAP_FILL:
+                    manage_pending_plays(self.plays_dir)
+                elif apply_order_update(self.plays_dir, item):
+                    self.events_applied += 1
+                else:
+                    self.logger.debug(f"No pending play for order {item.id} ({item.status})")
+                # Fills and cancels change buying power; refresh once the backlog is drained
+                if item is not _GAP_FILL and self._events.empty():
+                    refresh_account_book()
+            except Exception as e:
+                self.logger.error(f"Error applying trade update: {str(e)}")
+
+
+# One listener per plays directory (one per account in multi-account mode)
+_trade_update_listeners = {}
+
+
+def start_trade_update_listener(plays_dir) -> TradeUpdateListener:
+    """Start the trade update listener for a plays directory, reusing it if already running"""
+    listener = _trade_update_listeners.get(plays_dir)
+    if listener is None or not listener.running:
+        listener = _trade_update_listeners[plays_dir] = TradeUpdateListener(plays_dir)
+        listener.start()
+    return listener
@@ -1,9 +1,9 @@
 import os
 import logging
 import time
+import threading
 from datetime import datetime, timedelta, date
 from zoneinfo import ZoneInfo
-import pandas_market_calendars as mcal
 from goldflipper.json_parser import load_play
 from goldflipper.alpaca_client import get_alpaca_client
 from goldflipper.config.config import config
@@ -12,17 +12,35 @@ from alpaca.trading.requests import (
     GetOptionContractsRequest, 
     LimitOrderRequest, 
     MarketOrderRequest, 
-    ClosePositionRequest
+    ClosePositionRequest,
+    GetOrdersRequest
 )
-from alpaca.trading.enums import OrderSide, OrderType, TimeInForce, AssetStatus
+from alpaca.trading.enums import OrderSide, OrderType, TimeInForce, AssetStatus, QueryOrderStatus
 from alpaca.common.exceptions import APIError
 import json
 from goldflipper.tools.option_data_fetcher import calculate_greeks  # Currently unused. Kept for potential future analytics
 from goldflipper.utils.atomic_io import atomic_write_json
+from goldflipper.utils.market_calendar import get_session_table
 from goldflipper.strategy.trailing import has_trailing_enabled, update_trailing_levels
 from uuid import UUID
 from typing import Optional, Dict, Any
 from goldflipper.data.market.manager import MarketDataManager
+from goldflipper.brokerage.order_reconciliation import OrderSnapshot, fetch_order_snapshot, MAX_ORDERS_PER_REQUEST
+from goldflipper.brokerage.position_book import get_position_book, refresh_position_book
+from goldflipper.brokerage.trade_stream import start_trade_update_listener
+from goldflipper.brokerage.account_book import account_book_enabled, get_account_book, refresh_account_book
+from goldflipper.brokerage.action_queue import get_action_queue
+from goldflipper.brokerage.client_registry import current_account
+from goldflipper.brokerage.contract_cache import get_contract_cache
+from goldflipper.brokerage.limit_repricer import LimitRepricer, WORKING_ORDER_STATUSES
+from goldflipper.brokerage.order_submission import SubmissionEngine, submit_order_idempotent, submit_latency
+from goldflipper.orchestration.cycle_budget import (
+    DISPLAY, ENTRIES, EXITS, MAINTENANCE, PENDING, WorkItem, cycle_budget_enabled, get_cycle_budget
+)
+from goldflipper.orchestration.cycle_clock import BackgroundTask, CycleClock
+from goldflipper.orchestration.expiry_index import expiry_index_enabled, get_expiry_index
+from goldflipper.orchestration.play_graph import PLAY_FOLDERS, get_play_graph, note_play_moved, play_graph_enabled
+from goldflipper.orchestration.play_scheduler import adaptive_polling_enabled, get_play_scheduler
 
 # ==================================================
 # 1. BROKERAGE DATA RETRIEVAL
@@ -106,12 +124,16 @@ def get_all_orders(status: str = 'open') -> Optional[Dict[str, Dict[str, Any]]]:
     """
     client = get_alpaca_client()
     try:
-        # The new API doesn't use status as a parameter
-        # Instead, we should filter the results after getting them
-        orders = client.get_orders()
-        
-        # Filter orders based on status parameter
-        if status != 'all':
+        # 'open', 'closed' and 'all' are filtered by the API; specific order
+        # states (e.g. 'filled') are filtered after listing all orders
+        query_status = {
+            'open': QueryOrderStatus.OPEN,
+            'closed': QueryOrderStatus.CLOSED,
+            'all': QueryOrderStatus.ALL
+        }.get(status, QueryOrderStatus.ALL)
+        orders = client.get_orders(filter=GetOrdersRequest(status=query_status, limit=MAX_ORDERS_PER_REQUEST))
+        
+        if status not in ('open', 'closed', 'all'):
             orders = [order for order in orders if order.status == status]
             
         return {
@@ -169,6 +191,11 @@ def get_market_data_manager() -> MarketDataManager:
         _market_data_manager = MarketDataManager()
     return _market_data_manager
 
+def set_market_data_manager(manager):
+    """Replace the market data source (e.g. the shard coordinator's shared fetcher)"""
+    global _market_data_manager
+    _market_data_manager = manager
+
 def get_stock_price(symbol: str) -> Optional[float]:
     """Get current stock price."""
     market_data = get_market_data_manager()  # Use singleton instance
@@ -297,8 +324,8 @@ class UUIDEncoder(json.JSONEncoder):
 def save_play(play, play_file):
     """Save the updated play data to the specified file."""
     try:
-        with open(play_file, 'w') as f:
-            json.dump(play, f, indent=4, cls=UUIDEncoder)
+        # Atomic, so readers (including the background JSON fixer) never see a half-written file
+        atomic_write_json(play_file, play, indent=4, encoder=UUIDEncoder)
         logging.info(f"Play data saved to {play_file}")
         display.success(f"Play data saved to {play_file}")
     except Exception as e:
@@ -306,6 +333,26 @@ def save_play(play, play_file):
         display.error(f"Error saving play data to {play_file}: {e}")
 
 
+# Sharded mode: predicate selecting the play files this process owns (None = all plays)
+_play_filter = None
+
+def set_play_filter(predicate):
+    """Restrict play processing to the play files for which predicate(play_file) is true."""
+    global _play_filter
+    _play_filter = predicate
+
+def owns_play(play_file):
+    return _play_filter is None or _play_filter(play_file)
+
+def list_play_files(plays_dir, play_type):
+    """Play files in one plays folder that this process owns."""
+    play_dir = os.path.join(plays_dir, play_type)
+    if not os.path.exists(play_dir):
+        return []
+    play_files = [os.path.join(play_dir, f) for f in os.listdir(play_dir) if f.endswith('.json')]
+    return [play_file for play_file in play_files if owns_play(play_file)]
+
+
 def save_play_improved(play, play_file):
     """Improved atomic save for play data (non-breaking: used only by trailing flow)."""
     try:
@@ -670,6 +717,15 @@ def evaluate_closing_strategy(symbol, play, play_file=None):
 # Function to place an order through the Alpaca API.
 
 def get_option_contract(play):
+    # Contracts we already know by OCC symbol need no lookup
+    use_cache = config.get('orders', 'contract_cache', 'enabled', default=True)
+    if use_cache:
+        contract = get_contract_cache().get(play.get('option_contract_symbol'))
+        if contract:
+            logging.info(f"Option contract found in cache: {contract.symbol}")
+            display.success(f"Option contract found: {contract.symbol}")
+            return contract
+
     client = get_alpaca_client()
     symbol = play['symbol']
     expiration_date = datetime.strptime(play['expiration_date'], "%m/%d/%Y").date()
@@ -689,12 +745,53 @@ def get_option_contract(play):
     if contracts:
         logging.info(f"Option contract found: {contracts[0]}")
         display.success(f"Option contract found: {contracts[0].symbol}")
+        if use_cache:
+            get_contract_cache().put(contracts[0])
         return contracts[0]
     else:
         logging.error(f"No option contract found for {symbol} with given parameters")
         display.error(f"No option contract found for {symbol} with given parameters")
         return None
 
+def prefetch_new_play_contracts(*plays_dirs):
+    """Cache option contract metadata for every new play in one pass per underlying and expiry."""
+    plays = []
+    for plays_dir in plays_dirs:
+        plays.extend(load_play(play_file) for play_file in list_play_files(plays_dir, 'new'))
+    try:
+        return get_contract_cache().prefetch([play for play in plays if play])
+    except Exception as e:
+        logging.error(f"Contract prefetch failed: {str(e)}")
+        display.error(f"Contract prefetch failed: {str(e)}")
+        return 0
+
+def submit_play_order(client, order_req, play, play_file, action):
+    """
+    Submit an order for a play under a deterministic client_order_id.
+
+    The id is derived from the play id, the action ('open' / 'close') and the
+    play's attempt counter, so resubmitting after a timeout finds the original
+    order instead of placing a duplicate.
+    """
+    client_id_key, attempt_key = {
+        'open': ('client_order_id', 'entry_attempt'),
+        'close': ('closing_client_order_id', 'close_attempt')
+    }[action]
+    play_id = os.path.splitext(os.path.basename(play_file))[0]
+    response, attempt = submit_order_idempotent(
+        client,
+        lambda client_order_id: order_req.model_copy(update={'client_order_id': client_order_id}),
+        play_id,
+        action,
+        start_attempt=play.setdefault('status', {}).get(attempt_key, 1),
+        symbol=order_req.symbol
+    )
+    play['status'].update({
+        client_id_key: response.client_order_id,
+        attempt_key: attempt
+    })
+    return response
+
 def open_position(play, play_file):
     client = get_alpaca_client()
     contract = get_option_contract(play)
@@ -714,6 +811,7 @@ def open_position(play, play_file):
         'order_status': None,
         'position_exists': False,
     })
+    play['status'].pop('reprice', None)
     
     # Get current stock price before opening position
     entry_stock_price = get_stock_price(play['symbol'])
@@ -857,8 +955,27 @@ def open_position(play, play_file):
             logging.info("Creating market buy order")
             # display.info("Creating market buy order")
             display.status(f"Submitting {'LIMIT' if is_limit_order else 'MARKET'} BUY order for {play['contracts']} {contract.symbol}")
-            
-        response = client.submit_order(order_req)
+
+        # Admit the order against buying power less what other plays have already reserved
+        play_id = os.path.splitext(os.path.basename(play_file))[0]
+        account_book = get_account_book() if account_book_enabled() else None
+        if account_book:
+            order_price = limit_price if is_limit_order else (option_data.get('ask') or entry_premium)
+            notional = order_price * play['contracts'] * 100
+            if not account_book.reserve(play_id, notional):
+                msg = (f"Insufficient buying power for {play['contracts']} {contract.symbol}: "
+                       f"needs ${notional:,.2f}, ${account_book.available():,.2f} available")
+                logging.warning(msg)
+                display.warning(msg)
+                return False
+
+        try:
+            response = submit_play_order(client, order_req, play, play_file, 'open')
+        except Exception:
+            if account_book:
+                account_book.release(play_id)
+            raise
+        get_position_book().invalidate(contract.symbol)
         logging.info(f"Order submitted: {response}")
         # display.info(f"Order submitted: {response}")
         
@@ -882,6 +999,10 @@ def open_position(play, play_file):
             logging.info("Play moved to OPEN state upon market order placement")
             # display.info("Play moved to OPEN state upon market order placement")
             
+            # OCO peers must be cancelled before the next peer in the group is evaluated,
+            # so wait briefly for the fill instead of leaving it to the next cycle
+            if not confirm_market_fill(client, response):
+                logging.warning(f"Market order {response.id} not confirmed filled yet; conditionals retried next cycle")
             # Handle conditional plays here for market orders
             handle_conditional_plays(play, new_filepath)
             logging.info(f"Conditional OCO / OTO plays handled for {new_filepath}")
@@ -1024,7 +1145,7 @@ def close_position(play, close_conditions, play_file):
                 logging.info(f"Creating take profit limit sell order at ${limit_price:.2f}")
                 # display.info(f"Creating take profit limit sell order at ${limit_price:.2f}")
                 display.status(f"Submitting TAKE PROFIT LIMIT SELL order for {contract_symbol} at ${limit_price:.2f}")
-                response = client.submit_order(order_req)
+                response = submit_play_order(client, order_req, play, play_file, 'close')
                 
                 # Add PENDING-CLOSING transition for limit orders
                 play['status'].update({
@@ -1149,7 +1270,7 @@ def close_position(play, close_conditions, play_file):
                     logging.info(f"Creating primary SL limit sell order at ${limit_price:.2f}")
                     # display.info(f"Creating primary SL limit sell order at ${limit_price:.2f}")
                     display.status(f"Submitting Primary Stop Loss (LIMIT SELL) order for {contract_symbol} at ${limit_price:.2f}")
-                    response = client.submit_order(order_req)
+                    response = submit_play_order(client, order_req, play, play_file, 'close')
                     
                     # Add PENDING-CLOSING transition for limit orders
                     play['status'].update({
@@ -1221,7 +1342,7 @@ def close_position(play, close_conditions, play_file):
                 logging.info(f"Creating stop loss limit sell order at ${limit_price:.2f}")
                 # display.info(f"Creating stop loss limit sell order at ${limit_price:.2f}")
                 display.status(f"Submitting STOP LOSS LIMIT SELL order for {contract_symbol} at ${limit_price:.2f}")
-                response = client.submit_order(order_req)
+                response = submit_play_order(client, order_req, play, play_file, 'close')
                 
                 # Add PENDING-CLOSING transition for limit orders
                 play['status'].update({
@@ -1270,8 +1391,6 @@ def monitor_and_manage_position(play, play_file):
                 # display.info("Position not yet established, skipping monitoring")
                 return True  # Return True to continue monitoring on next cycle
 
-        client = get_alpaca_client()
-        
         # Verify play status is appropriate for monitoring
         if play.get('status', {}).get('play_status') not in ['OPEN', 'PENDING-CLOSING']:
             logging.info(f"Play status {play.get('status', {}).get('play_status')} not appropriate for monitoring")
@@ -1292,6 +1411,12 @@ def monitor_and_manage_position(play, play_file):
             display.error("Play file is missing required symbols")
             return False
 
+        # A queued close retry owns this play until it succeeds or gives up
+        close_key = f"close:{os.path.basename(play_file)}"
+        if get_action_queue().is_pending(close_key):
+            logging.info(f"Close retry in progress for {contract_symbol}, skipping evaluation")
+            return True
+
         # Get current market data
         market_data = None
         current_premium = None
@@ -1344,12 +1469,16 @@ def monitor_and_manage_position(play, play_file):
                 # display.info(f"SL limit order target: ${play['stop_loss']['SL_option_prem']:.4f}")
 
         # Verify position is still open
-        position = client.get_open_position(contract_symbol)
+        position = get_position_book().get_position(contract_symbol)
         if position is None:
             logging.info(f"Position {contract_symbol} closed.")
             # display.info(f"Position {contract_symbol} closed.")
             return True
 
+        # Retry conditional handling that was delayed until the position showed up
+        if play.get('conditional_plays') and not play.get('status', {}).get('conditionals_handled'):
+            handle_conditional_plays(play, play_file)
+
         # Update trailing states (no behavior change unless enabled)
         try:
             current_price_for_trailing = locals().get('current_price', None)
@@ -1385,23 +1514,26 @@ def monitor_and_manage_position(play, play_file):
         # Evaluate closing conditions
         close_conditions = evaluate_closing_strategy(underlying_symbol, play, play_file)
         if close_conditions['should_close']:
-            close_attempts = 0
-            max_attempts = 3
-            
-            while close_attempts < max_attempts:
-                logging.info(f"Attempting to close position: Attempt {close_attempts + 1}")
-                # display.info(f"Attempting to close position: Attempt {close_attempts + 1}")
-                if close_position(play, close_conditions, play_file):
-                    logging.info("Position closed successfully")
-                    # display.info("Position closed successfully")
-                    return True
-                close_attempts += 1
-                logging.warning(f"Close attempt {close_attempts} failed. Retrying...")
-                display.warning(f"Position Close attempt {close_attempts} failed. Retrying...")
-                time.sleep(2)
-            
-            logging.error("Failed to close position after maximum attempts")
-            display.error("Failed to close position after exhausting retry attempts")
+            logging.info("Attempting to close position: Attempt 1")
+            # display.info("Attempting to close position: Attempt 1")
+            if close_position(play, close_conditions, play_file):
+                get_position_book().invalidate(contract_symbol)
+                logging.info("Position closed successfully")
+                # display.info("Position closed successfully")
+                return True
+
+            # Retry in the background so other positions keep being evaluated
+            max_attempts = config.get('monitoring', 'max_retries', default=3)
+            get_action_queue().submit(
+                close_key,
+                lambda: _retry_close_position(play_file, close_conditions),
+                deadline_seconds=config.get('monitoring', 'action_queue', 'deadline_seconds', default=60),
+                max_attempts=max_attempts - 1,
+                on_failure=lambda action: display.error(
+                    f"Failed to close {contract_symbol} after exhausting retry attempts")
+            )
+            logging.warning("Close attempt 1 failed. Queued for retry.")
+            display.warning("Position Close attempt 1 failed. Retrying in background...")
             return False
 
         return True
@@ -1410,6 +1542,19 @@ def monitor_and_manage_position(play, play_file):
         display.error(f"Error monitoring position: {e}")
         return False
 
+def _retry_close_position(play_file, close_conditions):
+    """Queued close retry; done once the play has left the open folder."""
+    if not os.path.exists(play_file):
+        return True
+    play = load_play(play_file)
+    if play is None:
+        return False
+    if close_position(play, close_conditions, play_file):
+        get_position_book().invalidate(play.get('option_contract_symbol'))
+        logging.info(f"Position closed successfully on retry: {play_file}")
+        return True
+    return False
+
 # ==================================================
 # 5. MOVE PLAY TO APPROPRIATE FOLDER
 # ==================================================
@@ -1433,14 +1578,14 @@ def move_play_to_new(play_file):
         new_path = os.path.join(new_dir, os.path.basename(play_file))
         
         # Save updated status to original location first
-        with open(play_file, 'w') as f:
-            json.dump(play_data, f, indent=4, cls=UUIDEncoder)
+        atomic_write_json(play_file, play_data, indent=4, encoder=UUIDEncoder)
             
         # Move file only if it's not already in the target directory
         if os.path.dirname(play_file) != new_dir:
             if os.path.exists(new_path):
                 os.remove(new_path)  # Remove any existing file at destination
             os.rename(play_file, new_path)
+            note_play_moved(new_path)
             logging.info(f"Moved play to NEW folder: {new_path}")
             # display.info(f"Moved play to NEW folder: {new_path}")
             
@@ -1467,13 +1612,13 @@ def move_play_to_pending_opening(play_file):
         new_path = os.path.join(pending_opening_dir, os.path.basename(play_file))
         
         # Save updated status to original location first
-        with open(play_file, 'w') as f:
-            json.dump(play_data, f, indent=4, cls=UUIDEncoder)
+        atomic_write_json(play_file, play_data, indent=4, encoder=UUIDEncoder)
             
         # Move file
         if os.path.exists(new_path):
             os.remove(new_path)
         os.rename(play_file, new_path)
+        note_play_moved(new_path)
         logging.info(f"Moved play to PENDING-OPENING folder: {new_path}")
         # display.info(f"Moved play to PENDING-OPENING folder: {new_path}")
         
@@ -1499,14 +1644,14 @@ def move_play_to_open(play_file):
         new_path = os.path.join(open_dir, os.path.basename(play_file))
         
         # Save updated status to original location first
-        with open(play_file, 'w') as f:
-            json.dump(play_data, f, indent=4, cls=UUIDEncoder)
+        atomic_write_json(play_file, play_data, indent=4, encoder=UUIDEncoder)
             
         # Move file only if it's not already in the target directory
         if os.path.dirname(play_file) != open_dir:
             if os.path.exists(new_path):
                 os.remove(new_path)  # Remove any existing file at destination
             os.rename(play_file, new_path)
+            note_play_moved(new_path)
             logging.info(f"Moved play to OPEN folder: {new_path}")
             # display.info(f"Moved play to OPEN folder: {new_path}")
             
@@ -1525,6 +1670,7 @@ def move_play_to_pending_closing(play_file):
     os.makedirs(pending_closing_dir, exist_ok=True)
     new_path = os.path.join(pending_closing_dir, os.path.basename(play_file))
     os.rename(play_file, new_path)
+    note_play_moved(new_path)
     logging.info(f"Moved play to PENDING-CLOSING folder: {new_path}")
     # display.info(f"Moved play to PENDING-CLOSING folder: {new_path}")
 
@@ -1546,14 +1692,14 @@ def move_play_to_closed(play_file):
         new_path = os.path.join(closed_dir, os.path.basename(play_file))
         
         # Save to original location first
-        with open(play_file, 'w') as f:
-            json.dump(play_data, f, indent=4, cls=UUIDEncoder)
+        atomic_write_json(play_file, play_data, indent=4, encoder=UUIDEncoder)
             
         # Move file only if it's not already in the target directory
         if os.path.dirname(play_file) != closed_dir:
             if os.path.exists(new_path):
                 os.remove(new_path)  # Remove any existing file at destination
             os.rename(play_file, new_path)
+            note_play_moved(new_path)
             logging.info(f"Moved play to CLOSED folder: {new_path}")
             # display.info(f"Moved play to CLOSED folder: {new_path}")
             
@@ -1584,14 +1730,14 @@ def move_play_to_expired(play_file):
         new_path = os.path.join(expired_dir, os.path.basename(play_file))
         
         # Save to original location first
-        with open(play_file, 'w') as f:
-            json.dump(play_data, f, indent=4, cls=UUIDEncoder)
+        atomic_write_json(play_file, play_data, indent=4, encoder=UUIDEncoder)
             
         # Move file only if it's not already in the target directory
         if os.path.dirname(play_file) != expired_dir:
             if os.path.exists(new_path):
                 os.remove(new_path)  # Remove any existing file at destination
             os.rename(play_file, new_path)
+            note_play_moved(new_path)
             logging.info(f"Moved play to EXPIRED folder: {new_path}")
             # display.info(f"Moved play to EXPIRED folder: {new_path}")
             
@@ -1625,14 +1771,14 @@ def move_play_to_temp(play_file):
         new_path = os.path.join(temp_dir, os.path.basename(play_file))
         
         # Save to original location first
-        with open(play_file, 'w') as f:
-            json.dump(play_data, f, indent=4, cls=UUIDEncoder)
+        atomic_write_json(play_file, play_data, indent=4, encoder=UUIDEncoder)
             
         # Move file only if it's not already in the target directory
         if os.path.dirname(play_file) != temp_dir:
             if os.path.exists(new_path):
                 os.remove(new_path)  # Remove any existing file at destination
             os.rename(play_file, new_path)
+            note_play_moved(new_path)
             logging.info(f"Moved play to TEMP folder: {new_path}")
             # display.info(f"Moved play to TEMP folder: {new_path}")
             
@@ -1652,6 +1798,13 @@ def execute_trade(play_file, play_type):
         logging.info(f"Executing {play_type} play: {play_file}")
         # display.info(f"Executing {play_type} play: {play_file}")
         
+        # After the end-of-day batch, no new entries (or re-closes of plays it reverted) until the next session
+        if play_type in ('new', 'open') and config.get('orders', 'eod_batch', 'enabled', default=False):
+            from goldflipper.orchestration.eod_batch import eod_holds_play
+            if eod_holds_play(play_file, play_type):
+                logging.info(f"End-of-day batch has run; holding {play_type} play until the next session: {play_file}")
+                return False
+        
         play = load_play(play_file)
         if play is None:
             logging.error(f"Failed to load play {play_file}. Skipping to next play.")
@@ -1739,6 +1892,46 @@ def execute_trade(play_file, play_type):
         display.error(f"Unexpected error in execute_trade: {str(e)}. Continuing to next play.")
         return True  # Return True to continue with next play
 
+def group_oco_peers(play_files):
+    """
+    Group play files so that plays linked by OCO triggers land in the same group.
+
+    Peers cancel each other when one opens, so they must be processed one
+    after another; unrelated plays can be submitted in parallel.
+    """
+    by_name = {os.path.basename(play_file): play_file for play_file in play_files}
+    parent = {name: name for name in by_name}
+    # The play graph re-reads only plays that changed since the last cycle
+    graph = get_play_graph(os.path.dirname(os.path.dirname(play_files[0]))) if play_files and play_graph_enabled() else None
+    if graph:
+        graph.sync(play_files)
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for name, play_file in by_name.items():
+        if graph:
+            peers = graph.oco_triggers(name)
+        else:
+            play = load_play(play_file)
+            if not play:
+                continue
+            conditional = play.get('conditional_plays') or {}
+            peers = list(conditional.get('OCO_triggers') or [])
+            if conditional.get('OCO_trigger'):
+                peers.append(conditional['OCO_trigger'])
+        for peer in peers:
+            if peer in parent:
+                parent[find(peer)] = find(name)
+
+    groups = {}
+    for name in by_name:
+        groups.setdefault(find(name), []).append(by_name[name])
+    return list(groups.values())
+
 def validate_play_order_types(play):
     """Validate order types in play data."""
     valid_types = ['market', 'limit at bid', 'limit at last', 'limit at ask', 'limit at mid']
@@ -1805,6 +1998,15 @@ def get_sleep_interval(minutes_to_open):
 
 MAX_RETRIES = 3
 
+def _next_session_open(current_time, fallback):
+    """Next session open from the exchange calendar (skips weekends and holidays), or fallback if it is unavailable."""
+    try:
+        next_open = get_session_table().next_open(current_time)
+    except Exception as e:
+        logging.warning(f"Session calendar unavailable, estimating the next open: {str(e)}")
+        next_open = None
+    return next_open.astimezone(current_time.tzinfo) if next_open else fallback
+
 def validate_market_hours():
     """
     Validate if current time is within configured market hours.
@@ -1846,6 +2048,7 @@ def validate_market_hours():
             logging.error(error_msg)
             next_market_day = next_market_day.replace(hour=9, minute=30, second=0)
             
+        next_market_day = _next_session_open(current_time, next_market_day)
         wait_hours = (next_market_day - current_time).total_seconds() / 3600
         # display.info(f"Market is closed for holiday. Current time in {market_tz}: {current_time_only}")
         logging.info(f"Market closed (holiday). Next open: {next_market_day}")
@@ -1867,6 +2070,7 @@ def validate_market_hours():
             logging.error(error_msg)
             next_market_day = next_market_day.replace(hour=9, minute=30, second=0)
             
+        next_market_day = _next_session_open(current_time, next_market_day)
         wait_hours = (next_market_day - current_time).total_seconds() / 3600
         # display.info(f"Market is closed for the weekend. Current time in {market_tz}: {current_time_only}")
         logging.info(f"Market closed (weekend). Next open: {next_market_day}")
@@ -1885,16 +2089,6 @@ def validate_market_hours():
     # Check if within regular market hours
     is_market_open = market_open <= current_time_only <= market_close
     
-    # If it's 4:17 PM (within a 30-second window), handle pending plays
-    cleanup_time = datetime.strptime('16:17', '%H:%M').time()
-    cleanup_window_start = (datetime.combine(datetime.today(), cleanup_time) - timedelta(seconds=15)).time()
-    cleanup_window_end = (datetime.combine(datetime.today(), cleanup_time) + timedelta(seconds=45)).time()
-    
-    if cleanup_window_start <= current_time_only <= cleanup_window_end:
-        logging.info("Market closed (4:15 PM). Processing end-of-day pending plays...")
-        display.info("Market closed (4:15 PM). Processing end-of-day pending plays...")
-        handle_end_of_day_pending_plays()
-    
     # Handle extended hours if enabled
     if not is_market_open and config.get('market_hours', 'extended_hours', 'enabled', default=False):
         try:
@@ -1919,6 +2113,8 @@ def validate_market_hours():
         elif current_time_only < market_open:
             # Already on the correct day, no adjustment needed
             pass
+        # After a Friday or pre-holiday close, the next open is days away
+        next_open = _next_session_open(current_time, next_open)
             
         wait_minutes = int((next_open - current_time).total_seconds() / 60)
         
@@ -1929,6 +2125,29 @@ def validate_market_hours():
     logging.info(f"Market open. Current time: {current_time_only}")
     return True, 0
 
+def end_of_day_cleanup_due(current_time=None):
+    """
+    Whether it is 4:17 PM on a trading day (a one-minute window), when the
+    monitoring loops move each plays directory's pending plays back.
+    """
+    if current_time is None:
+        try:
+            market_tz = ZoneInfo(config.get('market_hours', 'timezone', default='America/New_York'))
+        except Exception:
+            market_tz = ZoneInfo('America/New_York')
+        current_time = datetime.now(market_tz)
+    if current_time.weekday() >= 5 or is_market_holiday(current_time.date()):
+        return False
+    cleanup_time = datetime.combine(current_time.date(), datetime.strptime('16:17', '%H:%M').time(),
+                                    tzinfo=current_time.tzinfo)
+    return cleanup_time - timedelta(seconds=15) <= current_time <= cleanup_time + timedelta(seconds=45)
+
+def run_end_of_day_cleanup(plays_dir):
+    """Move a plays directory's pending plays back after the close (run inside the account's use_account)."""
+    logging.info(f"Market closed (4:15 PM). Processing end-of-day pending plays in {plays_dir}...")
+    display.info("Market closed (4:15 PM). Processing end-of-day pending plays...")
+    handle_end_of_day_pending_plays(plays_dir)
+
 def handle_api_error(e, operation):
     """Handle API errors with appropriate logging and display."""
     # NOTE: Currently unused; reserved for potential centralized API error handling.
@@ -1961,16 +2180,6 @@ def handle_execution_error(e, operation, retry_count=0):
         logging.error(f"Max retries ({MAX_RETRIES}) reached for {operation}")
         return False
 
-# NYSE calendar instance (cached for performance)
-_nyse_calendar = None
-
-def _get_nyse_calendar():
-    """Get cached NYSE calendar instance."""
-    global _nyse_calendar
-    if _nyse_calendar is None:
-        _nyse_calendar = mcal.get_calendar('NYSE')
-    return _nyse_calendar
-
 def is_market_holiday(check_date):
     """
     Check if given date is a US stock market holiday using pandas_market_calendars.
@@ -1990,25 +2199,13 @@ def is_market_holiday(check_date):
         True if the date is a market holiday, False otherwise
     """
     try:
-        nyse = _get_nyse_calendar()
-
         # Convert to date if datetime
         if isinstance(check_date, datetime):
             check_date = check_date.date()
 
-        # Get schedule for just this date
-        # If the date is not in the schedule, it's either a weekend or holiday
-        schedule = nyse.schedule(start_date=check_date, end_date=check_date)
-
-        # If schedule is empty, the market is closed (holiday or weekend)
-        # We only want to return True for holidays, not weekends
+        # A weekday without a session is a holiday
         # (weekends are handled separately in validate_market_hours)
-        if schedule.empty:
-            # Check if it's a weekday - if so, it must be a holiday
-            if check_date.weekday() < 5:  # Monday=0, Friday=4
-                return True
-
-        return False
+        return get_session_table().is_holiday(check_date)
 
     except Exception as e:
         logging.warning(f"Error checking market holiday with pandas_market_calendars: {e}")
@@ -2037,21 +2234,14 @@ def is_early_close_day(check_date):
         Tuple of (is_early_close: bool, close_time: time or None)
     """
     try:
-        nyse = _get_nyse_calendar()
-
         # Convert to date if datetime
         if isinstance(check_date, datetime):
             check_date = check_date.date()
 
-        schedule = nyse.schedule(start_date=check_date, end_date=check_date)
-
-        if not schedule.empty:
-            # Get the close time for this day
-            close_time = schedule.iloc[0]['market_close']
-            # NYSE normal close is 4:00 PM (20:00 UTC during EST, 16:00 ET)
-            # Early close is 1:00 PM ET (13:00 ET = 18:00 UTC during EST)
-            if close_time.hour < 20:  # UTC hour less than normal close
-                return True, close_time.time()
+        sessions = get_session_table()
+        if sessions.is_early_close(check_date):
+            # Close time in UTC, as returned by the calendar schedule
+            return True, sessions.close_time(check_date).time()
 
         return False, None
 
@@ -2062,178 +2252,330 @@ def is_early_close_day(check_date):
 ########################################################
 # ****************-={ MAIN LOOP }=-********************
 ########################################################    
+def expire_stale_new_plays(plays_dir):
+    """Move new plays whose play expiration date has passed to the expired folder."""
+    current_date = datetime.now().date()
+    if expiry_index_enabled():
+        # Only plays added or changed since the last cycle are loaded; due plays come off the heap
+        index = get_expiry_index(plays_dir, lambda: list_play_files(plays_dir, 'new'))
+        index.sync()
+        expired_files = index.pop_due(current_date)
+    else:
+        # Check for expired plays in the "new" folder
+        expired_files = []
+        for play_file in list_play_files(plays_dir, 'new'):
+            play = load_play(play_file)
+            if play and 'play_expiration_date' in play:
+                expiration_date = datetime.strptime(play['play_expiration_date'], "%m/%d/%Y").date()
+                if expiration_date < current_date:
+                    expired_files.append(play_file)
+    
+    # Handle expired plays
+    for play_file in expired_files:
+        move_play_to_expired(play_file)
+        display.warning(f"Moved expired play to expired folder: {play_file}")
+        logging.warning(f"Play has expired: {play_file}")
+
+def log_action_queue_stats():
+    """Report background retries still in flight."""
+    queue_stats = get_action_queue().stats()
+    if queue_stats['depth']:
+        logging.info(f"Action queue: {queue_stats}")
+        display.status(f"Background retries in progress: {queue_stats['depth']}")
+
+def display_active_plays(plays_dir, scheduler=None, due_files=None):
+    """
+    Print current stock and option data for all active plays.
+
+    New / open plays are only shown when due: per the scheduler, or, once the
+    cycle has already rescheduled them, when listed in due_files.
+    """
+    # Print current option data for all active plays
+    for play_type in ['new', 'open', 'pending-opening', 'pending-closing']:
+        play_files = list_play_files(plays_dir, play_type)
+        if due_files is not None and play_type in ('new', 'open'):
+            play_files = [play_file for play_file in play_files if play_file in due_files]
+        elif scheduler and play_type in ('new', 'open'):
+            play_files = [play_file for play_file in play_files if scheduler.is_due(play_file)]
+        
+        for play_file in play_files:
+            play = load_play(play_file)
+            if play:
+                try:
+                    # Get current stock price
+                    current_price = get_stock_price(play['symbol'])
+                    if current_price is None or current_price <= 0:
+                        logging.error(f"Could not get valid share price for {play['symbol']}")
+                        display.error(f"Could not get valid share price for {play['symbol']}")
+                        continue
+
+                    # Get current option data
+                    option_data = get_option_data(play['option_contract_symbol'])
+                    if option_data is None:
+                        logging.error(f"Could not get option data for {play['option_contract_symbol']}")
+                        display.error(f"Could not get option data for {play['option_contract_symbol']}")
+                        continue
+                    
+                    # Log detailed data to file
+                    logging.info(f"Play data for {play['symbol']}: "
+                               f"Type={play_type}, "
+                               f"Strike=${play['strike_price']}, "
+                               f"Exp={play['expiration_date']}, "
+                               f"Stock=${current_price:.2f}, "
+                               f"Bid=${option_data['bid']:.2f}, "
+                               f"Ask=${option_data['ask']:.2f}")
+
+                    # Display formatted data to terminal
+                    play_name = play.get('play_name', 'N/A')
+                    border = "+" + "-" * 60 + "+"
+                    header_text = play_name
+                    display.status(border, show_timestamp=False)
+                    display.status(f"|{header_text:^60}|", show_timestamp=False)
+                    display.status(border, show_timestamp=False)
+                    display.status(
+                        f"Play: {play['symbol']} {play['trade_type']} "
+                        f"{play['strike_price']} Strike {play['expiration_date']} Expiration"
+                    )
+
+                    # Map play types to display methods and colors
+                    status_display = {
+                        'new': (display.info, 'info'),
+                        'pending-opening': (display.info, 'info'),
+                        'open': (display.success, 'success'),
+                        'pending-closing': (display.warning, 'warning'),
+                        'closed': (display.status, 'status'),
+                        'expired': (display.error, 'error'),
+                        'temp': (display.info, 'info')
+                    }
+                    
+                    # Get the appropriate display method and color for the current play type
+                    display_method, color = status_display.get(play_type.lower(), (display.status, 'status'))
+                    
+                    play_status = play.get('status', {}).get('play_status')
+                    play_expiration_date = play.get('play_expiration_date')
+                    
+                    # Create status message with color
+                    status_msg = f"Status: [{play_type}]"
+                    if play_expiration_date and play_status in ('TEMP', 'NEW'):
+                        status_msg = f"Status: [{play_type}], Play expires: {play_expiration_date}"
+                    
+                    # Display with appropriate method
+                    display_method(status_msg, show_timestamp=False)
+
+                    display.price(f"Stock price: ${current_price:.2f}")
+                    display.price(
+                        f"Option premium: Bid ${option_data['bid']:.2f} "
+                        f"Ask ${option_data['ask']:.2f} Last ${option_data['premium']:.2f}"
+                    )
+                    display.status(border, show_timestamp=False)
+
+                    
+                except Exception as e:
+                    error_msg = f"Error fetching market data for {play['symbol']}: {str(e)}"
+                    display.error(error_msg)
+                    logging.error(error_msg)
+
+def run_monitoring_cycle(plays_dir, submission_engine):
+    """
+    Run one monitoring pass over a plays directory while the market is open.
+
+    With adaptive polling, wakes between full cycles only evaluate the due
+    new / open plays, reusing the last full cycle's position and account books.
+
+    Args:
+        plays_dir: Base directory containing play folders
+        submission_engine: SubmissionEngine used to execute new plays
+    """
+    # Per-play cadence: new and open plays are only evaluated when due
+    scheduler = get_play_scheduler(plays_dir) if adaptive_polling_enabled() else None
+    full = scheduler is None or scheduler.begin_cycle(config.get('monitoring', 'polling_interval', default=30))
+    if full:
+        refresh_position_book()
+        refresh_account_book()
+    if config.get('orders', 'eod_batch', 'enabled', default=False):
+        from goldflipper.orchestration.eod_batch import run_eod_batch_if_due
+        run_eod_batch_if_due(plays_dir)
+    # display.header("Checking for new and open plays...")
+    logging.info("Checking for new and open plays" if full else "Checking due new and open plays")
+
+    if not full:
+        expire_stale_new_plays(plays_dir)
+        execute_plays(plays_dir, 'open', submission_engine, scheduler)
+        execute_plays(plays_dir, 'new', submission_engine, scheduler)
+        return
+
+    # Work runs in this order; with the cycle budget enabled it runs by priority
+    # instead (exits first) and low-priority work that doesn't fit is deferred
+    budget = get_cycle_budget(plays_dir)
+    budget.run([
+        # The expiry sweep gates entries: it is never deferred and runs just before them
+        WorkItem('expiry_sweep', ENTRIES, lambda: expire_stale_new_plays(plays_dir), required=True),
+        # Manage pending plays first
+        WorkItem('pending', PENDING, lambda: manage_pending_plays(plays_dir), required=True),
+        WorkItem('queue_stats', MAINTENANCE, log_action_queue_stats),
+        WorkItem('display', DISPLAY, lambda: display_active_plays(plays_dir, scheduler)),
+        WorkItem('entries', ENTRIES, lambda: execute_plays(plays_dir, 'new', submission_engine, scheduler)),
+        WorkItem('exits', EXITS, lambda: execute_plays(plays_dir, 'open', submission_engine, scheduler),
+                 required=True)
+    ], ordered=cycle_budget_enabled())
+
+def execute_plays(plays_dir, play_type, submission_engine, scheduler=None):
+    """Evaluate the due new or open plays and execute the ones whose conditions are met."""
+    play_files = list_play_files(plays_dir, play_type)
+    if scheduler:
+        play_files = [play_file for play_file in play_files if scheduler.is_due(play_file)]
+
+    if play_type == 'new':
+        # Independent new plays are evaluated and submitted concurrently; OCO peers share a worker
+        results = submission_engine.run(
+            group_oco_peers(play_files),
+            lambda play_file: (play_file, execute_trade(play_file, 'new'))
+        )
+    else:
+        results = [(play_file, execute_trade(play_file, play_type)) for play_file in play_files]
+
+    for play_file, executed in results:
+        report_play_execution(play_file, play_type, executed, scheduler)
+
+def report_play_execution(play_file, play_type, executed, scheduler=None):
+    """Log the outcome of evaluating a play and queue its next evaluation."""
+    if executed:
+        msg = f"Successfully processed {play_type} play: {play_file}"
+        display.status(msg)
+        logging.info(msg)
+    else:
+        msg = f"Conditions not met for {play_type} play: {play_file}"
+        # display.info(msg)
+        logging.info(msg)
+    if scheduler:
+        reschedule_play(scheduler, play_file, play_type)
+
+def reschedule_play(scheduler, play_file, play_type):
+    """
+    Queue a play's next evaluation using this cycle's cached prices.
+
+    Plays that left their folder (opened, closed, expired) are forgotten.
+    """
+    play = load_play(play_file) if os.path.exists(play_file) else None
+    if not play:
+        scheduler.forget(play_file)
+        return
+    try:
+        premium = None
+        if play_type == 'open':
+            option_data = get_option_data(play['option_contract_symbol'])
+            premium = option_data.get('premium') if option_data else None
+        scheduler.schedule(play_file, play, get_stock_price(play['symbol']), premium, opening=(play_type == 'new'))
+    except Exception as e:
+        logging.warning(f"Could not reschedule {play_file}, evaluating it next cycle: {str(e)}")
+        scheduler.forget(play_file)
+
+def make_cycle_clock():
+    """Cycle clock configured from monitoring.cycle_clock"""
+    return CycleClock(
+        overrun_policy=config.get('monitoring', 'cycle_clock', 'overrun_policy', default='skip'),
+        fixed_rate=config.get('monitoring', 'cycle_clock', 'fixed_rate', default=True)
+    )
+
+def log_cycle_metrics(clock):
+    """Log submit latency and cycle lag at the end of a cycle"""
+    latency = submit_latency.summary()
+    if latency['count']:
+        logging.info(f"Order submit latency (last {latency['count']}): {latency}")
+    stats = clock.stats()
+    logging.info(f"Cycle lag {stats['last_lag']:.2f}s, work {clock.elapsed():.2f}s "
+                 f"(max lag {stats['max_lag']:.2f}s, overruns {stats['overruns']}, skipped {stats['skipped']})")
+
 def monitor_plays_continuously():
     """Main monitoring loop for all plays"""
+    if config.get('monitoring', 'multi_account', 'enabled', default=False):
+        from goldflipper.orchestration.multi_account import monitor_accounts_continuously
+        return monitor_accounts_continuously()
+    if config.get('monitoring', 'sharding', 'enabled', default=False):
+        from goldflipper.orchestration.sharding import is_shard_worker, run_sharded
+        if not is_shard_worker():
+            return run_sharded()
+    if config.get('monitoring', 'async_orchestrator', 'enabled', default=False):
+        from goldflipper.orchestration.async_loop import run_async_monitoring
+        return run_async_monitoring()
+
     plays_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), 'plays'))
     market_data = get_market_data_manager()
     
     from goldflipper.utils.json_fixer import PlayFileFixer
-    json_fixer = PlayFileFixer()
+    # In sharded mode each worker only checks the plays it owns
+    json_fixer = PlayFileFixer(file_filter=owns_play)
+
+    def fix_play_files():
+        try:
+            fixed_count = json_fixer.check_and_fix_all_plays()
+            if fixed_count > 0:
+                logging.info(f"JSON fixer repaired {fixed_count} corrupted play files")
+                # display.info(f"JSON fixer repaired {fixed_count} corrupted play files")
+        except Exception as e:
+            error_msg = f"Error in JSON fixer: {str(e)}"
+            logging.error(error_msg)
+            display.error(error_msg)
+
+    # The JSON fixer runs in the background a few seconds after each cycle, once the cycle's file operations are done.
+    # It shares a lock with the cycle so the two never touch play files at the same time.
+    cycle_lock = threading.Lock()
+    json_fix_task = BackgroundTask('JSON fixer', fix_play_files, delay=3, lock=cycle_lock)
+    clock = make_cycle_clock()
+    from goldflipper.orchestration.warmup import make_warmup
+    warmup = make_warmup({current_account(): plays_dir})
     
     logging.info(f"Monitoring plays directory: {plays_dir}")
+    submission_engine = SubmissionEngine(config.get('orders', 'submission', 'max_workers', default=4))
+
+    # Settle pending plays from streamed fills; polling below stays as the fallback
+    if config.get('orders', 'trade_stream', 'enabled', default=False):
+        try:
+            start_trade_update_listener(plays_dir)
+        except Exception as e:
+            logging.error(f"Could not start trade update listener: {str(e)}")
+            display.error(f"Could not start trade update listener, relying on polling: {str(e)}")
 
     while True:
+        clock.start_cycle()
+        polling_interval = config.get('monitoring', 'polling_interval', default=30)
         try:
             market_data.start_new_cycle()
             logging.info("Starting new monitoring cycle")
             
             # Check market hours before processing
             is_open, minutes_to_open = validate_market_hours()
+            if end_of_day_cleanup_due():
+                run_end_of_day_cleanup(plays_dir)
+            # Prefetch contract metadata once per day, ahead of the open
+            if (config.get('orders', 'contract_cache', 'enabled', default=True)
+                    and not get_contract_cache().is_prefetched()
+                    and (is_open or minutes_to_open <= config.get('orders', 'contract_cache', 'prefetch_minutes_before_open', default=30))):
+                prefetch_new_play_contracts(plays_dir)
+
             if not is_open:
                 sleep_time = get_sleep_interval(minutes_to_open)
+                if warmup:
+                    sleep_time = warmup.tick(minutes_to_open, sleep_time)
                 display.status(f"Market is CLOSED. Next check in {sleep_time} seconds.")
-                time.sleep(sleep_time)
+                clock.wait(sleep_time)
                 continue
                 
             display.success("Market is OPEN. Monitoring starting.")
-            # display.header("Checking for new and open plays...")
-            logging.info("Checking for new and open plays")
-
-            # Check for expired plays in the "new" folder
-            new_play_dir = os.path.join(plays_dir, 'new')
-            play_files = [os.path.join(new_play_dir, f) for f in os.listdir(new_play_dir) if f.endswith('.json')]
-            current_date = datetime.now().date()
-            
-            # Handle expired plays
-            for play_file in play_files:
-                play = load_play(play_file)
-                if play and 'play_expiration_date' in play:
-                    expiration_date = datetime.strptime(play['play_expiration_date'], "%m/%d/%Y").date()
-                    if expiration_date < current_date:
-                        move_play_to_expired(play_file)
-                        display.warning(f"Moved expired play to expired folder: {play_file}")
-                        logging.warning(f"Play has expired: {play_file}")
-
-            # Manage pending plays first
-            manage_pending_plays(plays_dir)
-
-            # Print current option data for all active plays
-            for play_type in ['new', 'open', 'pending-opening', 'pending-closing']:
-                play_dir = os.path.join(plays_dir, play_type)
-                if not os.path.exists(play_dir):
-                    continue
-                
-                play_files = [os.path.join(play_dir, f) for f in os.listdir(play_dir) if f.endswith('.json')]
-                
-                for play_file in play_files:
-                    play = load_play(play_file)
-                    if play:
-                        try:
-                            # Get current stock price
-                            current_price = get_stock_price(play['symbol'])
-                            if current_price is None or current_price <= 0:
-                                logging.error(f"Could not get valid share price for {play['symbol']}")
-                                display.error(f"Could not get valid share price for {play['symbol']}")
-                                continue
-
-                            # Get current option data
-                            option_data = get_option_data(play['option_contract_symbol'])
-                            if option_data is None:
-                                logging.error(f"Could not get option data for {play['option_contract_symbol']}")
-                                display.error(f"Could not get option data for {play['option_contract_symbol']}")
-                                continue
-                            
-                            # Log detailed data to file
-                            logging.info(f"Play data for {play['symbol']}: "
-                                       f"Type={play_type}, "
-                                       f"Strike=${play['strike_price']}, "
-                                       f"Exp={play['expiration_date']}, "
-                                       f"Stock=${current_price:.2f}, "
-                                       f"Bid=${option_data['bid']:.2f}, "
-                                       f"Ask=${option_data['ask']:.2f}")
-
-                            # Display formatted data to terminal
-                            play_name = play.get('play_name', 'N/A')
-                            border = "+" + "-" * 60 + "+"
-                            header_text = play_name
-                            display.status(border, show_timestamp=False)
-                            display.status(f"|{header_text:^60}|", show_timestamp=False)
-                            display.status(border, show_timestamp=False)
-                            display.status(
-                                f"Play: {play['symbol']} {play['trade_type']} "
-                                f"{play['strike_price']} Strike {play['expiration_date']} Expiration"
-                            )
-
-                            # Map play types to display methods and colors
-                            status_display = {
-                                'new': (display.info, 'info'),
-                                'pending-opening': (display.info, 'info'),
-                                'open': (display.success, 'success'),
-                                'pending-closing': (display.warning, 'warning'),
-                                'closed': (display.status, 'status'),
-                                'expired': (display.error, 'error'),
-                                'temp': (display.info, 'info')
-                            }
-                            
-                            # Get the appropriate display method and color for the current play type
-                            display_method, color = status_display.get(play_type.lower(), (display.status, 'status'))
-                            
-                            play_status = play.get('status', {}).get('play_status')
-                            play_expiration_date = play.get('play_expiration_date')
-                            
-                            # Create status message with color
-                            status_msg = f"Status: [{play_type}]"
-                            if play_expiration_date and play_status in ('TEMP', 'NEW'):
-                                status_msg = f"Status: [{play_type}], Play expires: {play_expiration_date}"
-                            
-                            # Display with appropriate method
-                            display_method(status_msg, show_timestamp=False)
-
-                            display.price(f"Stock price: ${current_price:.2f}")
-                            display.price(
-                                f"Option premium: Bid ${option_data['bid']:.2f} "
-                                f"Ask ${option_data['ask']:.2f} Last ${option_data['premium']:.2f}"
-                            )
-                            display.status(border, show_timestamp=False)
-
-                            
-                        except Exception as e:
-                            error_msg = f"Error fetching market data for {play['symbol']}: {str(e)}"
-                            display.error(error_msg)
-                            logging.error(error_msg)
-
-            # Execute trades
-            for play_type in ['new', 'open']:
-                play_dir = os.path.join(plays_dir, play_type)
-                play_files = [os.path.join(play_dir, f) for f in os.listdir(play_dir) if f.endswith('.json')]
-                
-                for play_file in play_files:
-                    if execute_trade(play_file, play_type):
-                        msg = f"Successfully processed {play_type} play: {play_file}"
-                        display.status(msg)
-                        logging.info(msg)
-                    else:
-                        msg = f"Conditions not met for {play_type} play: {play_file}"
-                        # display.info(msg)
-                        logging.info(msg)
+            with cycle_lock:
+                run_monitoring_cycle(plays_dir, submission_engine)
+            if warmup:
+                warmup.note_live_cycle(clock.elapsed())
 
             display.header("Cycle complete. Waiting for next cycle...")
             logging.info("Cycle complete. Waiting for next cycle")
-            
-            # Run JSON fixer after the cycle completes but before the sleep
-            # Use a small delay to ensure all file operations from the cycle are complete
-            json_fix_delay = 3  # seconds to wait before running JSON fixer
-            polling_interval = config.get('monitoring', 'polling_interval', default=30)
-            
-            if json_fix_delay < polling_interval:  # Only run if there's enough time before next cycle
-                time.sleep(json_fix_delay)  # Short delay before running the fixer
-                
-                try:
-                    fixed_count = json_fixer.check_and_fix_all_plays()
-                    if fixed_count > 0:
-                        logging.info(f"JSON fixer repaired {fixed_count} corrupted play files")
-                        # display.info(f"JSON fixer repaired {fixed_count} corrupted play files")
-                except Exception as e:
-                    error_msg = f"Error in JSON fixer: {str(e)}"
-                    logging.error(error_msg)
-                    display.error(error_msg)
-                    
-                # Adjust remaining sleep time
-                remaining_sleep = max(0, polling_interval - json_fix_delay)
-                time.sleep(remaining_sleep)
-            else:
-                # Full polling interval if no time for JSON fixer
-                time.sleep(polling_interval)
+            log_cycle_metrics(clock)
+            json_fix_task.trigger()
+
+            if adaptive_polling_enabled():
+                # Wake up for the next play that is due, never later than the polling interval
+                polling_interval = get_play_scheduler(plays_dir).sleep_interval(polling_interval)
+            clock.wait(polling_interval)
 
         except Exception as e:
             error_msg = f"An error occurred during play monitoring: {e}"
@@ -2241,8 +2583,7 @@ def monitor_plays_continuously():
             logging.error(error_msg)
 
             # Wait for the configured interval before the next cycle
-            polling_interval = config.get('monitoring', 'polling_interval', default=30)
-            time.sleep(polling_interval)
+            clock.wait(polling_interval)
 
 # ==================================================
 # 8. ANCILLARY FUNCTIONS
@@ -2250,24 +2591,42 @@ def monitor_plays_continuously():
 # Functions to support the main trade execution flow.
 
 def verify_position_exists(play):
-    """Verify position exists with retries"""
-    max_retries = 3
-    retry_delay = 2  # seconds
-    
-    for attempt in range(max_retries):
+    """
+    Verify position exists against the cycle's position book.
+
+    Does not wait for a fill; if the position is not there yet, the caller
+    retries against the next cycle's snapshot.
+    """
+    try:
+        return get_position_book().get_position(play.get('option_contract_symbol')) is not None
+    except Exception as e:
+        logging.error(f"Position verification failed: {e}")
+        display.error(f"Verifying position failed: {e}")
+        return False
+
+def confirm_market_fill(client, order, attempts=3, delay=2):
+    """
+    Wait up to attempts * delay seconds for a just-submitted market order to fill.
+
+    Returns True once the order is filled; its symbol is then looked up
+    directly in the position book so the new position is seen right away.
+    """
+    for attempt in range(attempts):
+        status = str(getattr(order.status, 'value', order.status))
+        if status == 'filled':
+            get_position_book().invalidate(order.symbol)
+            return True
+        if status in ('canceled', 'expired', 'rejected'):
+            return False
+        time.sleep(delay)
         try:
-            client = get_alpaca_client()
-            position = client.get_open_position(play.get('option_contract_symbol'))
-            if position:
-                return True
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
+            order = client.get_order_by_id(order.id)
         except Exception as e:
-            logging.error(f"Position verification attempt {attempt + 1} failed: {e}")
-            display.error(f"Verifying position, attempt {attempt + 1} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-    return False
+            logging.error(f"Fill check for order {order.id}, attempt {attempt + 1} failed: {e}")
+    status = str(getattr(order.status, 'value', order.status))
+    if status == 'filled':
+        get_position_book().invalidate(order.symbol)
+    return status == 'filled'
 
 def handle_conditional_plays(play, play_file):
     """Handle OCO and OTO, aka OSO, triggers after position is confirmed open."""
@@ -2306,115 +2665,77 @@ def handle_conditional_plays(play, play_file):
         save_play(play, play_file)
         return True
     
-    success = True
     plays_base_dir = os.path.abspath(os.path.dirname(os.path.dirname(play_file)))
+    # Triggers done in earlier attempts are not processed again
+    done = set(play['status'].get('conditionals_done') or [])
     
     # Handle OCO triggers
+    # Peers are located through the play graph instead of probing each folder
+    graph = get_play_graph(plays_base_dir) if play_graph_enabled() else None
+    pending_peers = []
     for oco_trigger in oco_triggers:
+        if f"OCO:{oco_trigger}" in done:
+            continue
         display.status(f"OCO: processing trigger {oco_trigger}")
+        folder = _locate_play(plays_base_dir, oco_trigger, graph)
         # 1) If trigger is still NEW, expire it
         new_path = os.path.join(plays_base_dir, 'new', oco_trigger)
-        if os.path.exists(new_path):
+        if folder == 'new':
             try:
-                if not move_play_to_expired(new_path):
-                    success = False
-                    logging.error(f"Failed to move OCO trigger to expired: {oco_trigger}")
-                    display.error(f"Failed to move OCO trigger to expired: {oco_trigger}")
+                move_play_to_expired(new_path)
+                done.add(f"OCO:{oco_trigger}")
             except Exception as e:
                 logging.error(f"Failed to process OCO trigger {oco_trigger}: {e}")
                 display.error(f"Failed to process OCO trigger {oco_trigger}: {e}")
-                success = False
             continue
 
         # 2) If trigger is PENDING-OPENING, cancel broker order and move to TEMP
-        pending_opening_path = os.path.join(plays_base_dir, 'pending-opening', oco_trigger)
-        if os.path.exists(pending_opening_path):
-            try:
-                # Load play to get order_id
-                with open(pending_opening_path, 'r') as f:
-                    pending_play = json.load(f)
-
-                order_id = pending_play.get('status', {}).get('order_id')
-                if not order_id:
-                    logging.warning(f"OCO pending-opening play missing order_id, moving to TEMP: {oco_trigger}")
-                    move_play_to_temp(pending_opening_path)
-                    continue
-
-                client = get_alpaca_client()
-                try:
-                    order = client.get_order_by_id(order_id)
-                except Exception as e:
-                    logging.error(f"Failed to fetch order for OCO pending-opening play {oco_trigger}: {e}")
-                    display.error(f"Failed to fetch order for OCO pending-opening play {oco_trigger}: {e}")
-                    success = False
-                    continue
-
-                order_status = getattr(order, 'status', None) or order.get('status') if isinstance(order, dict) else None
+        if folder == 'pending-opening':
+            if get_action_queue().is_pending(f"oco-cancel:{oco_trigger}"):
+                logging.info(f"OCO cancel retry still in progress for {oco_trigger}")
+                continue
+            pending_peers.append(oco_trigger)
+            continue
 
-                # If already filled, do not recycle; let normal flow handle it
-                if order_status == 'filled':
-                    logging.warning(f"OCO pending-opening play has already filled, cannot recycle: {oco_trigger}")
-                    display.warning(f"OCO pending-opening play has already filled; cannot be recycled: {oco_trigger}")
-                    success = False
-                    continue
+        # 3) Anywhere else the peer has already been expired, recycled or opened: nothing left to do
+        done.add(f"OCO:{oco_trigger}")
 
-                # Attempt to cancel the order
-                cancel_success = False
-                try:
-                    # Prefer explicit cancel by id; fall back if SDK differs
-                    if hasattr(client, 'cancel_order_by_id'):
-                        client.cancel_order_by_id(order_id)
-                        cancel_success = True
-                    elif hasattr(client, 'cancel_order'):
-                        client.cancel_order(order_id)
-                        cancel_success = True
-                    else:
-                        logging.error("Alpaca client has no cancel_order[_by_id] method")
-                except Exception as e:
-                    logging.error(f"Failed to cancel OCO pending-opening order {order_id} for {oco_trigger}: {e}")
-                    display.error(f"Failed to cancel OCO pending-opening order for {oco_trigger}")
-
-                if cancel_success:
-                    logging.info(f"Cancelled pending-opening OCO order {order_id} for {oco_trigger}")
-                    # display.info(f"Cancelled pending-opening OCO order for {oco_trigger}")
-                    # Move the play to TEMP for recycling
-                    move_play_to_temp(pending_opening_path)
-                else:
-                    # If cancel did not throw but not confirmed, still try to move cautiously if not filled
-                    if order_status in ['canceled', 'expired', 'rejected']:
-                        move_play_to_temp(pending_opening_path)
-                        logging.info(f"Order already {order_status}. Moved OCO pending-opening play to TEMP: {oco_trigger}")
-                        # display.info(f"Order already {order_status}. Moved OCO pending-opening play to TEMP: {oco_trigger}")
-                    else:
-                        success = False
-                        logging.error(f"Could not cancel OCO pending-opening play: {oco_trigger}")
-                        display.error(f"Could not cancel OCO pending-opening play: {oco_trigger}")
-            except Exception as e:
-                logging.error(f"Failed to recycle OCO pending-opening play {oco_trigger}: {e}")
-                display.error(f"Failed to recycle OCO pending-opening play {oco_trigger}: {e}")
-                success = False
+    # Pending-opening peers are cancelled as one concurrent batch
+    if pending_peers:
+        engine = SubmissionEngine(config.get('orders', 'submission', 'max_workers', default=4))
+        results = engine.run(
+            [[oco_trigger] for oco_trigger in pending_peers],
+            lambda oco_trigger: _recycle_oco_peer(os.path.join(plays_base_dir, 'pending-opening', oco_trigger), oco_trigger)
+        )
+        done.update(f"OCO:{oco_trigger}" for oco_trigger, recycled in zip(pending_peers, results) if recycled)
     
     # Handle OTO triggers (move from temp to new)
     for oto_trigger in oto_triggers:
+        if f"OTO:{oto_trigger}" in done:
+            continue
         display.status(f"OTO: activating trigger {oto_trigger}")
         temp_path = os.path.join(plays_base_dir, 'temp', oto_trigger)
-        new_path = os.path.join(plays_base_dir, 'new', oto_trigger)
         
         try:
-            if os.path.exists(temp_path):
+            folder = _locate_play(plays_base_dir, oto_trigger, graph)
+            if folder == 'temp':
                 # Move the file from temp to new
                 move_play_to_new(temp_path)
                 logging.info(f"Moved OTO trigger from temp to new: {oto_trigger}")
                 # display.info(f"Moved OTO trigger from temp to new: {oto_trigger}")
+            elif folder:
+                logging.info(f"OTO trigger {oto_trigger} already left temp (now in {folder})")
             else:
-                logging.error(f"OTO trigger file not found in temp folder: {oto_trigger}")
+                # Not in any folder, so a retry cannot find it either
+                logging.error(f"OTO trigger file not found in any plays folder: {oto_trigger}")
                 display.error(f"Conditional OTO play could not be found: {oto_trigger}")
-                success = False
+            done.add(f"OTO:{oto_trigger}")
         except Exception as e:
             logging.error(f"Failed to move OTO trigger {oto_trigger}: {e}")
             display.error(f"Failed to process OTO trigger {oto_trigger}: {e}")
-            success = False
     
+    success = all(f"OCO:{t}" in done for t in oco_triggers) and all(f"OTO:{t}" in done for t in oto_triggers)
+    play['status']['conditionals_done'] = sorted(done)
     play['status']['conditionals_handled'] = success
     save_play(play, play_file)
     
@@ -2423,6 +2744,101 @@ def handle_conditional_plays(play, play_file):
     
     return success
 
+def _locate_play(plays_dir, name, graph=None):
+    """Folder a play file is in (via the play graph when available), or None."""
+    if graph:
+        return graph.locate(name)
+    return next((folder for folder in PLAY_FOLDERS if os.path.exists(os.path.join(plays_dir, folder, name))), None)
+
+def _recycle_oco_peer(pending_opening_path, oco_trigger):
+    """Cancel a pending-opening OCO peer's entry order and move it to TEMP; False if it could not be recycled."""
+    try:
+        # Load play to get order_id
+        with open(pending_opening_path, 'r') as f:
+            pending_play = json.load(f)
+
+        order_id = pending_play.get('status', {}).get('order_id')
+        if not order_id:
+            logging.warning(f"OCO pending-opening play missing order_id, moving to TEMP: {oco_trigger}")
+            move_play_to_temp(pending_opening_path)
+            return True
+
+        client = get_alpaca_client()
+        try:
+            order = client.get_order_by_id(order_id)
+        except Exception as e:
+            logging.error(f"Failed to fetch order for OCO pending-opening play {oco_trigger}: {e}")
+            display.error(f"Failed to fetch order for OCO pending-opening play {oco_trigger}: {e}")
+            return False
+
+        order_status = getattr(order, 'status', None) or order.get('status') if isinstance(order, dict) else None
+
+        # If already filled, do not recycle; let normal flow handle it
+        if order_status == 'filled':
+            logging.warning(f"OCO pending-opening play has already filled, cannot recycle: {oco_trigger}")
+            display.warning(f"OCO pending-opening play has already filled; cannot be recycled: {oco_trigger}")
+            return False
+
+        # Attempt to cancel the order
+        cancel_success = False
+        try:
+            # Prefer explicit cancel by id; fall back if SDK differs
+            if hasattr(client, 'cancel_order_by_id'):
+                client.cancel_order_by_id(order_id)
+                cancel_success = True
+            elif hasattr(client, 'cancel_order'):
+                client.cancel_order(order_id)
+                cancel_success = True
+            else:
+                logging.error("Alpaca client has no cancel_order[_by_id] method")
+        except Exception as e:
+            logging.error(f"Failed to cancel OCO pending-opening order {order_id} for {oco_trigger}: {e}")
+            display.error(f"Failed to cancel OCO pending-opening order for {oco_trigger}")
+
+        if cancel_success:
+            logging.info(f"Cancelled pending-opening OCO order {order_id} for {oco_trigger}")
+            # display.info(f"Cancelled pending-opening OCO order for {oco_trigger}")
+            # Move the play to TEMP for recycling
+            move_play_to_temp(pending_opening_path)
+            return True
+        else:
+            # If cancel did not throw but not confirmed, still try to move cautiously if not filled
+            if order_status in ['canceled', 'expired', 'rejected']:
+                move_play_to_temp(pending_opening_path)
+                logging.info(f"Order already {order_status}. Moved OCO pending-opening play to TEMP: {oco_trigger}")
+                # display.info(f"Order already {order_status}. Moved OCO pending-opening play to TEMP: {oco_trigger}")
+                return True
+            else:
+                logging.error(f"Could not cancel OCO pending-opening play: {oco_trigger}")
+                display.error(f"Could not cancel OCO pending-opening play: {oco_trigger}, retrying in background")
+                get_action_queue().submit(
+                    f"oco-cancel:{oco_trigger}",
+                    lambda path=pending_opening_path, oid=order_id: _retry_oco_cancel(path, oid),
+                    deadline_seconds=config.get('monitoring', 'action_queue', 'deadline_seconds', default=60),
+                    max_attempts=config.get('monitoring', 'max_retries', default=3)
+                )
+                return False
+    except Exception as e:
+        logging.error(f"Failed to recycle OCO pending-opening play {oco_trigger}: {e}")
+        display.error(f"Failed to recycle OCO pending-opening play {oco_trigger}: {e}")
+        return False
+
+
+def _retry_oco_cancel(pending_opening_path, order_id):
+    """Queued OCO cancel retry; done once the peer has left pending-opening or cannot be recycled."""
+    if not os.path.exists(pending_opening_path):
+        return True
+    client = get_alpaca_client()
+    order = client.get_order_by_id(order_id)
+    if order.status == 'filled':
+        logging.warning(f"OCO pending-opening order {order_id} filled before it could be cancelled")
+        return True
+    if order.status not in ['canceled', 'expired', 'rejected']:
+        client.cancel_order_by_id(order_id)
+    move_play_to_temp(pending_opening_path)
+    logging.info(f"Cancelled pending-opening OCO order {order_id} on retry")
+    return True
+
 def reload_oco_peers(play, play_file):
     """Optionally reload OCO peers from TEMP to NEW after this play is closed.
 
@@ -2438,10 +2854,11 @@ def reload_oco_peers(play, play_file):
             return
 
         plays_base_dir = os.path.abspath(os.path.dirname(os.path.dirname(play_file)))
+        graph = get_play_graph(plays_base_dir) if play_graph_enabled() else None
         reloaded = []
         for oco_trigger in oco_triggers:
             temp_path = os.path.join(plays_base_dir, 'temp', oco_trigger)
-            if os.path.exists(temp_path):
+            if (graph.locate(oco_trigger) == 'temp') if graph else os.path.exists(temp_path):
                 try:
                     move_play_to_new(temp_path)
                     reloaded.append(oco_trigger)
@@ -2482,14 +2899,15 @@ def validate_bid_price(bid_price, symbol, fallback_price):
         
     return bid_price
 
-def handle_end_of_day_pending_plays():
+def handle_end_of_day_pending_plays(plays_dir=None):
     """Move pending plays back to their previous states at market close."""
+    plays_dir = plays_dir or os.path.abspath(os.path.join(os.path.dirname(__file__), 'plays'))
     try:
         # Handle pending-opening plays
-        pending_opening_dir = os.path.join(os.getcwd(), 'plays', 'pending-opening')
+        pending_opening_dir = os.path.join(plays_dir, 'pending-opening')
         if os.path.exists(pending_opening_dir):
             play_files = [os.path.join(pending_opening_dir, f) for f in os.listdir(pending_opening_dir) 
-                         if f.endswith('.json')]
+                         if f.endswith('.json') and owns_play(os.path.join(pending_opening_dir, f))]
                          
             for play_file in play_files:
                 try:
@@ -2527,10 +2945,10 @@ def handle_end_of_day_pending_plays():
                     display.error(f"Error processing pending-opening play {play_file}: {e}")
 
         # Handle pending-closing plays
-        pending_closing_dir = os.path.join(os.getcwd(), 'plays', 'pending-closing')
+        pending_closing_dir = os.path.join(plays_dir, 'pending-closing')
         if os.path.exists(pending_closing_dir):
             play_files = [os.path.join(pending_closing_dir, f) for f in os.listdir(pending_closing_dir) 
-                         if f.endswith('.json')]
+                         if f.endswith('.json') and owns_play(os.path.join(pending_closing_dir, f))]
                          
             for play_file in play_files:
                 try:
@@ -2571,7 +2989,14 @@ def handle_end_of_day_pending_plays():
         logging.error(f"Error handling end of day pending plays: {e}")
         display.error(f"Error handling end of day pending plays: {e}")
 
-def manage_pending_plays(plays_dir, single_play=None):
+# Serializes pending play transitions between the monitoring loop and the trade update listener,
+# per account
+_pending_plays_locks = {}
+
+def _pending_plays_lock():
+    return _pending_plays_locks.setdefault(current_account(), threading.RLock())
+
+def manage_pending_plays(plays_dir, single_play=None, orders=None):
     """
     Manage plays in pending-opening and pending-closing directories.
     Can handle either all pending plays or a single specified play.
@@ -2579,10 +3004,15 @@ def manage_pending_plays(plays_dir, single_play=None):
     Args:
         plays_dir: Base directory containing play folders
         single_play: Optional; tuple of (play_data, play_file) to check single play
+        orders: Optional; OrderSnapshot to resolve orders from (e.g. a streamed order update)
     
     Returns:
         bool: True if position exists/verified, False if position check failed
     """
+    with _pending_plays_lock():
+        return _manage_pending_plays(plays_dir, single_play, orders)
+
+def _manage_pending_plays(plays_dir, single_play, orders):
     if single_play:
         play, play_file = single_play
         current_status = play.get('status', {}).get('play_status')
@@ -2592,23 +3022,33 @@ def manage_pending_plays(plays_dir, single_play=None):
         display.header("Managing pending plays...")
         logging.info("Managing pending plays")
 
+    # Collect the plays to check for each pending folder
+    pending_plays = {}
     for pending_type in ['pending-opening', 'pending-closing']:
         # For single play mode, only process if it matches the current type
         if single_play:
             play, play_file = single_play
             if play.get('status', {}).get('play_status').lower() != pending_type:
                 continue
-            plays_to_process = [(play, play_file)]
+            pending_plays[pending_type] = [(play, play_file)]
         else:
-            pending_dir = os.path.join(plays_dir, pending_type)
-            if not os.path.exists(pending_dir):
-                continue
-            play_files = [os.path.join(pending_dir, f) for f in os.listdir(pending_dir) if f.endswith('.json')]
-            plays_to_process = [(load_play(pf), pf) for pf in play_files if load_play(pf)]
+            play_files = list_play_files(plays_dir, pending_type)
+            loaded = [(load_play(pf), pf) for pf in play_files]
+            pending_plays[pending_type] = [(play, pf) for play, pf in loaded if play]
+
+    # Resolve every pending order from one listing call; a single play was just
+    # submitted or changed, so it is looked up directly
+    batch_plays = [play for plays in pending_plays.values() for play, _ in plays]
+    if orders is None:
+        if not single_play and batch_plays and config.get('orders', 'reconciliation', 'enabled', default=True):
+            orders = fetch_order_snapshot(symbols=[play.get('option_contract_symbol') for play in batch_plays])
+        else:
+            orders = OrderSnapshot()
+    repricer = LimitRepricer()
 
+    for pending_type, plays_to_process in pending_plays.items():
         for play, play_file in plays_to_process:
             try:
-                client = get_alpaca_client()
                 contract_symbol = play.get('option_contract_symbol')
                 
                 # Handle pending-opening plays
@@ -2619,11 +3059,12 @@ def manage_pending_plays(plays_dir, single_play=None):
                         continue
 
                     try:
-                        order = client.get_order_by_id(order_id)
+                        order = orders.get_order(order_id)
                         if order.status == 'filled':
                             # Verify position exists
                             try:
-                                position = client.get_open_position(contract_symbol)
+                                get_position_book().note_fill(contract_symbol, getattr(order, 'filled_at', None))
+                                position = get_position_book().get_position(contract_symbol)
                                 if position is None:
                                     logging.error(f"Order filled but position not found for {contract_symbol}")
                                     display.error(f"Order filled, but position not found for {contract_symbol}")
@@ -2657,6 +3098,14 @@ def manage_pending_plays(plays_dir, single_play=None):
                             # display.info(f"Order {order.status}, moved back to new: {play_file}")
                             if single_play:
                                 return False
+
+                        elif repricer.enabled and order.status in WORKING_ORDER_STATUSES:
+                            # Walk the unfilled limit toward the market using this cycle's quote
+                            action = repricer.reprice(get_alpaca_client(), play, order, get_option_data(contract_symbol))
+                            if action:
+                                save_play(play, play_file)
+                                display.status(f"Limit entry {'repriced' if action == 'replace' else 'cancelled'} "
+                                               f"for {contract_symbol}")
                     except Exception as e:
                         logging.error(f"Error checking order status for {play_file}: {str(e)}")
                         display.error(f"Error checking order status for {play_file}: {str(e)}")
@@ -2671,11 +3120,12 @@ def manage_pending_plays(plays_dir, single_play=None):
                         continue
 
                     try:
-                        order = client.get_order_by_id(order_id)
+                        order = orders.get_order(order_id)
                         if order.status == 'filled':
                             # Verify position is closed
                             try:
-                                position = client.get_open_position(contract_symbol)
+                                get_position_book().note_fill(contract_symbol, getattr(order, 'filled_at', None))
+                                position = get_position_book().get_position(contract_symbol)
                                 if position is not None:
                                     logging.error(f"Closing order filled but position still exists for {contract_symbol}")
                                     display.error(f"Closing order filled, but position still exists for {contract_symbol}")
@@ -2731,7 +3181,42 @@ def manage_pending_plays(plays_dir, single_play=None):
                 if single_play:
                     return False
 
+    if orders.fallback_lookups:
+        logging.debug(f"Pending play reconciliation needed {orders.fallback_lookups} individual order lookups")
+
     return True  # Return True for both batch processing and if single play was processed without errors
 
+def apply_order_update(plays_dir, order):
+    """
+    Apply a streamed order update to the pending play that placed the order.
+
+    Args:
+        plays_dir: Base directory containing play folders
+        order: Alpaca order from a trade update event
+
+    Returns:
+        bool: True if a pending play was found for the order
+    """
+    order_id = str(order.id)
+    client_order_id = getattr(order, 'client_order_id', None)
+    pending_keys = [
+        ('pending-opening', 'order_id', 'client_order_id'),
+        ('pending-closing', 'closing_order_id', 'closing_client_order_id')
+    ]
+
+    with _pending_plays_lock():
+        for pending_type, id_key, client_id_key in pending_keys:
+            # Only this process's plays: every shard worker runs its own listener
+            for play_file in list_play_files(plays_dir, pending_type):
+                play = load_play(play_file)
+                if not play:
+                    continue
+                status = play.get('status', {})
+                if status.get(id_key) == order_id or (client_order_id and status.get(client_id_key) == client_order_id):
+                    logging.info(f"Order update {order.status} for {play_file}")
+                    manage_pending_plays(plays_dir, single_play=(play, play_file), orders=OrderSnapshot([order]))
+                    return True
+    return False
+
 if __name__ == "__main__":
     monitor_plays_continuously()
\ No newline at end of file
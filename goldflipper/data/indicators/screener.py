@@ -0,0 +1,261 @@
+import os
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class BarPanel:
+    """Aligned daily bars for many symbols (rows = dates, columns = symbols)"""
+    high: pd.DataFrame
+    low: pd.DataFrame
+    close: pd.DataFrame
+    volume: pd.DataFrame
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.close.columns)
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> 'BarPanel':
+        """
+        Build a panel from per-symbol OHLCV frames (yfinance `history()` layout).
+
+        Dates are aligned on the union of all indexes. Gaps are forward filled so a
+        symbol that did not trade on a given day carries its last bar forward.
+        """
+        if not frames:
+            raise ValueError("No bar data provided")
+
+        fields = {}
+        for field in ['High', 'Low', 'Close', 'Volume']:
+            fields[field] = pd.concat(
+                {symbol: df[field] for symbol, df in frames.items()},
+                axis=1
+            ).sort_index()
+
+        close = fields['Close'].dropna(how='all').ffill()
+        index = close.index
+        return cls(
+            high=fields['High'].reindex(index).ffill(),
+            low=fields['Low'].reindex(index).ffill(),
+            close=close,
+            volume=fields['Volume'].reindex(index).fillna(0.0)
+        )
+
+
+class LocalBarSource:
+    """
+    Reads daily bars from a local directory with one `<SYMBOL>.csv` per symbol.
+
+    Files use the column layout written by `yf.Ticker(...).history().to_csv()`
+    (Date index plus Open/High/Low/Close/Volume), so a one-off download can be
+    reused for repeated screening and offline benchmarking.
+    """
+
+    def __init__(self, bars_dir: str):
+        self.bars_dir = bars_dir
+
+    def path_for(self, symbol: str) -> str:
+        return os.path.join(self.bars_dir, f"{symbol.upper()}.csv")
+
+    def available_symbols(self) -> List[str]:
+        if not os.path.isdir(self.bars_dir):
+            return []
+        return sorted(f[:-4] for f in os.listdir(self.bars_dir) if f.endswith('.csv'))
+
+    def save(self, symbol: str, bars: pd.DataFrame) -> None:
+        os.makedirs(self.bars_dir, exist_ok=True)
+        bars.to_csv(self.path_for(symbol))
+
+    def load(self, symbols: List[str]) -> BarPanel:
+        frames = {}
+        for symbol in symbols:
+            path = self.path_for(symbol)
+            if not os.path.exists(path):
+                logging.warning(f"No local bars for {symbol} at {path}")
+                continue
+            try:
+                frames[symbol.upper()] = pd.read_csv(path, index_col=0, parse_dates=[0])
+            except Exception as e:
+                logging.error(f"Error reading bars for {symbol}: {str(e)}")
+        return BarPanel.from_frames(frames)
+
+
+class BatchIndicatorCalculator:
+    """
+    Computes EMA, MACD and TTM Squeeze across every column of a BarPanel at once.
+
+    The formulas mirror EMACalculator, MACDCalculator and TTMSqueezeCalculator so a
+    symbol screened here reports the same latest values as `calculate_indicators`.
+    """
+
+    def __init__(self, panel: BarPanel, period: int = 20):
+        self.panel = panel
+        self.period = period
+        if len(panel.close) < period:
+            raise ValueError(f"Insufficient data points. Need at least {period} points")
+
+    def calculate_ema(self, periods: List[int]) -> pd.DataFrame:
+        """Latest EMA values and trend flags per symbol"""
+        close = self.panel.close
+        result = {}
+        emas = {}
+        for period in periods:
+            ema = close.ewm(span=period, adjust=False).mean()
+            emas[period] = ema
+            result[f"ema_{period}"] = ema.iloc[-1]
+            result[f"{period}_above"] = close.iloc[-1] > ema.iloc[-1]
+            result[f"{period}_rising"] = ema.iloc[-1] > ema.iloc[-2]
+
+        if 9 in emas and 21 in emas:
+            fast, slow = emas[9], emas[21]
+            result['9_21_crossover_bullish'] = fast.iloc[-1] > slow.iloc[-1]
+            result['9_21_crossover_up'] = (fast.iloc[-1] > slow.iloc[-1]) & (fast.iloc[-2] <= slow.iloc[-2])
+            result['9_21_crossover_down'] = (fast.iloc[-1] < slow.iloc[-1]) & (fast.iloc[-2] >= slow.iloc[-2])
+
+        return pd.DataFrame(result)
+
+    def calculate_macd(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> pd.DataFrame:
+        """Latest MACD values and signal flags per symbol"""
+        close = self.panel.close
+        macd_line = close.ewm(span=fast_period, adjust=False).mean() - close.ewm(span=slow_period, adjust=False).mean()
+        signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+        histogram = macd_line - signal_line
+
+        return pd.DataFrame({
+            'macd_line': macd_line.iloc[-1],
+            'signal_line': signal_line.iloc[-1],
+            'macd_histogram': histogram.iloc[-1],
+            'macd_above_signal': macd_line.iloc[-1] > signal_line.iloc[-1],
+            'histogram_increasing': histogram.iloc[-1] > histogram.iloc[-2],
+            'macd_increasing': macd_line.iloc[-1] > macd_line.iloc[-2],
+            'macd_crossover_up': (macd_line.iloc[-1] > signal_line.iloc[-1]) & (macd_line.iloc[-2] <= signal_line.iloc[-2]),
+            'macd_crossover_down': (macd_line.iloc[-1] < signal_line.iloc[-1]) & (macd_line.iloc[-2] >= signal_line.iloc[-2])
+        })
+
+    def calculate_ttm_squeeze(self, bb_mult: float = 2.0, kc_mult: float = 1.5) -> pd.DataFrame:
+        """Latest TTM Squeeze state and momentum per symbol"""
+        high, low, close = self.panel.high, self.panel.low, self.panel.close
+        period = self.period
+
+        typical_price = (high + low + close) / 3
+        sma = typical_price.rolling(window=period).mean()
+        std = typical_price.rolling(window=period).std()
+        upper_bb = sma + (bb_mult * std)
+        lower_bb = sma - (bb_mult * std)
+
+        # True range is the element-wise max of the three ranges, per symbol
+        prev_close = close.shift()
+        true_range = np.maximum(
+            high - low,
+            np.maximum((high - prev_close).abs(), (low - prev_close).abs())
+        )
+        # Match pandas' max(axis=1) skipna behaviour on the first row
+        true_range = true_range.fillna(high - low)
+        atr = true_range.rolling(window=period).mean()
+
+        ema = typical_price.ewm(span=period).mean()
+        upper_kc = ema + (kc_mult * atr)
+        lower_kc = ema - (kc_mult * atr)
+
+        squeeze = (lower_bb > lower_kc) & (upper_bb < upper_kc)
+
+        lowest_low = low.rolling(window=period).min()
+        highest_high = high.rolling(window=period).max()
+        momentum = (close - ((highest_high + lowest_low) / 2)) / close * 100
+
+        return pd.DataFrame({
+            'squeeze_on': squeeze.iloc[-1],
+            'momentum': momentum.iloc[-1],
+            'momentum_increasing': momentum.iloc[-1] > momentum.iloc[-2]
+        })
+
+    def calculate(self, settings: dict) -> pd.DataFrame:
+        """
+        Calculate all enabled indicators using the `indicators` settings block.
+
+        Returns:
+            DataFrame indexed by symbol with one column per indicator value
+        """
+        frames = [pd.DataFrame({'close': self.panel.close.iloc[-1]})]
+
+        if settings.get('ttm_squeeze', {}).get('enabled', False):
+            ttm = settings['ttm_squeeze']
+            frames.append(self.calculate_ttm_squeeze(
+                bb_mult=ttm.get('bb_multiplier', 2.0),
+                kc_mult=ttm.get('kc_multiplier', 1.5)
+            ))
+
+        if settings.get('ema', {}).get('enabled', False):
+            frames.append(self.calculate_ema(settings['ema'].get('periods', [9, 21, 55, 200])))
+
+        if settings.get('macd', {}).get('enabled', False):
+            macd = settings['macd']
+            frames.append(self.calculate_macd(
+                fast_period=macd.get('fast_period', 12),
+                slow_period=macd.get('slow_period', 26),
+                signal_period=macd.get('signal_period', 9)
+            ))
+
+        return pd.concat(frames, axis=1)
+
+
+def _flag(indicators: pd.DataFrame, column: str) -> pd.Series:
+    """Boolean indicator column as +1/-1, or zeros if the indicator is disabled"""
+    if column not in indicators.columns:
+        return pd.Series(0.0, index=indicators.index)
+    return indicators[column].astype(bool).map({True: 1.0, False: -1.0})
+
+
+def rank_candidates(indicators: pd.DataFrame, top_n: Optional[int] = None) -> pd.DataFrame:
+    """
+    Rank screened symbols by directional conviction.
+
+    Each symbol gets a signed score: positive favours a CALL, negative a PUT.
+    Trend votes come from price vs. each EMA, MACD vs. signal and momentum
+    direction; fresh MACD/EMA crossovers count double. An active squeeze
+    amplifies the score since it marks compression ahead of a move.
+
+    Returns:
+        Indicators sorted by absolute score, with 'score' and 'direction' columns
+    """
+    score = pd.Series(0.0, index=indicators.index)
+
+    for column in indicators.columns:
+        if column.endswith('_above'):
+            score += _flag(indicators, column)
+
+    score += _flag(indicators, 'macd_above_signal')
+    score += _flag(indicators, 'histogram_increasing')
+    score += _flag(indicators, 'momentum_increasing')
+
+    if 'momentum' in indicators.columns:
+        score += np.sign(indicators['momentum'].fillna(0.0))
+
+    for up, down in [('macd_crossover_up', 'macd_crossover_down'),
+                     ('9_21_crossover_up', '9_21_crossover_down')]:
+        if up in indicators.columns:
+            score += 2.0 * indicators[up].astype(float) - 2.0 * indicators[down].astype(float)
+
+    if 'squeeze_on' in indicators.columns:
+        score = score * np.where(indicators['squeeze_on'].astype(bool), 1.5, 1.0)
+
+    ranked = indicators.copy()
+    ranked['score'] = score
+    ranked['direction'] = np.where(score >= 0, 'CALL', 'PUT')
+    ranked = ranked.reindex(score.abs().sort_values(ascending=False, kind='mergesort').index)
+    ranked.index.name = 'symbol'
+
+    if top_n is not None:
+        ranked = ranked.head(top_n)
+    return ranked
+
+
+def screen_symbols(panel: BarPanel, settings: dict, top_n: Optional[int] = None) -> pd.DataFrame:
+    """Compute indicators for every symbol in the panel and return ranked candidates"""
+    period = settings.get('ttm_squeeze', {}).get('period', 20)
+    indicators = BatchIndicatorCalculator(panel, period=period).calculate(settings)
+    return rank_candidates(indicators, top_n=top_n)
@@ -1,8 +1,6 @@
 from datetime import datetime
 import pandas as pd
 from typing import Optional, Dict, Any, Callable, Set
-from alpaca.data.historical import StockHistoricalDataClient
-from alpaca.data.historical.option import OptionHistoricalDataClient
 from alpaca.data.requests import (
     StockBarsRequest, 
     StockLatestQuoteRequest,
@@ -14,7 +12,6 @@ from alpaca.data.requests import (
     OptionChainRequest
 )
 from alpaca.data.timeframe import TimeFrame
-from alpaca.trading.client import TradingClient
 from alpaca.data.live import StockDataStream
 from alpaca.data.live.option import OptionDataStream
 from alpaca.data.enums import DataFeed
@@ -28,6 +25,7 @@ from threading import Lock as ThreadLock
 from collections import OrderedDict
 from asyncio import Lock as AsyncLock
 
+from goldflipper.brokerage.client_registry import get_client_registry
 from .base import MarketDataProvider
 
 class LRUCache:
@@ -105,32 +103,21 @@ class AlpacaProvider(MarketDataProvider):
         # Load settings from YAML
         self.settings = self._load_settings()
         
-        # Get credentials from settings
-        self.api_key = self.settings['alpaca']['api_key']
-        self.secret_key = self.settings['alpaca']['secret_key']
-        self.base_url = self.settings['alpaca']['base_url']
+        # Get credentials for the active account from the shared client registry
+        registry = get_client_registry()
+        account = registry.account_credentials()
+        self.api_key = account['api_key']
+        self.secret_key = account['secret_key']
+        self.base_url = account['base_url']
         
         # Use v2 endpoints for data and streaming
         self.data_url = 'https://data.alpaca.markets'
         self.stream_url = 'wss://stream.data.alpaca.markets/v2/'
         
-        # Initialize clients
-        self.stock_client = StockHistoricalDataClient(
-            api_key=self.api_key,
-            secret_key=self.secret_key
-        )
-        
-        self.option_client = OptionHistoricalDataClient(
-            api_key=self.api_key,
-            secret_key=self.secret_key
-        )
-        
-        self.trading_client = TradingClient(
-            api_key=self.api_key,
-            secret_key=self.secret_key,
-            paper=True,
-            url_override=self.base_url
-        )
+        # Shared clients (pooled connections per account)
+        self.stock_client = registry.get('stock_data')
+        self.option_client = registry.get('option_data')
+        self.trading_client = registry.get('trading')
         
         # WebSocket state management
         self.stream_client = None
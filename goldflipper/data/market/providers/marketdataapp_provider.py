@@ -1,4 +1,5 @@
 import requests
+import threading
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
@@ -60,28 +61,31 @@ class MarketDataAppProvider(MarketDataProvider):
             'requests': 0,
             'window_start': datetime.now()
         }
+        # Requests from concurrent callers draw on the same budget
+        self._rate_limit_lock = threading.Lock()
 
     def _check_rate_limit(self):
-        """Check and enforce rate limits"""
-        now = datetime.now()
-        window_elapsed = (now - self.rate_limit['window_start']).seconds
+        """Check and enforce rate limits (shared by concurrent callers)"""
+        with self._rate_limit_lock:
+            now = datetime.now()
+            window_elapsed = (now - self.rate_limit['window_start']).seconds
         
-        # Reset counter if window has elapsed
-        if window_elapsed > self.rate_limit['window']:
-            self.rate_limit['requests'] = 0
-            self.rate_limit['window_start'] = now
-            return
+            # Reset counter if window has elapsed
+            if window_elapsed > self.rate_limit['window']:
+                self.rate_limit['requests'] = 0
+                self.rate_limit['window_start'] = now
+                return
         
-        # If we're approaching the limit, sleep until the window resets
-        if self.rate_limit['requests'] >= self.rate_limit['max_requests']:
-            sleep_time = self.rate_limit['window'] - window_elapsed
-            if sleep_time > 0:
-                logging.warning(f"Rate limit approaching, sleeping for {sleep_time} seconds")
-                sleep(sleep_time)
-            self.rate_limit['requests'] = 0
-            self.rate_limit['window_start'] = datetime.now()
+            # If we're approaching the limit, sleep until the window resets
+            if self.rate_limit['requests'] >= self.rate_limit['max_requests']:
+                sleep_time = self.rate_limit['window'] - window_elapsed
+                if sleep_time > 0:
+                    logging.warning(f"Rate limit approaching, sleeping for {sleep_time} seconds")
+                    sleep(sleep_time)
+                self.rate_limit['requests'] = 0
+                self.rate_limit['window_start'] = datetime.now()
         
-        self.rate_limit['requests'] += 1
+            self.rate_limit['requests'] += 1
 
     def _make_request(self, url: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
         """Make a request with rate limiting and retries"""
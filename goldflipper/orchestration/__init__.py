@@ -0,0 +1 @@
+# Monitoring loops that run play processing across accounts
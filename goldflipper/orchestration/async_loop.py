@@ -0,0 +1,290 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from goldflipper.config.config import config
+from goldflipper.brokerage.account_book import refresh_account_book
+from goldflipper.brokerage.client_registry import current_account
+from goldflipper.brokerage.contract_cache import get_contract_cache
+from goldflipper.brokerage.order_reconciliation import fetch_order_snapshot
+from goldflipper.brokerage.position_book import refresh_position_book
+from goldflipper.brokerage.trade_stream import start_trade_update_listener
+from goldflipper.core import (
+    display_active_plays,
+    end_of_day_cleanup_due,
+    execute_trade,
+    expire_stale_new_plays,
+    get_market_data_manager,
+    get_option_data,
+    get_sleep_interval,
+    get_stock_price,
+    group_oco_peers,
+    list_play_files,
+    load_play,
+    log_action_queue_stats,
+    log_cycle_metrics,
+    make_cycle_clock,
+    manage_pending_plays,
+    owns_play,
+    prefetch_new_play_contracts,
+    report_play_execution,
+    run_end_of_day_cleanup,
+    validate_market_hours
+)
+from goldflipper.orchestration.cycle_clock import BackgroundTask
+from goldflipper.orchestration.play_scheduler import adaptive_polling_enabled, get_play_scheduler
+from goldflipper.orchestration.warmup import make_warmup
+from goldflipper.utils.display import TerminalDisplay as display
+from goldflipper.utils.json_fixer import PlayFileFixer
+
+ACTIVE_PLAY_TYPES = ('new', 'open', 'pending-opening', 'pending-closing')
+
+
+class TaskGraph:
+    """
+    Runs blocking calls as asyncio tasks with bounded concurrency and timeouts.
+
+    Each call runs on a worker thread (carrying the caller's context). A call
+    that fails or times out resolves to None so dependent tasks can carry on
+    with whatever fallback they already have. A timed out thread is not
+    interrupted; it finishes in the background.
+    """
+
+    def __init__(self, max_concurrency: int = 16, timeout: float = 20.0):
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self.timeout = timeout
+        self.timings: Dict[str, float] = {}
+        self.failures = 0
+        self.timeouts = 0
+
+    async def call(self, name: str, func: Callable, *args, timeout: Optional[float] = None) -> Any:
+        timeout = self.timeout if timeout is None else timeout
+        async with self._semaphore:
+            started = time.monotonic()
+            try:
+                return await asyncio.wait_for(asyncio.to_thread(func, *args), timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                logging.warning(f"Task {name} timed out after {timeout}s")
+            except Exception as e:
+                self.failures += 1
+                logging.error(f"Task {name} failed: {str(e)}")
+            finally:
+                self.timings[name] = time.monotonic() - started
+        return None
+
+    def spawn(self, name: str, func: Callable, *args, timeout: Optional[float] = None) -> asyncio.Task:
+        return asyncio.create_task(self.call(name, func, *args, timeout=timeout))
+
+    def slowest(self, count: int = 3) -> List[Tuple[str, float]]:
+        return sorted(self.timings.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+# Plays whose evaluation thread is still running (e.g. after a timeout); skipped until it finishes
+_running_plays = set()
+_running_plays_lock = threading.Lock()
+
+
+def _claim_plays(play_files: List[str]) -> bool:
+    with _running_plays_lock:
+        if _running_plays.intersection(play_files):
+            return False
+        _running_plays.update(play_files)
+        return True
+
+
+def _execute_group(play_files: List[str], play_type: str) -> List[Tuple[str, bool]]:
+    try:
+        return [(play_file, execute_trade(play_file, play_type)) for play_file in play_files]
+    finally:
+        with _running_plays_lock:
+            _running_plays.difference_update(play_files)
+
+
+def _resolved() -> asyncio.Future:
+    """Already completed stand-in for a snapshot task a short wake does not run"""
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(None)
+    return future
+
+
+def _list_plays(plays_dir: str, play_type: str) -> List[Tuple[str, dict]]:
+    play_files = list_play_files(plays_dir, play_type)
+    return [(play_file, play) for play_file in play_files if (play := load_play(play_file))]
+
+
+async def run_monitoring_cycle_async(plays_dir: str, graph: TaskGraph):
+    """
+    Run one monitoring pass as a graph of concurrent tasks.
+
+    Position, account and order snapshots and every quote are fetched at
+    once. Pending plays settle as soon as the order snapshot is in; each new
+    play (or OCO group) and each open play is evaluated as soon as its own
+    quotes and the snapshot it depends on are ready. With adaptive polling,
+    wakes between full cycles only evaluate the due new / open plays against
+    the last full cycle's snapshots.
+    """
+    execution_timeout = config.get('monitoring', 'async_orchestrator', 'execution_timeout_seconds', default=60)
+    scheduler = get_play_scheduler(plays_dir) if adaptive_polling_enabled() else None
+    full = scheduler is None or scheduler.begin_cycle(config.get('monitoring', 'polling_interval', default=30))
+    logging.info("Checking for new and open plays" if full else "Checking due new and open plays")
+
+    if config.get('orders', 'eod_batch', 'enabled', default=False):
+        from goldflipper.orchestration.eod_batch import run_eod_batch_if_due
+        await graph.call('eod_batch', run_eod_batch_if_due, plays_dir)
+    await graph.call('expire', expire_stale_new_plays, plays_dir)
+    plays = {play_type: _list_plays(plays_dir, play_type) if full or play_type in ('new', 'open') else []
+             for play_type in ACTIVE_PLAY_TYPES}
+    due_files = None
+    if scheduler:
+        for play_type in ('new', 'open'):
+            plays[play_type] = [(f, p) for f, p in plays[play_type] if scheduler.is_due(f)]
+        # Evaluation reschedules these plays, so the display works from this list
+        due_files = {f for play_type in ('new', 'open') for f, _ in plays[play_type]}
+
+    # Independent network reads
+    positions = graph.spawn('positions', refresh_position_book) if full else _resolved()
+    account = graph.spawn('account', refresh_account_book) if full else _resolved()
+    pending = plays['pending-opening'] + plays['pending-closing']
+    orders = None
+    if pending and config.get('orders', 'reconciliation', 'enabled', default=True):
+        orders = graph.spawn('orders', fetch_order_snapshot, [play.get('option_contract_symbol') for _, play in pending])
+    all_plays = [play for entries in plays.values() for _, play in entries]
+    stock_quotes = {symbol: graph.spawn(f"stock:{symbol}", get_stock_price, symbol)
+                    for symbol in {play.get('symbol') for play in all_plays if play.get('symbol')}}
+    option_quotes = {contract: graph.spawn(f"option:{contract}", get_option_data, contract)
+                     for contract in {play.get('option_contract_symbol') for play in all_plays if play.get('option_contract_symbol')}}
+
+    async def settle_pending():
+        snapshot = await orders if orders else None
+        await positions
+        await graph.call('pending', manage_pending_plays, plays_dir, None, snapshot, timeout=execution_timeout)
+
+    async def evaluate(entries: List[Tuple[str, dict]], play_type: str):
+        if play_type == 'new':
+            # Entries check both buying power and existing positions
+            await asyncio.gather(positions, account)
+        else:
+            await positions
+        for _, play in entries:
+            for quote in (stock_quotes.get(play.get('symbol')), option_quotes.get(play.get('option_contract_symbol'))):
+                if quote:
+                    await quote
+        play_files = [play_file for play_file, _ in entries]
+        if not _claim_plays(play_files):
+            logging.info(f"Skipping {play_files}: previous evaluation still running")
+            return
+        results = await graph.call(f"{play_type}:{os.path.basename(play_files[0])}", _execute_group,
+                                   play_files, play_type, timeout=execution_timeout)
+        for play_file, executed in results or []:
+            report_play_execution(play_file, play_type, executed, scheduler)
+
+    new_plays = dict(plays['new'])
+    tasks = [settle_pending()] if full else []
+    # OCO peers are evaluated one after another, like the sync loop
+    tasks += [evaluate([(f, new_plays[f]) for f in group], 'new') for group in group_oco_peers(list(new_plays))]
+    tasks += [evaluate([entry], 'open') for entry in plays['open']]
+    await asyncio.gather(*tasks)
+    await asyncio.gather(*stock_quotes.values(), *option_quotes.values(), account)
+    if not full:
+        return
+
+    log_action_queue_stats()
+    # Quotes are in the cycle cache by now
+    display_active_plays(plays_dir, scheduler, due_files)
+
+
+async def monitor_plays_async():
+    """Asyncio version of monitor_plays_continuously"""
+    plays_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plays'))
+    market_data = get_market_data_manager()
+    # In sharded mode each worker only checks the plays it owns
+    json_fixer = PlayFileFixer(file_filter=owns_play)
+
+    def fix_play_files():
+        try:
+            fixed_count = json_fixer.check_and_fix_all_plays()
+            if fixed_count > 0:
+                logging.info(f"JSON fixer repaired {fixed_count} corrupted play files")
+        except Exception as e:
+            logging.error(f"Error in JSON fixer: {str(e)}")
+            display.error(f"Error in JSON fixer: {str(e)}")
+
+    # Shared with the cycle so the fixer never runs while plays are being processed
+    cycle_lock = threading.Lock()
+    json_fix_task = BackgroundTask('JSON fixer', fix_play_files, delay=3, lock=cycle_lock)
+    clock = make_cycle_clock()
+    warmup = make_warmup({current_account(): plays_dir})
+    max_concurrency = config.get('monitoring', 'async_orchestrator', 'max_concurrency', default=16)
+    task_timeout = config.get('monitoring', 'async_orchestrator', 'task_timeout_seconds', default=20)
+
+    # Enough threads for max_concurrency blocking calls (the default pool is sized by CPU count)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix='cycle-task')
+    )
+
+    logging.info(f"Monitoring plays directory (async): {plays_dir}")
+    if config.get('orders', 'trade_stream', 'enabled', default=False):
+        try:
+            start_trade_update_listener(plays_dir)
+        except Exception as e:
+            logging.error(f"Could not start trade update listener: {str(e)}")
+            display.error(f"Could not start trade update listener, relying on polling: {str(e)}")
+
+    while True:
+        clock.start_cycle()
+        polling_interval = config.get('monitoring', 'polling_interval', default=30)
+        try:
+            market_data.start_new_cycle()
+            logging.info("Starting new monitoring cycle")
+
+            is_open, minutes_to_open = await asyncio.to_thread(validate_market_hours)
+            if end_of_day_cleanup_due():
+                await asyncio.to_thread(run_end_of_day_cleanup, plays_dir)
+            if (config.get('orders', 'contract_cache', 'enabled', default=True)
+                    and not get_contract_cache().is_prefetched()
+                    and (is_open or minutes_to_open <= config.get('orders', 'contract_cache', 'prefetch_minutes_before_open', default=30))):
+                await asyncio.to_thread(prefetch_new_play_contracts, plays_dir)
+
+            if not is_open:
+                sleep_time = get_sleep_interval(minutes_to_open)
+                if warmup:
+                    sleep_time = await asyncio.to_thread(warmup.tick, minutes_to_open, sleep_time)
+                display.status(f"Market is CLOSED. Next check in {sleep_time} seconds.")
+                await asyncio.sleep(clock.advance(sleep_time))
+                continue
+
+            display.success("Market is OPEN. Monitoring starting.")
+            graph = TaskGraph(max_concurrency, task_timeout)
+            # Waits off the event loop if the fixer is still running
+            await asyncio.to_thread(cycle_lock.acquire)
+            try:
+                await run_monitoring_cycle_async(plays_dir, graph)
+            finally:
+                cycle_lock.release()
+            if warmup:
+                warmup.note_live_cycle(clock.elapsed())
+
+            display.header("Cycle complete. Waiting for next cycle...")
+            logging.info(f"Cycle complete. Slowest tasks: "
+                         + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in graph.slowest()))
+            log_cycle_metrics(clock)
+            json_fix_task.trigger()
+
+            if adaptive_polling_enabled():
+                polling_interval = get_play_scheduler(plays_dir).sleep_interval(polling_interval)
+            await asyncio.sleep(clock.advance(polling_interval))
+
+        except Exception as e:
+            error_msg = f"An error occurred during play monitoring: {e}"
+            display.error(error_msg)
+            logging.error(error_msg)
+            await asyncio.sleep(clock.advance(polling_interval))
+
+
+def run_async_monitoring():
+    """Blocking entry point for the asyncio loop (drop-in for monitor_plays_continuously)"""
+    asyncio.run(monitor_plays_async())
@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from goldflipper.config.config import config
+
+# Work priorities, most urgent first
+EXITS = 0
+PENDING = 1
+ENTRIES = 2
+DISPLAY = 3
+MAINTENANCE = 4
+
+
+@dataclass
+class WorkItem:
+    """One unit of cycle work"""
+    name: str
+    priority: int
+    func: Callable[[], Any]
+    required: bool = False  # Runs even after the deadline (exits)
+
+
+@dataclass
+class CycleBudget:
+    """
+    Runs a cycle's work items in priority order against a deadline.
+
+    Required items always run. Other items run only while their estimated
+    duration (the moving average of previous runs) fits in the time left;
+    the rest are deferred to the next cycle. An item deferred
+    max_deferrals cycles in a row runs next time regardless, so display and
+    maintenance work is delayed under load but never starved.
+    """
+    budget_seconds: Optional[float] = None
+    max_deferrals: int = 3
+    smoothing: float = 0.3
+    clock: Callable[[], float] = time.monotonic
+    estimates: Dict[str, float] = field(default_factory=dict)
+    deferrals: Dict[str, int] = field(default_factory=dict)
+    deferred_total: int = 0
+
+    def run(self, items: List[WorkItem], ordered: bool = True) -> List[str]:
+        """
+        Run work items.
+
+        Args:
+            items: Work for this cycle
+            ordered: Run in priority order; False keeps the given order
+
+        Returns:
+            Names of the items deferred to the next cycle
+        """
+        started = self.clock()
+        queue = sorted(items, key=lambda item: item.priority) if ordered else list(items)
+        deferred = []
+        for item in queue:
+            remaining = None if self.budget_seconds is None else self.budget_seconds - (self.clock() - started)
+            starving = self.deferrals.get(item.name, 0) >= self.max_deferrals
+            if (remaining is not None and not item.required and not starving
+                    and remaining < self.estimates.get(item.name, 0.0)):
+                self.deferrals[item.name] = self.deferrals.get(item.name, 0) + 1
+                self.deferred_total += 1
+                deferred.append(item.name)
+                continue
+
+            item_started = self.clock()
+            try:
+                item.func()
+            finally:
+                duration = self.clock() - item_started
+                previous = self.estimates.get(item.name)
+                self.estimates[item.name] = duration if previous is None else (
+                    previous + self.smoothing * (duration - previous))
+                self.deferrals[item.name] = 0
+
+        if deferred:
+            logging.warning(f"Cycle budget of {self.budget_seconds}s used up; deferred: {', '.join(deferred)}")
+        return deferred
+
+
+def cycle_budget_enabled() -> bool:
+    return config.get('monitoring', 'cycle_budget', 'enabled', default=False)
+
+
+# One budget per plays directory (one per account in multi-account mode)
+_cycle_budgets: Dict[str, CycleBudget] = {}
+_cycle_budgets_lock = threading.Lock()
+
+
+def get_cycle_budget(plays_dir: str) -> CycleBudget:
+    """
+    Cycle budget for a plays directory, configured from monitoring.cycle_budget.
+
+    The deadline is budget_fraction of the polling interval; with the budget
+    disabled, items run in their given order without a deadline.
+    """
+    with _cycle_budgets_lock:
+        if plays_dir not in _cycle_budgets:
+            budget_seconds = None
+            if cycle_budget_enabled():
+                budget_seconds = (config.get('monitoring', 'polling_interval', default=30)
+                                  * config.get('monitoring', 'cycle_budget', 'budget_fraction', default=0.8))
+            _cycle_budgets[plays_dir] = CycleBudget(
+                budget_seconds=budget_seconds,
+                max_deferrals=config.get('monitoring', 'cycle_budget', 'max_deferrals', default=3)
+            )
+        return _cycle_budgets[plays_dir]
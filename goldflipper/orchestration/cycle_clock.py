@@ -0,0 +1,140 @@
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+OVERRUN_POLICIES = ('skip', 'catch_up')
+
+
+class CycleClock:
+    """
+    Fixed-rate cycle timing on the monotonic clock.
+
+    Each cycle is due one interval after the previous cycle was due, not one
+    interval after it finished, so cycle work does not stretch the period.
+    A cycle that overruns its slot either skips the missed slots and
+    realigns to the cadence ('skip'), or starts the late cycles back to back
+    until it has caught up ('catch_up'). Lag is how late a cycle started
+    relative to its slot; with 'skip' the time lost is counted as overrun
+    and skipped slots instead.
+    """
+
+    def __init__(self, overrun_policy: str = 'skip', fixed_rate: bool = True,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        if overrun_policy not in OVERRUN_POLICIES:
+            raise ValueError(f"Unknown overrun policy '{overrun_policy}'")
+        self.overrun_policy = overrun_policy
+        self.fixed_rate = fixed_rate
+        self._clock = clock
+        self._sleep = sleep
+        self.next_start: Optional[float] = None
+        self.cycle_started: Optional[float] = None
+        self.metrics: Dict[str, float] = {
+            'cycles': 0,
+            'overruns': 0,
+            'max_overrun': 0.0,
+            'skipped': 0,
+            'last_lag': 0.0,
+            'max_lag': 0.0,
+            'total_lag': 0.0
+        }
+
+    def start_cycle(self) -> float:
+        """Mark the start of a cycle; returns its lag in seconds"""
+        now = self._clock()
+        if self.next_start is None:
+            self.next_start = now
+        lag = max(0.0, now - self.next_start)
+        self.cycle_started = now
+        self.metrics['cycles'] += 1
+        self.metrics['last_lag'] = lag
+        self.metrics['max_lag'] = max(self.metrics['max_lag'], lag)
+        self.metrics['total_lag'] += lag
+        return lag
+
+    def elapsed(self) -> float:
+        """Seconds since the current cycle started"""
+        return self._clock() - self.cycle_started if self.cycle_started is not None else 0.0
+
+    def wait(self, interval: float) -> float:
+        """
+        Sleep until the next cycle is due.
+
+        Args:
+            interval: Seconds between this cycle's slot and the next one
+
+        Returns:
+            Seconds slept
+        """
+        delay = self.advance(interval)
+        if delay:
+            self._sleep(delay)
+        return delay
+
+    def advance(self, interval: float) -> float:
+        """Schedule the next cycle (see wait()) and return the delay until it is due, without sleeping"""
+        now = self._clock()
+        if not self.fixed_rate or self.next_start is None:
+            self.next_start = now + interval
+        else:
+            self.next_start += interval
+            overrun = now - self.next_start
+            if overrun > 0:
+                self.metrics['overruns'] += 1
+                self.metrics['max_overrun'] = max(self.metrics['max_overrun'], overrun)
+                if self.overrun_policy == 'skip' and interval > 0:
+                    missed = math.ceil(overrun / interval)
+                    self.metrics['skipped'] += missed
+                    self.next_start += missed * interval
+                    logging.warning(f"Cycle overran its {interval}s slot by {overrun:.1f}s; skipping {missed} slot(s)")
+                else:
+                    logging.warning(f"Cycle overran its {interval}s slot by {overrun:.1f}s; starting next cycle immediately")
+
+        return max(0.0, self.next_start - now)
+
+    def stats(self) -> Dict[str, float]:
+        cycles = self.metrics['cycles']
+        return dict(self.metrics, mean_lag=self.metrics['total_lag'] / cycles if cycles else 0.0)
+
+
+class BackgroundTask:
+    """
+    Runs a maintenance job on a background thread, off the cycle's critical path.
+
+    trigger() starts the job after an optional delay; if the previous run is
+    still going, the trigger is dropped rather than queued. With a lock shared
+    with the monitoring cycle, the job only runs between cycles: it is
+    skipped if a cycle already holds the lock when the delay is up, and the
+    next cycle waits for it to finish.
+    """
+
+    def __init__(self, name: str, job: Callable[[], None], delay: float = 0.0,
+                 lock: Optional[threading.Lock] = None):
+        self.name = name
+        self.job = job
+        self.delay = delay
+        self.lock = lock
+        self._thread: Optional[threading.Thread] = None
+
+    def trigger(self) -> bool:
+        if self._thread is not None and self._thread.is_alive():
+            logging.debug(f"{self.name} still running; skipping this trigger")
+            return False
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.lock is not None and not self.lock.acquire(blocking=False):
+            logging.debug(f"{self.name} skipped: the next cycle has already started")
+            return
+        try:
+            self.job()
+        except Exception as e:
+            logging.error(f"Error in {self.name}: {str(e)}")
+        finally:
+            if self.lock is not None:
+                self.lock.release()
@@ -0,0 +1,272 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from alpaca.trading.enums import QueryOrderStatus
+from alpaca.trading.requests import GetOrdersRequest
+from goldflipper.alpaca_client import get_alpaca_client
+from goldflipper.brokerage.client_registry import current_account
+from goldflipper.brokerage.limit_repricer import WORKING_ORDER_STATUSES
+from goldflipper.brokerage.order_reconciliation import MAX_ORDERS_PER_REQUEST, OrderSnapshot
+from goldflipper.config.config import config
+from goldflipper.core import UUIDEncoder, list_play_files, load_play
+from goldflipper.orchestration.play_graph import note_play_moved
+from goldflipper.utils.atomic_io import atomic_write_json
+from goldflipper.utils.display import TerminalDisplay as display
+from goldflipper.utils.market_calendar import MARKET_TZ, get_session_table
+
+# Pending folder -> (folder the play returns to, order id field, status reset)
+EOD_TRANSITIONS = {
+    'pending-opening': ('new', 'order_id', {'order_id': None, 'order_status': None, 'play_status': 'NEW'}),
+    'pending-closing': ('open', 'closing_order_id',
+                        {'closing_order_id': None, 'closing_order_status': None, 'play_status': 'OPEN'})
+}
+
+# Order states after which a play can go back without a cancellation
+TERMINAL_ORDER_STATUSES = {'canceled', 'expired', 'rejected'}
+
+
+@dataclass
+class EodPlan:
+    """Cancellations and file moves for one end-of-day batch"""
+    cancels: Dict[str, str] = field(default_factory=dict)             # order id -> play file
+    moves: List[Tuple[str, str, dict]] = field(default_factory=list)  # (play file, target file, updated play)
+    cancel_all: bool = False
+    left_pending: List[str] = field(default_factory=list)            # order state unknown, filled or not cancellable
+
+
+class EodBatch:
+    """
+    Returns a plays directory's pending plays to NEW / OPEN ahead of the close in one batch.
+
+    Open orders are listed once. Pending plays with a working order get a
+    cancellation and are moved back once it succeeds; plays without an order
+    or whose order is already cancelled, expired or rejected are moved back
+    directly. Anything else (filled, in another broker state, or an order
+    that could not be looked up) stays pending. Cancellations go out
+    concurrently, or as one cancel-all when every open order in the account
+    belongs to a pending play. The moves are applied as a unit: every updated
+    play is written to its target folder first, and the pending files are
+    removed only once all writes succeeded. A play whose cancellation failed
+    stays pending for the after-close handler.
+    """
+
+    def __init__(self, plays_dir: str, client=None, max_workers: int = 8, allow_cancel_all: bool = True,
+                 clock: Callable[[], float] = time.monotonic):
+        self.plays_dir = plays_dir
+        self.client = client or get_alpaca_client()
+        self.max_workers = max(1, max_workers)
+        self.allow_cancel_all = allow_cancel_all
+        self.clock = clock
+        self.reopened: List[str] = []  # Plays moved back to open by the last run
+
+    def plan(self) -> EodPlan:
+        """Work out the batch from one open-orders listing"""
+        plan = EodPlan()
+        try:
+            open_orders = self.client.get_orders(filter=GetOrdersRequest(
+                status=QueryOrderStatus.OPEN, limit=MAX_ORDERS_PER_REQUEST, nested=False))
+        except Exception as e:
+            logging.warning(f"EOD open-orders listing failed, looking orders up individually: {str(e)}")
+            open_orders = None
+        orders = OrderSnapshot(open_orders or (), client=self.client)
+
+        for pending_type, (target, id_field, reset) in EOD_TRANSITIONS.items():
+            for play_file in list_play_files(self.plays_dir, pending_type):
+                play = load_play(play_file)
+                if not play:
+                    logging.error(f"Failed to load play data from {play_file}")
+                    display.error(f"Failed to load play data from {play_file}")
+                    continue
+
+                order_id = play.get('status', {}).get(id_field)
+                status = None
+                if order_id:
+                    try:
+                        order = orders.get_order(order_id)
+                        status = str(getattr(order.status, 'value', order.status))
+                    except Exception as e:
+                        logging.warning(f"EOD lookup of order {order_id} for {play_file} failed: {str(e)}")
+
+                if status == 'partially_filled':
+                    # Stop further fills; the filled part is settled by pending reconciliation
+                    plan.cancels[str(order_id)] = play_file
+                    plan.left_pending.append(play_file)
+                    continue
+                if status in WORKING_ORDER_STATUSES:
+                    plan.cancels[str(order_id)] = play_file
+                elif order_id and status not in TERMINAL_ORDER_STATUSES:
+                    # Filled, unknown or in a state we cannot cancel from (held, pending_cancel, replaced, ...)
+                    logging.warning(f"EOD leaving {play_file} pending: order {order_id} is {status or 'unknown'}")
+                    plan.left_pending.append(play_file)
+                    continue
+
+                play.setdefault('status', {}).update(reset)
+                plan.moves.append((play_file, os.path.join(self.plays_dir, target, os.path.basename(play_file)), play))
+
+        plan.cancel_all = (
+            self.allow_cancel_all and open_orders is not None and bool(plan.cancels)
+            and {str(order.id) for order in open_orders} == set(plan.cancels)
+        )
+        return plan
+
+    def cancel(self, plan: EodPlan, timeout: Optional[float]) -> List[str]:
+        """Send the plan's cancellations; returns the order ids that could not be cancelled"""
+        if not plan.cancels:
+            return []
+        if plan.cancel_all:
+            try:
+                responses = self.client.cancel_orders() or []
+                return [str(response.id) for response in responses if getattr(response, 'status', 200) >= 400]
+            except Exception as e:
+                logging.error(f"EOD cancel-all failed, cancelling orders individually: {str(e)}")
+
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, len(plan.cancels)))
+        futures = {pool.submit(self.client.cancel_order_by_id, order_id): order_id for order_id in plan.cancels}
+        done, not_done = wait(futures, timeout=timeout)
+        pool.shutdown(wait=False, cancel_futures=True)
+        failed = [futures[future] for future in not_done]
+        for future in done:
+            if future.exception() is not None:
+                logging.error(f"EOD cancel of order {futures[future]} failed: {future.exception()}")
+                failed.append(futures[future])
+        return failed
+
+    def apply(self, moves: List[Tuple[str, str, dict]]) -> int:
+        """
+        Move plays to their target folders as a unit.
+
+        Returns:
+            Number of plays moved (0 if any write failed and the batch was rolled back)
+        """
+        written = []
+        try:
+            for _, target, play in moves:
+                atomic_write_json(target, play, indent=4, encoder=UUIDEncoder)
+                written.append(target)
+        except Exception as e:
+            logging.error(f"EOD move failed, rolling back {len(written)} written plays: {str(e)}")
+            display.error(f"End-of-day play moves failed and were rolled back: {str(e)}")
+            for target in written:
+                try:
+                    os.remove(target)
+                except OSError:
+                    pass
+            return 0
+
+        for source, target, _ in moves:
+            if os.path.abspath(source) != os.path.abspath(target):
+                try:
+                    os.remove(source)
+                except FileNotFoundError:
+                    pass
+            note_play_moved(target)
+        return len(moves)
+
+    def run(self, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Plan, cancel and move in one pass.
+
+        Args:
+            deadline: clock() value the batch must finish by
+
+        Returns:
+            dict: Batch statistics, including elapsed seconds and whether the deadline was met
+        """
+        started = self.clock()
+        plan = self.plan()
+        remaining = None if deadline is None else max(0.0, deadline - self.clock())
+        failed = set(self.cancel(plan, remaining))
+        still_working = {plan.cancels[order_id] for order_id in failed if order_id in plan.cancels}
+        moves = [move for move in plan.moves if move[0] not in still_working]
+        moved = self.apply(moves)
+        self.reopened = [os.path.basename(target) for _, target, _ in moves
+                         if moved and os.path.basename(os.path.dirname(target)) == 'open']
+        finished = self.clock()
+        return {
+            'cancels': len(plan.cancels),
+            'cancel_all': plan.cancel_all,
+            'failed_cancels': len(failed),
+            'moved': moved,
+            'left_pending': len(plan.left_pending) + len(plan.moves) - len(moves),
+            'elapsed': finished - started,
+            'met_deadline': deadline is None or finished <= deadline
+        }
+
+
+def eod_batch_enabled() -> bool:
+    return config.get('orders', 'eod_batch', 'enabled', default=False)
+
+
+# Per plays directory: session the batch last ran for and the plays it moved back to open
+_eod_runs: Dict[str, Tuple[date, Set[str]]] = {}
+_eod_runs_lock = threading.Lock()
+
+
+def _session_day(now: datetime) -> date:
+    return now.astimezone(MARKET_TZ).date()
+
+
+def eod_holds_play(play_file: str, play_type: str, now: Optional[datetime] = None) -> bool:
+    """
+    Whether a play must wait for the next session because the end-of-day
+    batch already ran for this one: every new play (no entries after the
+    batch), and open plays whose closing order the batch cancelled.
+    """
+    plays_dir = os.path.abspath(os.path.dirname(os.path.dirname(play_file)))
+    with _eod_runs_lock:
+        run = _eod_runs.get(plays_dir)
+    if run is None or run[0] != _session_day(now or datetime.now(timezone.utc)):
+        return False
+    return play_type == 'new' or (play_type == 'open' and os.path.basename(play_file) in run[1])
+
+
+def run_eod_batch_if_due(plays_dir: str, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """
+    Run the end-of-day batch once per session, start_minutes_before_close ahead
+    of the calendar close (regular or early close). From then until the next
+    session, eod_holds_play keeps entries and re-closes from undoing it.
+
+    Returns:
+        The batch statistics if it ran, otherwise None
+    """
+    now = now or datetime.now(timezone.utc)
+    seconds_left = get_session_table().seconds_until_close(now)
+    start_minutes = config.get('orders', 'eod_batch', 'start_minutes_before_close', default=5)
+    if seconds_left is None or seconds_left > start_minutes * 60:
+        return None
+
+    plays_dir = os.path.abspath(plays_dir)
+    session = _session_day(now)
+    with _eod_runs_lock:
+        if plays_dir in _eod_runs and _eod_runs[plays_dir][0] == session:
+            return None
+        # Entries are held from here on, including while the batch runs
+        _eod_runs[plays_dir] = (session, set())
+
+    # Cancel-all would also hit orders other shards place after the listing
+    allow_cancel_all = (config.get('orders', 'eod_batch', 'use_cancel_all', default=True)
+                        and not config.get('monitoring', 'sharding', 'enabled', default=False))
+    deadline_minutes = config.get('orders', 'eod_batch', 'deadline_minutes_before_close', default=1)
+    batch = EodBatch(plays_dir, max_workers=config.get('orders', 'eod_batch', 'max_workers', default=8),
+                     allow_cancel_all=allow_cancel_all)
+    deadline = batch.clock() + seconds_left - deadline_minutes * 60
+
+    display.info(f"Market closes in {seconds_left / 60:.1f} minutes. Processing end-of-day pending plays...")
+    logging.info(f"Running end-of-day batch for {current_account()} ({plays_dir})")
+    stats = batch.run(deadline)
+    with _eod_runs_lock:
+        _eod_runs[plays_dir][1].update(batch.reopened)
+    logging.info(f"End-of-day batch: {stats}")
+    if stats['met_deadline']:
+        display.success(f"End-of-day batch done in {stats['elapsed']:.2f}s: {stats['cancels']} orders cancelled, "
+                        f"{stats['moved']} plays moved back")
+    else:
+        logging.warning(f"End-of-day batch finished {stats['elapsed']:.2f}s after it started, past its deadline "
+                        f"of {deadline_minutes} minutes before the close")
+        display.warning(f"End-of-day batch missed its deadline ({stats['elapsed']:.2f}s)")
+    return stats
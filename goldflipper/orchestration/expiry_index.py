@@ -0,0 +1,97 @@
+import heapq
+import logging
+import os
+import threading
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from goldflipper.config.config import config
+from goldflipper.json_parser import load_play
+
+
+class ExpiryIndex:
+    """
+    Min-heap of (play_expiration_date, play file) for a plays directory's new plays.
+
+    sync() diffs a cheap listing of the new folder against the files already
+    indexed, so only plays that were created, moved in or rewritten since the
+    last sync are loaded. Plays that left the folder or changed their date
+    leave stale heap entries that are skipped when popped. Checking for due
+    plays only looks at the head of the heap.
+    """
+
+    def __init__(self, list_files: Callable[[], List[str]]):
+        self.list_files = list_files
+        self._heap: List[Tuple[date, str]] = []
+        # play file -> (expiration date or None, mtime when indexed)
+        self._entries: Dict[str, Tuple[Optional[date], float]] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def sync(self):
+        """Index new and changed play files and forget the ones that are gone"""
+        current = {}
+        for play_file in self.list_files():
+            try:
+                current[play_file] = os.stat(play_file).st_mtime
+            except OSError:
+                continue
+
+        with self._lock:
+            for play_file in set(self._entries) - set(current):
+                del self._entries[play_file]
+            for play_file, mtime in current.items():
+                entry = self._entries.get(play_file)
+                if entry is None or entry[1] != mtime:
+                    self._index(play_file, mtime)
+
+    def _index(self, play_file: str, mtime: float):
+        self.loads += 1
+        play = load_play(play_file)
+        expiration = None
+        if play and play.get('play_expiration_date'):
+            try:
+                expiration = datetime.strptime(play['play_expiration_date'], "%m/%d/%Y").date()
+            except ValueError:
+                logging.warning(f"Invalid play_expiration_date in {play_file}: {play['play_expiration_date']}")
+        self._entries[play_file] = (expiration, mtime)
+        if expiration is not None:
+            heapq.heappush(self._heap, (expiration, play_file))
+
+    def _is_current(self, expiration: date, play_file: str) -> bool:
+        entry = self._entries.get(play_file)
+        return entry is not None and entry[0] == expiration
+
+    def next_expiration(self) -> Optional[date]:
+        """Earliest expiration date among indexed plays"""
+        with self._lock:
+            while self._heap and not self._is_current(*self._heap[0]):
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, today: date) -> List[str]:
+        """Remove and return the play files whose expiration date is before today"""
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] < today:
+                expiration, play_file = heapq.heappop(self._heap)
+                if self._is_current(expiration, play_file):
+                    del self._entries[play_file]
+                    due.append(play_file)
+        return due
+
+
+def expiry_index_enabled() -> bool:
+    return config.get('monitoring', 'expiry_index', 'enabled', default=True)
+
+
+# One index per plays directory (one per account in multi-account mode)
+_expiry_indexes: Dict[str, ExpiryIndex] = {}
+_expiry_indexes_lock = threading.Lock()
+
+
+def get_expiry_index(plays_dir: str, list_files: Callable[[], List[str]]) -> ExpiryIndex:
+    """Expiry index for a plays directory, listing its new plays with list_files"""
+    with _expiry_indexes_lock:
+        if plays_dir not in _expiry_indexes:
+            _expiry_indexes[plays_dir] = ExpiryIndex(list_files)
+        return _expiry_indexes[plays_dir]
@@ -0,0 +1,196 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from goldflipper.config.config import config
+from goldflipper.brokerage.client_registry import get_client_registry, use_account
+from goldflipper.brokerage.contract_cache import get_contract_cache
+from goldflipper.brokerage.order_submission import SubmissionEngine
+from goldflipper.brokerage.trade_stream import start_trade_update_listener
+from goldflipper.orchestration.cycle_clock import BackgroundTask
+from goldflipper.orchestration.play_scheduler import adaptive_polling_enabled, get_play_scheduler
+from goldflipper.orchestration.warmup import make_warmup
+from goldflipper.core import (
+    end_of_day_cleanup_due,
+    get_market_data_manager,
+    get_sleep_interval,
+    log_cycle_metrics,
+    make_cycle_clock,
+    prefetch_new_play_contracts,
+    run_end_of_day_cleanup,
+    run_monitoring_cycle,
+    validate_market_hours
+)
+from goldflipper.utils.display import TerminalDisplay as display
+from goldflipper.utils.json_fixer import PlayFileFixer
+
+PLAY_FOLDERS = ('new', 'pending-opening', 'open', 'pending-closing', 'closed', 'expired', 'temp')
+
+BASE_PLAYS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plays'))
+
+
+def enabled_accounts() -> List[str]:
+    """Accounts to run: monitoring.multi_account.accounts, or every enabled Alpaca account"""
+    accounts = config.get('alpaca', 'accounts') or {}
+    names = config.get('monitoring', 'multi_account', 'accounts', default=None)
+    if not names:
+        names = [name for name, account in accounts.items() if account.get('enabled')]
+    missing = [name for name in names if name not in accounts]
+    if missing:
+        logging.warning(f"Skipping unconfigured accounts: {missing}")
+    return [name for name in names if name in accounts]
+
+
+def account_plays_dir(account_name: str) -> str:
+    """
+    Plays directory for an account.
+
+    The active account keeps the standard plays/ directory so single and
+    multi-account runs share its plays; other accounts use plays/accounts/<name>/.
+    """
+    overrides = config.get('monitoring', 'multi_account', 'play_roots', default={}) or {}
+    if account_name in overrides:
+        plays_dir = os.path.abspath(overrides[account_name])
+    elif account_name == get_client_registry().active_account():
+        plays_dir = BASE_PLAYS_DIR
+    else:
+        plays_dir = os.path.join(BASE_PLAYS_DIR, 'accounts', account_name)
+    for folder in PLAY_FOLDERS:
+        os.makedirs(os.path.join(plays_dir, folder), exist_ok=True)
+    return plays_dir
+
+
+class MultiAccountMonitor:
+    """
+    Runs the monitoring cycle for several accounts in one process.
+
+    Market hours, market data and contract metadata are fetched once per
+    cycle and shared. Each account then runs its own cycle on a separate
+    thread, inside use_account(), so it gets its own trading client,
+    position book, action queue and submission workers.
+    """
+
+    def __init__(self, accounts: List[str]):
+        self.accounts = accounts
+        self.plays_dirs: Dict[str, str] = {account: account_plays_dir(account) for account in accounts}
+        max_workers = config.get('orders', 'submission', 'max_workers', default=4)
+        self.engines = {account: SubmissionEngine(max_workers) for account in accounts}
+        self.json_fixers = {account: PlayFileFixer(self.plays_dirs[account]) for account in accounts}
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(accounts)), thread_name_prefix='account')
+
+    def start_listeners(self):
+        """Start a trade update listener per account"""
+        for account in self.accounts:
+            with use_account(account):
+                try:
+                    start_trade_update_listener(self.plays_dirs[account])
+                except Exception as e:
+                    logging.error(f"Could not start trade update listener for {account}: {str(e)}")
+                    display.error(f"Could not start trade update listener for {account}, relying on polling: {str(e)}")
+
+    def _run_account(self, account: str):
+        with use_account(account):
+            logging.info(f"[{account}] Monitoring plays directory: {self.plays_dirs[account]}")
+            run_monitoring_cycle(self.plays_dirs[account], self.engines[account])
+
+    def run_cycle(self):
+        """Run one monitoring cycle for every account in parallel"""
+        futures = {account: self._pool.submit(self._run_account, account) for account in self.accounts}
+        for account, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                error_msg = f"An error occurred while monitoring account {account}: {e}"
+                display.error(error_msg)
+                logging.error(error_msg)
+
+    def handle_end_of_day(self):
+        """Move every account's pending plays back after the close, each under its own account"""
+        for account in self.accounts:
+            with use_account(account):
+                try:
+                    run_end_of_day_cleanup(self.plays_dirs[account])
+                except Exception as e:
+                    logging.error(f"End-of-day cleanup for {account} failed: {str(e)}")
+                    display.error(f"End-of-day cleanup for {account} failed: {str(e)}")
+
+    def fix_play_files(self):
+        """Run the JSON fixer over every account's plays"""
+        for account, json_fixer in self.json_fixers.items():
+            try:
+                fixed_count = json_fixer.check_and_fix_all_plays()
+                if fixed_count > 0:
+                    logging.info(f"JSON fixer repaired {fixed_count} corrupted play files for {account}")
+            except Exception as e:
+                error_msg = f"Error in JSON fixer for {account}: {str(e)}"
+                logging.error(error_msg)
+                display.error(error_msg)
+
+
+def monitor_accounts_continuously():
+    """Main monitoring loop for all plays of all enabled accounts"""
+    accounts = enabled_accounts()
+    if not accounts:
+        display.error("Multi-account monitoring is enabled but no accounts are enabled")
+        logging.error("Multi-account monitoring is enabled but no accounts are enabled")
+        return
+
+    market_data = get_market_data_manager()
+    monitor = MultiAccountMonitor(accounts)
+    logging.info(f"Monitoring accounts: {', '.join(accounts)}")
+    display.info(f"Monitoring {len(accounts)} accounts: {', '.join(accounts)}")
+
+    if config.get('orders', 'trade_stream', 'enabled', default=False):
+        monitor.start_listeners()
+
+    # Shared with the cycle so the fixer never runs while plays are being processed
+    cycle_lock = threading.Lock()
+    json_fix_task = BackgroundTask('JSON fixer', monitor.fix_play_files, delay=3, lock=cycle_lock)
+    clock = make_cycle_clock()
+    warmup = make_warmup(monitor.plays_dirs)
+
+    while True:
+        clock.start_cycle()
+        polling_interval = config.get('monitoring', 'polling_interval', default=30)
+        try:
+            market_data.start_new_cycle()
+            logging.info("Starting new multi-account monitoring cycle")
+
+            is_open, minutes_to_open = validate_market_hours()
+            if end_of_day_cleanup_due():
+                monitor.handle_end_of_day()
+            if (config.get('orders', 'contract_cache', 'enabled', default=True)
+                    and not get_contract_cache().is_prefetched()
+                    and (is_open or minutes_to_open <= config.get('orders', 'contract_cache', 'prefetch_minutes_before_open', default=30))):
+                prefetch_new_play_contracts(*monitor.plays_dirs.values())
+
+            if not is_open:
+                sleep_time = get_sleep_interval(minutes_to_open)
+                if warmup:
+                    sleep_time = warmup.tick(minutes_to_open, sleep_time)
+                display.status(f"Market is CLOSED. Next check in {sleep_time} seconds.")
+                clock.wait(sleep_time)
+                continue
+
+            display.success("Market is OPEN. Monitoring starting.")
+            with cycle_lock:
+                monitor.run_cycle()
+            if warmup:
+                warmup.note_live_cycle(clock.elapsed())
+
+            display.header("Cycle complete. Waiting for next cycle...")
+            logging.info("Cycle complete. Waiting for next cycle")
+            log_cycle_metrics(clock)
+            json_fix_task.trigger()
+
+            if adaptive_polling_enabled():
+                polling_interval = min(get_play_scheduler(plays_dir).sleep_interval(polling_interval)
+                                       for plays_dir in monitor.plays_dirs.values())
+            clock.wait(polling_interval)
+
+        except Exception as e:
+            error_msg = f"An error occurred during multi-account monitoring: {e}"
+            display.error(error_msg)
+            logging.error(error_msg)
+            clock.wait(polling_interval)
@@ -0,0 +1,153 @@
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+from goldflipper.config.config import config
+from goldflipper.json_parser import load_play
+
+# Play folders in the order a play is searched for when its location is unknown
+PLAY_FOLDERS = ('new', 'pending-opening', 'open', 'pending-closing', 'temp', 'closed', 'expired')
+
+
+def _triggers(conditional: dict, key: str) -> List[str]:
+    """Trigger filenames under a conditional_plays key, including the legacy single-trigger form"""
+    triggers = list(conditional.get(f'{key}_triggers') or [])
+    if conditional.get(f'{key}_trigger'):
+        triggers.append(conditional[f'{key}_trigger'])
+    return triggers
+
+
+class PlayGraph:
+    """
+    Folder and OCO / OTO links of every play in a plays directory, keyed by filename.
+
+    OCO links are kept in both directions, so a play's peers include plays
+    that name it as well as the plays it names. OTO links run from parent to
+    child. The graph is built with one scan of all play folders. After that
+    it is updated as plays are moved (note), and when a listing shows a file
+    that is new or has changed since it was read (sync). A remembered
+    location is checked with one os.path.exists before use; if the check
+    fails, the play is searched for in every folder again.
+    """
+
+    def __init__(self, plays_dir: str):
+        self.plays_dir = os.path.abspath(plays_dir)
+        self._folders: Dict[str, str] = {}
+        self._mtimes: Dict[str, float] = {}
+        self._oco: Dict[str, Set[str]] = {}
+        self._oco_in: Dict[str, Set[str]] = {}
+        self._oto: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+        self.probes = 0
+
+    def build(self):
+        """Index every play in every folder"""
+        for folder in PLAY_FOLDERS:
+            folder_dir = os.path.join(self.plays_dir, folder)
+            if not os.path.isdir(folder_dir):
+                continue
+            for name in os.listdir(folder_dir):
+                if name.endswith('.json'):
+                    self.note(os.path.join(folder_dir, name))
+        logging.debug(f"Play graph for {self.plays_dir}: {len(self._folders)} plays")
+
+    def path(self, name: str, folder: str) -> str:
+        return os.path.join(self.plays_dir, folder, name)
+
+    def note(self, play_file: str):
+        """Record a play's current folder, re-reading its links if the file changed"""
+        name = os.path.basename(play_file)
+        folder = os.path.basename(os.path.dirname(os.path.abspath(play_file)))
+        try:
+            mtime = os.stat(play_file).st_mtime
+        except OSError:
+            return
+        with self._lock:
+            self._folders[name] = folder
+            if self._mtimes.get(name) == mtime:
+                return
+        play = load_play(play_file)
+        with self._lock:
+            self._mtimes[name] = mtime
+            conditional = (play or {}).get('conditional_plays') or {}
+            self._set_links(name, set(_triggers(conditional, 'OCO')), set(_triggers(conditional, 'OTO')))
+
+    def _set_links(self, name: str, oco: Set[str], oto: Set[str]):
+        for peer in self._oco.get(name, ()):
+            self._oco_in.get(peer, set()).discard(name)
+        self._oco[name] = oco
+        for peer in oco:
+            self._oco_in.setdefault(peer, set()).add(name)
+        self._oto[name] = oto
+
+    def sync(self, play_files: Iterable[str]):
+        """Pick up plays in a listing that are unknown or changed since they were read"""
+        for play_file in play_files:
+            self.note(play_file)
+
+    def locate(self, name: str) -> Optional[str]:
+        """Folder a play is in, or None if it is in none of them"""
+        with self._lock:
+            folder = self._folders.get(name)
+        if folder and os.path.exists(self.path(name, folder)):
+            return folder
+        for folder in PLAY_FOLDERS:
+            self.probes += 1
+            play_file = self.path(name, folder)
+            if os.path.exists(play_file):
+                self.note(play_file)
+                return folder
+        with self._lock:
+            self._folders.pop(name, None)
+        return None
+
+    def oco_triggers(self, name: str) -> Set[str]:
+        """OCO peers a play names itself"""
+        with self._lock:
+            return set(self._oco.get(name, ()))
+
+    def oco_peers(self, name: str) -> Set[str]:
+        """OCO peers in either direction"""
+        with self._lock:
+            return self._oco.get(name, set()) | self._oco_in.get(name, set())
+
+    def oto_children(self, name: str) -> Set[str]:
+        """Plays a play activates when it opens"""
+        with self._lock:
+            return set(self._oto.get(name, ()))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'plays': len(self._folders),
+                'oco_edges': sum(len(peers) for peers in self._oco.values()),
+                'oto_edges': sum(len(children) for children in self._oto.values()),
+                'probes': self.probes
+            }
+
+
+def play_graph_enabled() -> bool:
+    return config.get('monitoring', 'play_graph', 'enabled', default=True)
+
+
+# One graph per plays directory (one per account in multi-account mode)
+_play_graphs: Dict[str, PlayGraph] = {}
+_play_graphs_lock = threading.Lock()
+
+
+def get_play_graph(plays_dir: str) -> PlayGraph:
+    """Play graph for a plays directory, built on first use"""
+    plays_dir = os.path.abspath(plays_dir)
+    with _play_graphs_lock:
+        graph = _play_graphs.get(plays_dir)
+        if graph is None:
+            graph = _play_graphs[plays_dir] = PlayGraph(plays_dir)
+            graph.build()
+        return graph
+
+
+def note_play_moved(play_file: str):
+    """Update the graph of a play's plays directory, if one has been built"""
+    graph = _play_graphs.get(os.path.abspath(os.path.dirname(os.path.dirname(os.path.abspath(play_file)))))
+    if graph is not None:
+        graph.note(play_file)
@@ -0,0 +1,205 @@
+import heapq
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+from goldflipper.config.config import config
+
+
+def stock_trigger_levels(play: Dict[str, Any], opening: bool) -> List[float]:
+    """Stock price levels at which a play's entry (opening) or TP / SL condition changes"""
+    if opening:
+        levels = [play.get('entry_point', {}).get('stock_price')]
+    else:
+        take_profit = play.get('take_profit') or {}
+        stop_loss = play.get('stop_loss') or {}
+        levels = [
+            take_profit.get('stock_price'),
+            take_profit.get('TP_stock_price_target'),
+            stop_loss.get('stock_price'),
+            stop_loss.get('SL_stock_price_target'),
+            stop_loss.get('contingency_stock_price'),
+            stop_loss.get('contingency_SL_stock_price_target')
+        ]
+    return [float(level) for level in levels if level]
+
+
+def premium_trigger_levels(play: Dict[str, Any]) -> List[float]:
+    """Option premium levels at which an open play's TP, SL or trailing condition changes"""
+    take_profit = play.get('take_profit') or {}
+    stop_loss = play.get('stop_loss') or {}
+    trail_state = take_profit.get('trail_state') or {}
+    levels = [
+        take_profit.get('TP_option_prem'),
+        stop_loss.get('SL_option_prem'),
+        stop_loss.get('contingency_SL_option_prem'),
+        (trail_state.get('tp1') or {}).get('level_premium'),
+        (trail_state.get('tp2') or {}).get('level_premium')
+    ]
+    return [float(level) for level in levels if level]
+
+
+class PlayScheduler:
+    """
+    Per-play evaluation times kept in a priority queue.
+
+    After each evaluation a play is rescheduled by how long the price would
+    need to reach its nearest trigger. That time is the squared distance over
+    the squared realized volatility of recent samples, divided by the number
+    of standard deviations of safety margin. The result is clamped to
+    [min_interval, max_interval]. Without enough samples the interval scales
+    linearly with distance. Plays not yet seen are due immediately.
+    """
+
+    def __init__(self, min_interval: float = 5.0, max_interval: float = 300.0, sigmas: float = 3.0,
+                 far_distance_pct: float = 5.0, window: int = 30):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.sigmas = sigmas
+        self.far_distance = far_distance_pct / 100
+        self.window = window
+        self._heap: List[Tuple[float, str]] = []
+        self._due: Dict[str, float] = {}
+        self._samples: Dict[str, deque] = {}
+        self._last_full_cycle: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> 'PlayScheduler':
+        settings = config.get('monitoring', 'adaptive_polling', default={}) or {}
+        return cls(
+            min_interval=settings.get('min_interval_seconds', 5),
+            max_interval=settings.get('max_interval_seconds', 300),
+            sigmas=settings.get('trigger_sigmas', 3.0),
+            far_distance_pct=settings.get('far_distance_pct', 5.0),
+            window=settings.get('volatility_window', 30)
+        )
+
+    def record_price(self, series: str, price: Optional[float], at: Optional[float] = None):
+        """Add a price sample for a stock symbol or option contract"""
+        if not price or price <= 0:
+            return
+        at = time.monotonic() if at is None else at
+        with self._lock:
+            samples = self._samples.setdefault(series, deque(maxlen=self.window))
+            if not samples or at > samples[-1][0]:
+                samples.append((at, float(price)))
+
+    def volatility(self, series: str) -> Optional[float]:
+        """Realized volatility of log returns per sqrt(second), or None with too few samples"""
+        with self._lock:
+            samples = list(self._samples.get(series, ()))
+        if len(samples) < 3:
+            return None
+        squared = sum(math.log(p1 / p0) ** 2 for (_, p0), (_, p1) in zip(samples, samples[1:]))
+        elapsed = samples[-1][0] - samples[0][0]
+        if elapsed <= 0 or squared <= 0:
+            return None
+        return math.sqrt(squared / elapsed)
+
+    def interval_for(self, distance: float, sigma: Optional[float]) -> float:
+        """Seconds until a move of `distance` (fraction of price) becomes plausible"""
+        if distance <= 0:
+            return self.min_interval
+        if sigma:
+            interval = (distance / (self.sigmas * sigma)) ** 2
+        else:
+            interval = self.max_interval * min(1.0, distance / self.far_distance)
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def next_interval(self, play: Dict[str, Any], stock_price: Optional[float],
+                      premium: Optional[float] = None, opening: bool = False) -> float:
+        """Seconds until a play should next be evaluated"""
+        intervals = []
+        symbol = play.get('symbol')
+        contract = play.get('option_contract_symbol')
+        if stock_price:
+            for level in stock_trigger_levels(play, opening):
+                intervals.append(self.interval_for(abs(stock_price - level) / stock_price, self.volatility(symbol)))
+        if premium and not opening:
+            for level in premium_trigger_levels(play):
+                intervals.append(self.interval_for(abs(premium - level) / premium, self.volatility(contract)))
+        if not intervals:
+            return self.min_interval
+        interval = min(intervals)
+
+        # Trailing levels are recalculated every cycle in cycle mode
+        trailing = config.get('trailing', default={}) or {}
+        if (play.get('take_profit') or {}).get('trail_state') and trailing.get('update_mode') == 'cycle':
+            interval = min(interval, trailing.get('update_frequency_seconds', 30))
+        return interval
+
+    def schedule(self, play_file: str, play: Dict[str, Any], stock_price: Optional[float],
+                 premium: Optional[float] = None, opening: bool = False, now: Optional[float] = None) -> float:
+        """Record the latest prices for a play and queue its next evaluation"""
+        now = time.monotonic() if now is None else now
+        self.record_price(play.get('symbol'), stock_price, now)
+        self.record_price(play.get('option_contract_symbol'), premium, now)
+        due = now + self.next_interval(play, stock_price, premium, opening)
+        with self._lock:
+            self._due[play_file] = due
+            heapq.heappush(self._heap, (due, play_file))
+        return due
+
+    def forget(self, play_file: str):
+        with self._lock:
+            self._due.pop(play_file, None)
+
+    def is_due(self, play_file: str, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            due = self._due.get(play_file)
+        return due is None or due <= now
+
+    def seconds_until_next(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the earliest scheduled play is due, or None if nothing is scheduled"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            # Drop heap entries superseded by a later schedule() or forget()
+            while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - now)
+
+    def begin_cycle(self, polling_interval: float, now: Optional[float] = None) -> bool:
+        """
+        Start a cycle; returns True if it is a full cycle.
+
+        Full cycles (snapshots, pending orders, display) run once per
+        polling_interval. Wakes in between only evaluate the due plays against
+        the last full cycle's snapshots. A wake within min_interval of the next
+        full cycle runs it early rather than waking again just for it.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._last_full_cycle is not None and now - self._last_full_cycle < polling_interval - self.min_interval:
+                return False
+            self._last_full_cycle = now
+            return True
+
+    def sleep_interval(self, polling_interval: float, now: Optional[float] = None) -> float:
+        """How long the monitoring loop can sleep before the next play is due"""
+        until_next = self.seconds_until_next(now)
+        if until_next is None:
+            return polling_interval
+        return min(polling_interval, max(self.min_interval, until_next))
+
+
+def adaptive_polling_enabled() -> bool:
+    return config.get('monitoring', 'adaptive_polling', 'enabled', default=False)
+
+
+# One scheduler per plays directory (one per account in multi-account mode)
+_play_schedulers: Dict[str, PlayScheduler] = {}
+_play_schedulers_lock = threading.Lock()
+
+
+def get_play_scheduler(plays_dir: str) -> PlayScheduler:
+    """Play scheduler for a plays directory"""
+    with _play_schedulers_lock:
+        if plays_dir not in _play_schedulers:
+            _play_schedulers[plays_dir] = PlayScheduler.from_config()
+        return _play_schedulers[plays_dir]
+
@@ -0,0 +1,243 @@
+import json
+import logging
+import multiprocessing
+import os
+import secrets
+import threading
+import time
+import zlib
+from collections import deque
+from functools import partial
+from multiprocessing.managers import BaseManager
+from typing import Any, Dict, Optional
+from goldflipper.config.config import config
+from goldflipper.brokerage.client_registry import get_client_registry
+from goldflipper.utils.display import TerminalDisplay as display
+
+# Trading client calls that go through the coordinator's order gateway
+ORDER_METHODS = ('submit_order', 'replace_order_by_id', 'cancel_order_by_id')
+
+# Shard this process runs, or None in the coordinator / unsharded process
+_worker_shard: Optional[int] = None
+
+
+def is_shard_worker() -> bool:
+    return _worker_shard is not None
+
+
+def shard_for(symbol: str, shard_count: int) -> int:
+    """Shard owning an underlying (stable across processes and restarts)"""
+    return zlib.crc32((symbol or '').upper().encode('utf-8')) % shard_count
+
+
+class ShardFilter:
+    """
+    Play filter for one shard: owns the play files whose underlying hashes to it.
+
+    Symbols are remembered by file name, which stays the same as a play moves
+    between folders. Unreadable files belong to shard 0.
+    """
+
+    def __init__(self, index: int, count: int):
+        self.index = index
+        self.count = count
+        self._symbols: Dict[str, str] = {}
+
+    def __call__(self, play_file: str) -> bool:
+        name = os.path.basename(play_file)
+        symbol = self._symbols.get(name)
+        if symbol is None:
+            try:
+                with open(play_file, 'r') as f:
+                    symbol = self._symbols[name] = json.load(f).get('symbol') or ''
+            except Exception:
+                return self.index == 0
+        return shard_for(symbol, self.count) == self.index
+
+
+class RateLimiter:
+    """Token bucket allowing `per_minute` calls per minute, with bursts up to `burst`"""
+
+    def __init__(self, per_minute: float, burst: Optional[int] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst or max(1, int(per_minute / 10))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class ShardGateway:
+    """
+    Served by the coordinator to every shard: one market data fetcher (and
+    cycle cache) for all shards, and the single path for order submissions
+    so the account's order rate limit is respected across processes.
+    """
+
+    def __init__(self, orders_per_minute: float = 150, quote_ttl: float = 15):
+        self.quote_ttl = quote_ttl
+        self._limiter = RateLimiter(orders_per_minute)
+        self._cycle_started = 0.0
+        self._lock = threading.Lock()
+        self.order_calls = 0
+
+    def _market_data(self):
+        from goldflipper.core import get_market_data_manager
+        market_data = get_market_data_manager()
+        with self._lock:
+            # Quotes are shared by all shards for quote_ttl seconds
+            if time.monotonic() - self._cycle_started >= self.quote_ttl:
+                market_data.start_new_cycle()
+                self._cycle_started = time.monotonic()
+        return market_data
+
+    def get_stock_price(self, symbol: str):
+        return self._market_data().get_stock_price(symbol)
+
+    def get_option_quote(self, contract_symbol: str):
+        return self._market_data().get_option_quote(contract_symbol)
+
+    def order(self, account_name: str, method: str, *args):
+        if method not in ORDER_METHODS:
+            raise ValueError(f"'{method}' is not an order call")
+        self._limiter.acquire()
+        self.order_calls += 1
+        return getattr(get_client_registry().get('trading', account_name), method)(*args)
+
+
+class _GatewayManager(BaseManager):
+    pass
+
+
+class GatewayMarketData:
+    """Shard-side stand-in for MarketDataManager; quotes come from the coordinator"""
+
+    def __init__(self, gateway):
+        self.gateway = gateway
+        self.cache: Dict[str, Any] = {}
+
+    def start_new_cycle(self):
+        self.cache.clear()
+
+    def get_stock_price(self, symbol: str):
+        key = f"stock_price:{symbol}"
+        if (price := self.cache.get(key)) is None:
+            price = self.cache[key] = self.gateway.get_stock_price(symbol)
+        return price
+
+    def get_option_quote(self, contract_symbol: str):
+        key = f"option_quote:{contract_symbol}"
+        if (quote := self.cache.get(key)) is None:
+            quote = self.cache[key] = self.gateway.get_option_quote(contract_symbol)
+        return quote
+
+
+class GatewayTradingClient:
+    """Trading client whose order calls go through the coordinator's order gateway"""
+
+    def __init__(self, client, gateway, account_name: str):
+        self._client = client
+        self._gateway = gateway
+        self._account_name = account_name
+
+    def __getattr__(self, name):
+        if name in ORDER_METHODS:
+            return partial(self._gateway.order, self._account_name, name)
+        return getattr(self._client, name)
+
+
+def run_shard_worker(index: int, count: int, address, authkey: bytes):
+    """Entry point of a shard process"""
+    global _worker_shard
+    _worker_shard = index
+
+    from goldflipper.utils.logging_setup import configure_logging
+    configure_logging(log_file=f"logs/app_run_shard{index}.log")
+    logging.info(f"Shard {index}/{count} starting")
+
+    _GatewayManager.register('gateway')
+    manager = _GatewayManager(address=address, authkey=authkey)
+    manager.connect()
+    gateway = manager.gateway()
+
+    import goldflipper.core as core
+    core.set_play_filter(ShardFilter(index, count))
+    core.set_market_data_manager(GatewayMarketData(gateway))
+    get_client_registry().trading_client_wrapper = lambda client, account_name: GatewayTradingClient(client, gateway, account_name)
+    core.monitor_plays_continuously()
+
+
+def run_sharded():
+    """
+    Run plays in worker processes sharded by underlying.
+
+    The coordinator serves the shared gateway, starts one process per shard
+    and restarts any shard that exits, backing off when a shard keeps
+    crashing.
+    """
+    shard_count = max(1, config.get('monitoring', 'sharding', 'shards', default=2))
+    max_restarts = config.get('monitoring', 'sharding', 'max_restarts', default=5)
+    restart_window = config.get('monitoring', 'sharding', 'restart_window_seconds', default=300)
+    gateway = ShardGateway(
+        orders_per_minute=config.get('monitoring', 'sharding', 'orders_per_minute', default=150),
+        quote_ttl=config.get('monitoring', 'sharding', 'quote_ttl_seconds',
+                             default=config.get('monitoring', 'polling_interval', default=30) / 2)
+    )
+
+    authkey = secrets.token_bytes(16)
+    _GatewayManager.register('gateway', callable=lambda: gateway)
+    server = _GatewayManager(address=('127.0.0.1', 0), authkey=authkey).get_server()
+    threading.Thread(target=server.serve_forever, name='shard-gateway', daemon=True).start()
+
+    context = multiprocessing.get_context('spawn')
+
+    def start(index):
+        process = context.Process(target=run_shard_worker, args=(index, shard_count, server.address, authkey),
+                                  name=f"goldflipper-shard-{index}", daemon=True)
+        process.start()
+        logging.info(f"Started shard {index} (pid {process.pid})")
+        return process
+
+    workers = {index: start(index) for index in range(shard_count)}
+    restarts = {index: deque() for index in range(shard_count)}
+    paused = set()
+    display.info(f"Running plays in {shard_count} shard processes")
+
+    try:
+        while True:
+            time.sleep(5)
+            now = time.monotonic()
+            for index, process in list(workers.items()):
+                if process.is_alive():
+                    continue
+                history = restarts[index]
+                while history and now - history[0] > restart_window:
+                    history.popleft()
+                if len(history) >= max_restarts:
+                    if index not in paused:
+                        paused.add(index)
+                        logging.error(f"Shard {index} crashed {max_restarts} times within {restart_window}s; "
+                                      f"pausing restarts")
+                        display.error(f"Shard {index} keeps crashing; pausing restarts")
+                    continue
+                paused.discard(index)
+                error_msg = f"Shard {index} exited with code {process.exitcode}; restarting"
+                logging.error(error_msg)
+                display.error(error_msg)
+                history.append(now)
+                workers[index] = start(index)
+    finally:
+        for process in workers.values():
+            if process.is_alive():
+                process.terminate()
@@ -0,0 +1,197 @@
+import importlib
+import logging
+import time
+from datetime import date
+from typing import Callable, Dict, List, Optional
+from goldflipper.alpaca_client import get_alpaca_client
+from goldflipper.brokerage.account_book import refresh_account_book
+from goldflipper.brokerage.client_registry import use_account
+from goldflipper.brokerage.contract_cache import get_contract_cache
+from goldflipper.brokerage.position_book import refresh_position_book
+from goldflipper.config.config import config
+from goldflipper.core import (
+    evaluate_closing_strategy,
+    evaluate_opening_strategy,
+    get_market_data_manager,
+    get_option_data,
+    get_stock_price,
+    list_play_files,
+    load_play,
+    prefetch_new_play_contracts,
+    reschedule_play
+)
+from goldflipper.orchestration.expiry_index import expiry_index_enabled, get_expiry_index
+from goldflipper.orchestration.play_graph import get_play_graph, play_graph_enabled
+from goldflipper.orchestration.play_scheduler import adaptive_polling_enabled, get_play_scheduler
+from goldflipper.utils.display import TerminalDisplay as display
+from goldflipper.utils.market_calendar import get_session_table
+
+# Heavy modules first imported on a cold path (greeks, calendar rebuilds)
+WARMUP_IMPORTS = ('scipy.stats', 'pandas_market_calendars')
+
+
+class PreOpenWarmup:
+    """
+    Gets connections, caches and indexes ready shortly before the open.
+
+    Once per day, within minutes_before_open of the session, the warmup
+    loads the calendar and heavy imports, opens the brokerage and market
+    data connections, prefetches contracts, fetches a quote for every active
+    play, builds the play indexes and runs a dry evaluation pass (conditions
+    only, no orders). Until the open, the trading connections are pinged every
+    keepalive_seconds so they are still warm for the first live cycle, whose
+    duration is then logged next to the dry pass for comparison.
+    """
+
+    def __init__(self, plays_dirs: Dict[str, str], minutes_before_open: float = 10,
+                 keepalive_seconds: float = 30, dry_cycle: bool = True,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.plays_dirs = plays_dirs
+        self.minutes_before_open = minutes_before_open
+        self.keepalive_seconds = keepalive_seconds
+        self.dry_cycle = dry_cycle
+        self.clock = clock
+        self.warmed_on: Optional[date] = None
+        self.timings: Dict[str, float] = {}
+        self._awaiting_live_cycle = False
+
+    def tick(self, minutes_to_open: float, sleep_time: float) -> float:
+        """
+        Warm up or keep connections alive while the market is closed.
+
+        Returns:
+            The closed-market sleep, shortened near the open to keep connections alive
+        """
+        if minutes_to_open > self.minutes_before_open:
+            return sleep_time
+        if self.warmed_on != date.today():
+            self.run()
+        else:
+            self.keepalive()
+        return min(sleep_time, self.keepalive_seconds)
+
+    def _step(self, name: str, func: Callable, *args):
+        started = self.clock()
+        try:
+            func(*args)
+        except Exception as e:
+            logging.warning(f"Warmup step {name} failed: {str(e)}")
+        self.timings[name] = self.timings.get(name, 0.0) + self.clock() - started
+
+    def run(self) -> Dict[str, float]:
+        """Run every warmup step, returning seconds per step"""
+        display.header("Pre-open warmup (dry evaluation, no orders are placed)...")
+        logging.info(f"Pre-open warmup for {', '.join(self.plays_dirs)}")
+        self.timings = {}
+        started = self.clock()
+
+        self._step('calendar', get_session_table)
+        self._step('imports', self._import_modules)
+        if config.get('orders', 'contract_cache', 'enabled', default=True) and not get_contract_cache().is_prefetched():
+            self._step('contracts', prefetch_new_play_contracts, *self.plays_dirs.values())
+        for account, plays_dir in self.plays_dirs.items():
+            with use_account(account):
+                plays = self._active_plays(plays_dir)
+                self._step('connections', self._open_connections, plays)
+                self._step('quotes', self._fetch_quotes, plays)
+                self._step('indexes', self._build_indexes, plays_dir, plays)
+                if self.dry_cycle:
+                    self._step('dry_cycle', self._evaluate, plays)
+
+        self.timings['total'] = self.clock() - started
+        self.warmed_on = date.today()
+        self._awaiting_live_cycle = True
+        summary = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.timings.items())
+        logging.info(f"Pre-open warmup done: {summary}")
+        display.success(f"Pre-open warmup done in {self.timings['total']:.2f}s")
+        return self.timings
+
+    def keepalive(self):
+        """Ping each account's trading API so its pooled connections stay open"""
+        for account in self.plays_dirs:
+            try:
+                with use_account(account):
+                    get_alpaca_client().get_clock()
+            except Exception as e:
+                logging.debug(f"Warmup keepalive for {account} failed: {str(e)}")
+
+    def note_live_cycle(self, seconds: float):
+        """Log the first live cycle after a warmup next to the dry pass"""
+        if not self._awaiting_live_cycle:
+            return
+        self._awaiting_live_cycle = False
+        dry = self.timings.get('dry_cycle')
+        logging.info(f"First live cycle after warmup took {seconds:.2f}s"
+                     + (f" (warmup dry cycle {dry:.2f}s)" if dry is not None else ""))
+
+    def _import_modules(self):
+        for module in WARMUP_IMPORTS:
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                pass
+
+    def _active_plays(self, plays_dir: str) -> List[tuple]:
+        plays = []
+        for play_type in ('new', 'open', 'pending-opening', 'pending-closing'):
+            for play_file in list_play_files(plays_dir, play_type):
+                play = load_play(play_file)
+                if play:
+                    plays.append((play_type, play_file, play))
+        return plays
+
+    def _open_connections(self, plays: List[tuple]):
+        get_alpaca_client().get_clock()
+        refresh_position_book()
+        refresh_account_book()
+        # Fallback providers get one request so their sessions are open too
+        symbol = next((play['symbol'] for _, _, play in plays if play.get('symbol')), None)
+        manager = get_market_data_manager()
+        if symbol:
+            for name, provider in manager.providers.items():
+                if provider is not manager.provider:
+                    try:
+                        provider.get_stock_price(symbol)
+                    except Exception as e:
+                        logging.debug(f"Warmup request to {name} failed: {str(e)}")
+
+    def _fetch_quotes(self, plays: List[tuple]):
+        for symbol in {play.get('symbol') for _, _, play in plays if play.get('symbol')}:
+            get_stock_price(symbol)
+        for contract in {play.get('option_contract_symbol') for _, _, play in plays
+                         if play.get('option_contract_symbol')}:
+            get_option_data(contract)
+
+    def _build_indexes(self, plays_dir: str, plays: List[tuple]):
+        if play_graph_enabled():
+            get_play_graph(plays_dir)
+        if expiry_index_enabled():
+            get_expiry_index(plays_dir, lambda: list_play_files(plays_dir, 'new')).sync()
+        if adaptive_polling_enabled():
+            scheduler = get_play_scheduler(plays_dir)
+            for play_type, play_file, _ in plays:
+                if play_type in ('new', 'open'):
+                    reschedule_play(scheduler, play_file, play_type)
+
+    def _evaluate(self, plays: List[tuple]):
+        for play_type, play_file, play in plays:
+            try:
+                if play_type == 'new':
+                    evaluate_opening_strategy(play['symbol'], play)
+                elif play_type == 'open':
+                    # No play file: targets calculated here are not saved
+                    evaluate_closing_strategy(play['symbol'], play)
+            except Exception as e:
+                logging.warning(f"Warmup evaluation of {play_file} failed: {str(e)}")
+
+
+def make_warmup(plays_dirs: Dict[str, str]) -> Optional[PreOpenWarmup]:
+    """Pre-open warmup for accounts' plays directories, or None when monitoring.warmup is disabled"""
+    if not config.get('monitoring', 'warmup', 'enabled', default=False):
+        return None
+    return PreOpenWarmup(
+        plays_dirs,
+        minutes_before_open=config.get('monitoring', 'warmup', 'minutes_before_open', default=10),
+        keepalive_seconds=config.get('monitoring', 'warmup', 'keepalive_seconds', default=30),
+        dry_cycle=config.get('monitoring', 'warmup', 'dry_cycle', default=True)
+    )
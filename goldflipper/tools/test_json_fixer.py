@@ -265,13 +265,8 @@ def test_json_fixer():
         corrupted_file4 = test_dir / 'plays/pending-closing/missing_close_info.json'
         create_corrupted_play_file(corrupted_file4, "missing_close_info", trade_type="CALL")
         
-        # Create our fixer class with a modified base path for testing
-        class TestPlayFileFixer(PlayFileFixer):
-            def __init__(self, test_dir):
-                super().__init__()
-                self.base_dir = test_dir
-        
-        fixer = TestPlayFileFixer(test_dir)
+        # Point the fixer at the test plays directory
+        fixer = PlayFileFixer(test_dir / 'plays')
         
         # Run the fixer
         fixed_count = fixer.check_and_fix_all_plays()
@@ -0,0 +1,130 @@
+import os
+import sys
+
+# Get the absolute path to the project root directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+# Add the project root to Python path
+sys.path.insert(0, project_root)
+
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from goldflipper.config.config import config
+from goldflipper.utils.display import TerminalDisplay as display
+from goldflipper.data.indicators.screener import LocalBarSource, BarPanel, screen_symbols
+
+
+def get_bars_dir():
+    """Resolve the local bar directory from settings (relative to the goldflipper package)."""
+    bars_dir = config.get('indicators', 'screener', 'bars_dir', default='data/bars')
+    if os.path.isabs(bars_dir):
+        return bars_dir
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), bars_dir)
+
+
+def download_bars(symbols, source: LocalBarSource, period='1y'):
+    """Fetch daily bars for all symbols in one batched yfinance call and store them locally."""
+    import yfinance as yf
+
+    display.info(f"Downloading {period} of daily bars for {len(symbols)} symbols...")
+    data = yf.download(symbols, period=period, group_by='ticker', auto_adjust=False,
+                       progress=False, threads=True)
+
+    saved = 0
+    for symbol in symbols:
+        try:
+            bars = data[symbol] if isinstance(data.columns, pd.MultiIndex) else data
+            bars = bars.dropna(how='all')
+            if bars.empty:
+                logging.warning(f"No bars returned for {symbol}")
+                continue
+            source.save(symbol, bars)
+            saved += 1
+        except KeyError:
+            logging.warning(f"No bars returned for {symbol}")
+
+    display.success(f"Stored bars for {saved}/{len(symbols)} symbols in {source.bars_dir}")
+    return saved
+
+
+def generate_synthetic_panel(num_symbols, days=252, seed=0):
+    """Random-walk bars for offline benchmarking of the screener."""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=days)
+    symbols = [f"SYM{i:04d}" for i in range(num_symbols)]
+
+    returns = rng.normal(0.0005, 0.02, size=(days, num_symbols))
+    close = 100 * np.exp(np.cumsum(returns, axis=0))
+    spread = np.abs(rng.normal(0, 0.01, size=(days, num_symbols))) * close
+
+    return BarPanel(
+        high=pd.DataFrame(close + spread, index=index, columns=symbols),
+        low=pd.DataFrame(close - spread, index=index, columns=symbols),
+        close=pd.DataFrame(close, index=index, columns=symbols),
+        volume=pd.DataFrame(rng.integers(1e5, 1e7, size=(days, num_symbols)).astype(float),
+                            index=index, columns=symbols)
+    )
+
+
+def display_candidates(candidates: pd.DataFrame):
+    """Print ranked candidates with the key indicator columns."""
+    columns = [c for c in ['direction', 'score', 'close', 'squeeze_on', 'momentum',
+                           'macd_above_signal', 'macd_crossover_up', 'macd_crossover_down']
+               if c in candidates.columns]
+    print("\nRanked Candidates:")
+    print(candidates[columns].to_string(float_format=lambda v: f"{v:.2f}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Screen the watchlist with EMA/MACD/TTM Squeeze')
+    parser.add_argument('--symbols', nargs='*', help='Symbols to screen (defaults to the configured watchlist)')
+    parser.add_argument('--bars-dir', default=None, help='Directory of <SYMBOL>.csv daily bars')
+    parser.add_argument('--download', action='store_true', help='Refresh local bars from yfinance first')
+    parser.add_argument('--top', type=int, default=None, help='Number of candidates to show')
+    parser.add_argument('--benchmark', type=int, default=None, metavar='N',
+                        help='Screen N synthetic symbols offline and report timing')
+    args = parser.parse_args()
+
+    settings = config.get('indicators', default={}) or {}
+    top_n = args.top or config.get('indicators', 'screener', 'top_n', default=20)
+
+    if args.benchmark:
+        panel = generate_synthetic_panel(args.benchmark)
+        start = time.perf_counter()
+        candidates = screen_symbols(panel, settings, top_n=top_n)
+        elapsed = time.perf_counter() - start
+        display_candidates(candidates)
+        display.success(f"Screened {args.benchmark} symbols x {len(panel.close)} bars in {elapsed * 1000:.1f} ms")
+        return
+
+    symbols = [s.upper() for s in (args.symbols or config.get('watchlist', default=[]) or [])]
+    if not symbols:
+        display.error("No symbols to screen. Add symbols to the watchlist or pass --symbols")
+        return
+
+    source = LocalBarSource(args.bars_dir or get_bars_dir())
+    if args.download or not source.available_symbols():
+        download_bars(symbols, source, period=config.get('indicators', 'screener', 'period', default='1y'))
+
+    start = time.perf_counter()
+    try:
+        panel = source.load(symbols)
+    except ValueError:
+        display.error(f"No bar data for {', '.join(symbols)} in {source.bars_dir}. "
+                      "Check the symbols or run with --download")
+        return
+    try:
+        candidates = screen_symbols(panel, settings, top_n=top_n)
+    except ValueError as e:
+        display.error(f"Not enough bar data to screen: {str(e)}")
+        return
+    elapsed = time.perf_counter() - start
+
+    display_candidates(candidates)
+    display.info(f"Screened {len(panel.symbols)} symbols in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ the MarketDataApp API with the historical date from the play's opening timestamp
 import os
 import sys
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
 from typing import Dict, Any, Optional, List, Tuple
 import pandas as pd
@@ -24,6 +26,7 @@ from goldflipper.data.market.manager import MarketDataManager
 from goldflipper.data.market.providers.marketdataapp_provider import MarketDataAppProvider
 from goldflipper.config.config import config
 from goldflipper.utils.display import TerminalDisplay as display
+from goldflipper.trade_logging.historical_quote_cache import HistoricalQuoteCache, NO_DATA
 
 
 class DataBackfillHelper:
@@ -42,6 +45,17 @@ class DataBackfillHelper:
         provider_name = config.get('market_data_providers', 'primary_provider', default='marketdataapp')
         self.provider_name = provider_name
         
+        # Historical quotes never change, so they are cached on disk across runs
+        self.quote_cache = None
+        if config.get('trade_logging', 'backfill', 'cache', 'enabled', default=True):
+            cache_dir = config.get('trade_logging', 'backfill', 'cache', 'directory', default='trade_logging/quote_cache')
+            if not os.path.isabs(cache_dir):
+                cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), cache_dir)
+            self.quote_cache = HistoricalQuoteCache(cache_dir, provider=provider_name)
+        
+        # Concurrent fetches share the provider's rate limiter
+        self.max_workers = max(1, int(config.get('trade_logging', 'backfill', 'max_workers', default=4)))
+        
         # Initialize counters for tracking
         self.stats = {
             'total_processed': 0,
@@ -50,8 +64,13 @@ class DataBackfillHelper:
             'failed_backfills': 0,
             'api_errors': 0,
             'invalid_dates': 0,
-            'missing_symbols': 0
+            'missing_symbols': 0,
+            'api_calls': 0,
+            'cache_hits': 0
         }
+        self._stats_lock = threading.Lock()
+        # Per play of the last backfill_multiple_plays call: True if nothing is left to backfill
+        self.last_results: List[bool] = []
         
         logging.info(f"DataBackfillHelper initialized with provider: {provider_name}")
     
@@ -169,13 +188,17 @@ class DataBackfillHelper:
             logging.error(f"Error constructing option symbol: {str(e)}")
             return None
     
+    def _count(self, stat: str):
+        with self._stats_lock:
+            self.stats[stat] += 1
+    
     def get_historical_option_data(
         self, 
         option_symbol: str, 
         historical_date: date
     ) -> Optional[Dict[str, float]]:
         """
-        Fetch historical option data for a specific date.
+        Fetch historical option data for a specific date, using the on-disk cache.
         
         Args:
             option_symbol: OCC option symbol
@@ -184,13 +207,37 @@ class DataBackfillHelper:
         Returns:
             Dictionary containing option data including Greeks, or None if failed
         """
+        if self.quote_cache is not None:
+            cached = self.quote_cache.get('option', option_symbol, historical_date)
+            if cached is not None:
+                self._count('cache_hits')
+                return None if cached == NO_DATA else cached
+        
+        result, definitive = self._fetch_historical_option_data(option_symbol, historical_date)
+        
+        # Errors are retried next time; answers (including "no data") are final
+        if self.quote_cache is not None and definitive:
+            self.quote_cache.put('option', option_symbol, historical_date, result)
+        return result
+    
+    def _fetch_historical_option_data(
+        self, 
+        option_symbol: str, 
+        historical_date: date
+    ) -> Tuple[Optional[Dict[str, float]], bool]:
+        """
+        Request historical option data for a specific date from the provider.
+        
+        Returns:
+            Tuple of (option data or None, whether the provider's answer was definitive)
+        """
         try:
             # Use MarketDataApp provider directly for historical data
             provider = self.market_manager.provider
             
             if not isinstance(provider, MarketDataAppProvider):
                 logging.warning(f"Provider {self.provider_name} may not support historical Greeks")
-                return None
+                return None, False
             
             # Build URL with historical date parameter
             date_str = historical_date.strftime("%Y-%m-%d")
@@ -199,6 +246,7 @@ class DataBackfillHelper:
             
             logging.info(f"Fetching historical data for {option_symbol} on {date_str}")
             
+            self._count('api_calls')
             response = provider._make_request(url, params)
             
             if response.status_code in (200, 203):
@@ -222,21 +270,21 @@ class DataBackfillHelper:
                     result = {k: v for k, v in result.items() if v is not None}
                     
                     logging.info(f"Successfully retrieved historical data: delta={result.get('delta')}, theta={result.get('theta')}")
-                    return result
+                    return result, True
                 else:
                     logging.warning(f"API returned error for {option_symbol} on {date_str}: {data.get('errmsg', 'Unknown error')}")
-                    return None
+                    return None, data.get('s') == 'no_data'
             elif response.status_code == 204:
                 logging.warning(f"No historical data available for {option_symbol} on {date_str}")
-                return None
+                return None, True
             else:
                 logging.error(f"API request failed for {option_symbol} on {date_str}: {response.status_code}")
-                return None
+                return None, False
                 
         except Exception as e:
             logging.error(f"Error fetching historical data for {option_symbol}: {str(e)}")
-            self.stats['api_errors'] += 1
-            return None
+            self._count('api_errors')
+            return None, False
     
     def backfill_play_data(self, play_data: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
         """
@@ -250,6 +298,21 @@ class DataBackfillHelper:
         """
         self.stats['total_processed'] += 1
         
+        finished, request = self._plan_backfill(play_data)
+        if request is None:
+            return finished, play_data
+        
+        historical_data = self.get_historical_option_data(*request)
+        return self._apply_historical_data(play_data, historical_data)
+    
+    def _plan_backfill(self, play_data: Dict[str, Any]) -> Tuple[Optional[bool], Optional[Tuple[str, date]]]:
+        """
+        Decide whether a play needs a historical lookup.
+        
+        Returns:
+            (None, (option_symbol, opening_date)) if a lookup is needed, otherwise
+            (success_flag, None) for plays that are complete or cannot be backfilled
+        """
         # Only backfill if the play was actually opened per entry premium
         entry_point = play_data.get('entry_point', {}) or {}
         entry_premium = entry_point.get('entry_premium')
@@ -258,7 +321,7 @@ class DataBackfillHelper:
         except (TypeError, ValueError):
             opened_by_entry_premium = False
         if not opened_by_entry_premium:
-            return True, play_data
+            return True, None
 
         # Check what data is missing (closed plays only)
         missing = self.check_missing_data(play_data)
@@ -266,7 +329,7 @@ class DataBackfillHelper:
         # Skip if no Greeks are missing
         if not (missing['delta_atOpen'] or missing['theta_atOpen']):
             logging.debug(f"Play {play_data.get('play_name', 'Unknown')} has complete Greeks data")
-            return True, play_data
+            return True, None
         
         self.stats['missing_greeks_found'] += 1
         
@@ -274,18 +337,18 @@ class DataBackfillHelper:
         if not missing['has_option_symbol']:
             logging.warning(f"Play {play_data.get('play_name', 'Unknown')} missing option symbol")
             self.stats['missing_symbols'] += 1
-            return False, play_data
+            return False, None
         
         if not missing['has_opening_date']:
             logging.warning(f"Play {play_data.get('play_name', 'Unknown')} missing opening date")
             self.stats['invalid_dates'] += 1
-            return False, play_data
+            return False, None
         
         # Use recorded option symbol from play creation
         option_symbol = play_data.get('option_contract_symbol')
         if not option_symbol:
             self.stats['missing_symbols'] += 1
-            return False, play_data
+            return False, None
         
         # Parse the opening datetime
         try:
@@ -295,15 +358,22 @@ class DataBackfillHelper:
         except (ValueError, KeyError) as e:
             logging.error(f"Invalid opening datetime: {str(e)}")
             self.stats['invalid_dates'] += 1
-            return False, play_data
-        
-        # Fetch historical data
-        historical_data = self.get_historical_option_data(option_symbol, opening_date)
+            return False, None
         
+        return None, (option_symbol, opening_date)
+    
+    def _apply_historical_data(
+        self,
+        play_data: Dict[str, Any],
+        historical_data: Optional[Dict[str, float]]
+    ) -> Tuple[bool, Dict[str, Any]]:
+        """Fill the play's missing opening fields from a historical quote"""
         if not historical_data:
             self.stats['failed_backfills'] += 1
             return False, play_data
         
+        missing = self.check_missing_data(play_data)
+        
         # Update the play data with retrieved information
         updated_play = play_data.copy()
         
@@ -332,27 +402,85 @@ class DataBackfillHelper:
         self.stats['successful_backfills'] += 1
         return True, updated_play
     
+    def prefetch_historical_option_data(
+        self,
+        lookups: List[Tuple[str, date]]
+    ) -> Dict[Tuple[str, date], Optional[Dict[str, float]]]:
+        """
+        Resolve many (option_symbol, date) lookups at once.
+        
+        Duplicate requests are collapsed, cached quotes are served from disk and
+        the remaining lookups are fetched concurrently. All workers go through
+        the provider's shared rate limiter, so concurrency only overlaps latency.
+        
+        Returns:
+            Dictionary mapping each unique request to its option data (or None)
+        """
+        results = {}
+        to_fetch = []
+        for request in dict.fromkeys(lookups):
+            cached = self.quote_cache.get('option', *request) if self.quote_cache is not None else None
+            if cached is not None:
+                self._count('cache_hits')
+                results[request] = None if cached == NO_DATA else cached
+            else:
+                to_fetch.append(request)
+        
+        if to_fetch:
+            display.info(f"🌐 Fetching {len(to_fetch)} historical quotes "
+                         f"({len(results)} cached, {len(lookups) - len(results) - len(to_fetch)} duplicates)...")
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(to_fetch))) as executor:
+                for request, data in zip(to_fetch, executor.map(lambda r: self.get_historical_option_data(*r), to_fetch)):
+                    results[request] = data
+        
+        return results
+    
     def backfill_multiple_plays(self, plays_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Backfill data for multiple plays.
         
+        Historical lookups for the whole batch are deduplicated and resolved
+        up front (cache first, then concurrent fetches) before plays are updated.
+        
         Args:
             plays_data: List of play data dictionaries
             
         Returns:
-            List of updated play data dictionaries
+            List of updated play data dictionaries. last_results holds, per play,
+            whether it is complete (True) or a lookup failed and it can be retried (False).
         """
-        updated_plays = []
-        
         logging.info(f"Starting backfill process for {len(plays_data)} plays")
         display.info(f"🔄 Starting data backfill for {len(plays_data)} plays...")
         
+        # Work out which plays need a historical lookup
+        plans = []
         for i, play_data in enumerate(plays_data):
+            self.stats['total_processed'] += 1
+            try:
+                plans.append(self._plan_backfill(play_data))
+            except Exception as e:
+                logging.error(f"Error processing play {play_data.get('play_name', f'Play_{i}')}: {str(e)}")
+                self.stats['failed_backfills'] += 1
+                plans.append((None, None))
+        
+        historical = self.prefetch_historical_option_data(
+            [request for _, request in plans if request is not None]
+        )
+        
+        updated_plays = []
+        self.last_results = []
+        for i, (play_data, (finished, request)) in enumerate(zip(plays_data, plans)):
             play_name = play_data.get('play_name', f'Play_{i}')
             
             try:
-                success, updated_play = self.backfill_play_data(play_data)
-                updated_plays.append(updated_play)
+                if request is None:
+                    updated_plays.append(play_data)
+                    # Plays missing a symbol or date cannot be backfilled until their file changes
+                    self.last_results.append(finished is not None)
+                else:
+                    applied, updated_play = self._apply_historical_data(play_data, historical.get(request))
+                    updated_plays.append(updated_play)
+                    self.last_results.append(applied)
                 
                 # Progress reporting
                 if (i + 1) % 10 == 0 or i == len(plays_data) - 1:
@@ -362,6 +490,7 @@ class DataBackfillHelper:
             except Exception as e:
                 logging.error(f"Error processing play {play_name}: {str(e)}")
                 updated_plays.append(play_data)  # Keep original if error occurs
+                self.last_results.append(False)
                 self.stats['failed_backfills'] += 1
         
         # Report final statistics
@@ -378,6 +507,7 @@ class DataBackfillHelper:
         display.info(f"   Plays with missing Greeks: {stats['missing_greeks_found']}")
         display.info(f"   Successful backfills: {stats['successful_backfills']}")
         display.info(f"   Failed backfills: {stats['failed_backfills']}")
+        display.info(f"   API calls: {stats['api_calls']} (cache hits: {stats['cache_hits']})")
         
         if stats['api_errors'] > 0:
             display.warning(f"   API errors: {stats['api_errors']}")
@@ -0,0 +1,310 @@
+"""
+Streaming Excel export for the trade log.
+
+Rows are written in order with xlsxwriter's constant_memory mode, so each
+row is flushed to disk as soon as the next one starts and memory use stays
+flat regardless of log size. Every cell format is created once up front and
+shared, and the column handling is resolved per column rather than per cell.
+Summary statistics are accumulated in the same pass.
+"""
+
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+# Friendly column names for the exported sheet
+COLUMN_MAPPING = {
+    'play_name': 'Play Name',
+    'symbol': 'Symbol',
+    'trade_type': 'Trade',
+    'strike_price': 'Strike',
+    'expiration_date': 'Expiration',
+    'contracts': '#',
+    'date_atOpen': 'Open Date',
+    'time_atOpen': 'Open Time',
+    'date_atClose': 'Close Date',
+    'time_atClose': 'Close Time',
+    'price_atOpen': 'Open Price',
+    'price_atClose': 'Close Price',
+    'premium_atOpen': 'Open Prem.',
+    'premium_atClose': 'Close Prem.',
+    'delta_atOpen': 'Open Δ',
+    'theta_atOpen': 'Open Θ',
+    'close_type': 'Close',
+    'close_condition': 'Condition',
+    'profit_loss_pct': 'P/L %',
+    'profit_loss': 'P/L $',
+    'status': 'Status'
+}
+
+# Column widths in characters; unlisted columns are sized to their content
+COLUMN_WIDTH_OVERRIDES = {
+    'Symbol': 9,
+    'Trade': 7.5,
+    'Strike': 7.5,
+    'Expiration': 11.5,
+    '#': 3.5,
+    'Open Date': 12,
+    'Open Time': 12,
+    'Close Date': 12,
+    'Close Time': 12,
+    'Open Price': 12.25,
+    'Close Price': 12.25,
+    'Open Prem.': 13,
+    'Close Prem.': 13,
+    'Open Δ': 10,
+    'Open Θ': 10,
+    'Close': 7.5,
+    'Condition': 12,
+    'P/L %': 10,
+    'P/L $': 12,
+    'Status': 8
+}
+
+BORDER_COLOR = '#D3D3D3'  # Light gray
+EVEN_SHADE = '#F2F2F2'
+ODD_SHADE = 'white'
+PROFIT_COLOR = '#E8F4EA'  # Light green
+LOSS_COLOR = '#FBE9E7'    # Light red
+
+
+def _column_kind(name: str) -> str:
+    """How a column's cells are written, in the same precedence as the original export"""
+    if name == 'Play Name':
+        return 'name'
+    if 'Strike' in name:
+        return 'strike'
+    if any(term in name for term in ['Price', 'Premium', 'Prem.']):
+        return 'money'
+    if 'Date' in name:
+        return 'date'
+    if 'Time' in name:
+        return 'time'
+    if 'P/L %' in name:
+        return 'pl_pct'
+    if 'P/L $' in name:
+        return 'pl'
+    return 'text'
+
+
+def _create_formats(workbook) -> Dict[str, Any]:
+    """Create every cell format once; keys are (kind, parity) or (kind, sign, parity)"""
+    def add(props):
+        return workbook.add_format({'border_color': BORDER_COLOR, 'border': 1, **props})
+
+    formats = {
+        'header_centered': add({'bold': True, 'font_color': 'white', 'bg_color': '#2F75B5',
+                                'align': 'center', 'valign': 'vcenter'}),
+        'header_left': add({'bold': True, 'font_color': 'white', 'bg_color': '#2F75B5',
+                            'align': 'left', 'valign': 'vcenter'}),
+    }
+    for parity, shade in ((0, EVEN_SHADE), (1, ODD_SHADE)):
+        formats[('name', parity)] = add({'bg_color': shade, 'align': 'left'})
+        formats[('text', parity)] = add({'bg_color': shade, 'align': 'center'})
+        formats[('money', parity)] = add({'num_format': '$#,##0.00', 'align': 'center', 'bg_color': shade})
+        formats[('strike', parity)] = add({'num_format': '$#,##0', 'align': 'center', 'bg_color': shade})
+        formats[('date', parity)] = add({'num_format': 'yyyy-mm-dd', 'align': 'center', 'bg_color': shade})
+        formats[('time', parity)] = add({'num_format': 'hh:mm:ss', 'align': 'center', 'bg_color': shade})
+        formats[('pl', 'profit', parity)] = add({'num_format': '+$#,##0.00;-$#,##0.00', 'align': 'center',
+                                                 'bg_color': PROFIT_COLOR})
+        formats[('pl', 'loss', parity)] = add({'num_format': '+$#,##0.00;-$#,##0.00', 'align': 'center',
+                                               'bg_color': LOSS_COLOR})
+        formats[('pl_pct', 'profit', parity)] = add({'num_format': '0.00%', 'align': 'center',
+                                                     'bg_color': PROFIT_COLOR})
+        formats[('pl_pct', 'loss', parity)] = add({'num_format': '0.00%', 'align': 'center',
+                                                   'bg_color': LOSS_COLOR})
+    return formats
+
+
+def _is_missing(value) -> bool:
+    return value is None or value == '' or (isinstance(value, float) and value != value)
+
+
+def _write_cell(worksheet, row: int, col: int, kind: str, value, parity: int, formats: Dict[str, Any]):
+    if kind in ('name', 'text', 'date', 'time'):
+        fmt = formats[(kind, parity)]
+        if _is_missing(value):
+            worksheet.write_blank(row, col, None, fmt)
+        elif isinstance(value, str):
+            # Typed writes skip xlsxwriter's per-string URL/formula detection
+            worksheet.write_string(row, col, value, fmt)
+        elif isinstance(value, (int, float, np.integer, np.floating)):
+            worksheet.write_number(row, col, value, fmt)
+        else:
+            worksheet.write(row, col, value, fmt)
+    elif kind in ('money', 'strike'):
+        fmt = formats[(kind, parity)]
+        if _is_missing(value):
+            worksheet.write_blank(row, col, None, fmt)
+        else:
+            try:
+                worksheet.write_number(row, col, float(value), fmt)
+            except (ValueError, TypeError):
+                worksheet.write(row, col, value, fmt)
+    else:
+        # P/L columns: zero or missing stays blank, otherwise shaded by sign
+        try:
+            number = 0.0 if _is_missing(value) else float(value)
+        except (ValueError, TypeError):
+            worksheet.write(row, col, value, formats[('money', parity)])
+            return
+        if number == 0:
+            worksheet.write_blank(row, col, None, formats[('money', parity)])
+        else:
+            sign = 'profit' if number > 0 else 'loss'
+            scaled = number / 100 if kind == 'pl_pct' else number
+            worksheet.write_number(row, col, scaled, formats[(kind, sign, parity)])
+
+
+def write_trade_log_excel(export_path: str, chunks: Iterable[pd.DataFrame],
+                          log_columns: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Stream trade log chunks into a formatted workbook.
+
+    Args:
+        export_path: Destination .xlsx path
+        chunks: DataFrames with trade log columns, in row order
+        log_columns: Trade log columns, so the header row is written even when there are no rows
+                     (defaults to the first chunk's columns)
+
+    Returns:
+        dict: Summary statistics gathered while writing
+              (total_trades, winning_trades, win_rate, total_pl)
+    """
+    workbook = xlsxwriter.Workbook(export_path, {'constant_memory': True, 'nan_inf_to_errors': True})
+    worksheet = workbook.add_worksheet('Trade Log')
+    formats = _create_formats(workbook)
+
+    columns: List[str] = []
+    kinds: List[str] = []
+    content_widths: List[int] = []
+    row = 0
+    total_trades = 0
+    winning_trades = 0
+    total_pl = 0.0
+
+    def write_header(source_columns):
+        nonlocal columns, kinds, content_widths
+        columns = [COLUMN_MAPPING.get(c, c) for c in source_columns]
+        kinds = [_column_kind(name) for name in columns]
+        content_widths = [len(name) for name in columns]
+        for col, name in enumerate(columns):
+            header = formats['header_centered'] if name == 'Play Name' else formats['header_left']
+            worksheet.write(0, col, name, header)
+
+    try:
+        if log_columns:
+            write_header(log_columns)
+        for chunk in chunks:
+            if not columns:
+                write_header(chunk.columns)
+
+            pl_index = list(chunk.columns).index('profit_loss') if 'profit_loss' in chunk.columns else None
+
+            for values in chunk.itertuples(index=False, name=None):
+                row += 1
+                parity = (row - 1) % 2
+                for col, value in enumerate(values):
+                    _write_cell(worksheet, row, col, kinds[col], value, parity, formats)
+                    if columns[col] not in COLUMN_WIDTH_OVERRIDES:
+                        length = len(str(value))
+                        if length > content_widths[col]:
+                            content_widths[col] = length
+
+                total_trades += 1
+                if pl_index is not None and not _is_missing(values[pl_index]):
+                    pl_value = float(values[pl_index])
+                    total_pl += pl_value
+                    if pl_value > 0:
+                        winning_trades += 1
+
+        for col, name in enumerate(columns):
+            width = COLUMN_WIDTH_OVERRIDES.get(name, min(content_widths[col] + 2, 40))
+            worksheet.set_column(col, col, width)
+
+        worksheet.freeze_panes(1, 0)
+        if columns:
+            worksheet.autofilter(0, 0, row, len(columns) - 1)
+    finally:
+        workbook.close()
+
+    return {
+        'total_trades': total_trades,
+        'winning_trades': winning_trades,
+        'win_rate': float(winning_trades / total_trades * 100) if total_trades > 0 else 0.0,
+        'total_pl': total_pl
+    }
+
+
+def generate_synthetic_log(rows: int, chunksize: int = 10000, seed: int = 0) -> Iterable[pd.DataFrame]:
+    """Yield a synthetic trade log in chunks for benchmarking"""
+    from goldflipper.trade_logging.trade_log_store import TRADE_LOG_COLUMNS
+
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunksize):
+        n = min(chunksize, rows - start)
+        premium_open = rng.uniform(0.5, 10.0, n).round(2)
+        premium_close = (premium_open * rng.uniform(0.2, 2.0, n)).round(2)
+        contracts = rng.integers(1, 10, n)
+        data = {
+            'play_name': [f"SYM-call-{i}" for i in range(start, start + n)],
+            'symbol': rng.choice(['SPY', 'QQQ', 'AAPL', 'MSFT', 'TSLA'], n),
+            'trade_type': rng.choice(['CALL', 'PUT'], n),
+            'strike_price': rng.integers(50, 600, n).astype(float),
+            'expiration_date': '01/16/2026',
+            'contracts': contracts,
+            'date_atOpen': '2025-01-02',
+            'time_atOpen': '10:15:00',
+            'date_atClose': '2025-01-03',
+            'time_atClose': '14:45:00',
+            'price_atOpen': rng.uniform(50, 600, n).round(2),
+            'price_atClose': rng.uniform(50, 600, n).round(2),
+            'premium_atOpen': premium_open,
+            'premium_atClose': premium_close,
+            'delta_atOpen': rng.uniform(-1, 1, n).round(3),
+            'theta_atOpen': rng.uniform(-0.5, 0, n).round(3),
+            'close_type': rng.choice(['TP', 'SL', None], n),
+            'close_condition': None,
+            'profit_loss_pct': ((premium_close - premium_open) / premium_open * 100).round(2),
+            'profit_loss': ((premium_close - premium_open) * contracts * 100).round(2),
+            'status': 'closed'
+        }
+        yield pd.DataFrame(data, columns=list(TRADE_LOG_COLUMNS.keys()))
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+    import psutil
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+    parser = argparse.ArgumentParser(description='Benchmark the streaming trade log Excel export')
+    parser.add_argument('--rows', type=int, default=100000, help='Synthetic rows to export')
+    parser.add_argument('--chunksize', type=int, default=10000, help='Rows per chunk')
+    args = parser.parse_args()
+
+    process = psutil.Process()
+    peak_rss = process.memory_info().rss
+
+    def tracked_chunks():
+        global peak_rss
+        for chunk in generate_synthetic_log(args.rows, chunksize=args.chunksize):
+            yield chunk
+            peak_rss = max(peak_rss, process.memory_info().rss)
+
+    baseline_rss = process.memory_info().rss
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'trade_log.xlsx')
+        start = time.perf_counter()
+        stats = write_trade_log_excel(path, tracked_chunks())
+        elapsed = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / 1e6
+
+    print(f"Exported {stats['total_trades']} rows in {elapsed:.2f}s ({stats['total_trades'] / elapsed:,.0f} rows/s)")
+    print(f"Workbook size: {size_mb:.1f} MB, peak RSS growth: {(peak_rss - baseline_rss) / 1e6:.1f} MB")
+    print(f"Summary: {stats['winning_trades']} winners, win rate {stats['win_rate']:.1f}%, total P/L ${stats['total_pl']:,.2f}")
@@ -0,0 +1,69 @@
+import os
+import json
+import hashlib
+import logging
+from datetime import date
+from typing import Any, Dict, Optional
+
+from goldflipper.utils.atomic_io import atomic_write_json
+
+# Marker stored for requests the provider answered with "no data"
+NO_DATA = {'_no_data': True}
+
+
+class HistoricalQuoteCache:
+    """
+    Content-addressed on-disk cache for historical quotes.
+
+    Entries are keyed by a hash of (provider, kind, symbol, date) and stored
+    as small JSON files under a two-character fan-out directory. Quotes for
+    a past trading date never change, so entries never expire; quotes for
+    today or later are not cached since the session may still be open.
+    Confirmed "no data" answers are cached too so they are not re-requested.
+    """
+
+    def __init__(self, cache_dir: str, provider: str = 'marketdataapp'):
+        self.cache_dir = cache_dir
+        self.provider = provider
+
+    def _key(self, kind: str, symbol: str, quote_date: date) -> str:
+        raw = f"{self.provider}|{kind}|{symbol.upper()}|{quote_date.isoformat()}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    @staticmethod
+    def is_cacheable(quote_date: date) -> bool:
+        return quote_date < date.today()
+
+    def get(self, kind: str, symbol: str, quote_date: date) -> Optional[Dict[str, Any]]:
+        """
+        Returns:
+            The cached quote dict, NO_DATA for a cached miss, or None if not cached
+        """
+        path = self._path(self._key(kind, symbol, quote_date))
+        try:
+            with open(path, 'r') as f:
+                return json.load(f).get('data')
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable quote cache entry {path}: {str(e)}")
+            return None
+
+    def put(self, kind: str, symbol: str, quote_date: date, data: Optional[Dict[str, Any]]) -> None:
+        """Store a quote (or NO_DATA when data is None) if the date is final"""
+        if not self.is_cacheable(quote_date):
+            return
+        payload = {
+            'provider': self.provider,
+            'kind': kind,
+            'symbol': symbol.upper(),
+            'date': quote_date.isoformat(),
+            'data': data if data is not None else NO_DATA
+        }
+        try:
+            atomic_write_json(self._path(self._key(kind, symbol, quote_date)), payload, indent=None)
+        except Exception as e:
+            logging.warning(f"Failed to write quote cache entry for {symbol} on {quote_date}: {str(e)}")
@@ -0,0 +1,224 @@
+import os
+import sqlite3
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import pandas as pd
+
+# Trade log columns and the dtypes the exports expect
+TRADE_LOG_COLUMNS = {
+    'play_name': 'object',
+    'symbol': 'object',
+    'trade_type': 'object',
+    'strike_price': 'float64',
+    'expiration_date': 'object',
+    'contracts': 'int64',
+    'date_atOpen': 'object',
+    'time_atOpen': 'object',
+    'date_atClose': 'object',
+    'time_atClose': 'object',
+    'price_atOpen': 'float64',
+    'price_atClose': 'float64',
+    'premium_atOpen': 'float64',
+    'premium_atClose': 'float64',
+    'delta_atOpen': 'float64',
+    'theta_atOpen': 'float64',
+    'close_type': 'object',
+    'close_condition': 'object',
+    'profit_loss_pct': 'float64',
+    'profit_loss': 'float64',
+    'status': 'object'
+}
+
+_SQL_TYPES = {'object': 'TEXT', 'float64': 'REAL', 'int64': 'INTEGER'}
+
+
+class TradeLogStore:
+    """
+    SQLite-backed trade log keyed by play id.
+
+    Each play occupies exactly one row, so logging a play is a single upsert
+    instead of a read/rewrite of the whole log, and re-logging a play (e.g.
+    after it moves from open to closed) replaces its previous row. Row order
+    follows first insertion, matching the order plays were originally logged.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.columns = list(TRADE_LOG_COLUMNS.keys())
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._create_table()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _create_table(self):
+        column_defs = ', '.join(f'"{name}" {_SQL_TYPES[dtype]}' for name, dtype in TRADE_LOG_COLUMNS.items())
+        with self._connect() as conn:
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS trade_log ('
+                f'seq INTEGER PRIMARY KEY AUTOINCREMENT, '
+                f'play_id TEXT NOT NULL UNIQUE, {column_defs})'
+            )
+            # Import ledger: what each play file looked like when it was last imported
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS import_ledger ('
+                'play_id TEXT PRIMARY KEY, file_path TEXT, status TEXT, '
+                'mtime_ns INTEGER, size INTEGER, file_hash TEXT, '
+                'valid INTEGER, backfilled INTEGER)'
+            )
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+
+    def _upsert_sql(self) -> str:
+        names = ['play_id'] + self.columns
+        quoted = ', '.join(f'"{n}"' for n in names)
+        placeholders = ', '.join('?' for _ in names)
+        updates = ', '.join(f'"{n}" = excluded."{n}"' for n in self.columns)
+        return (f'INSERT INTO trade_log ({quoted}) VALUES ({placeholders}) '
+                f'ON CONFLICT(play_id) DO UPDATE SET {updates}')
+
+    def _row_values(self, play_id: str, entry: Dict[str, Any]) -> tuple:
+        return (play_id,) + tuple(entry.get(column) for column in self.columns)
+
+    def upsert(self, play_id: str, entry: Dict[str, Any]) -> None:
+        """Insert or replace the row for a single play"""
+        with self._connect() as conn:
+            conn.execute(self._upsert_sql(), self._row_values(play_id, entry))
+
+    def upsert_many(self, entries: Iterable[tuple]) -> int:
+        """
+        Bulk insert or replace rows in a single transaction.
+
+        Args:
+            entries: Iterable of (play_id, entry dict) pairs
+
+        Returns:
+            int: Number of rows written
+        """
+        rows = [self._row_values(play_id, entry) for play_id, entry in entries]
+        if rows:
+            with self._connect() as conn:
+                conn.executemany(self._upsert_sql(), rows)
+        return len(rows)
+
+    def delete(self, play_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute('DELETE FROM trade_log WHERE play_id = ?', (play_id,))
+
+    def reset(self) -> None:
+        """Remove all rows and forget previously imported files"""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM trade_log')
+            conn.execute('DELETE FROM import_ledger')
+            conn.execute("DELETE FROM meta WHERE key = 'import_scope'")
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM trade_log').fetchone()[0]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def load_ledger(self) -> Dict[str, Dict[str, Any]]:
+        """Ledger rows keyed by play id"""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute('SELECT * FROM import_ledger').fetchall()
+        return {row['play_id']: dict(row) for row in rows}
+
+    def apply_import(self, entries: List[tuple], ledger_rows: List[Dict[str, Any]],
+                     removed_ids: Iterable[str] = ()) -> None:
+        """
+        Write one incremental import atomically: upsert log rows, record the
+        ledger state of every processed file and drop plays whose files are gone.
+
+        Args:
+            entries: (play_id, entry dict) pairs to upsert into the log
+            ledger_rows: Ledger dicts for every file parsed during the import
+            removed_ids: Play ids to delete from both the log and the ledger
+        """
+        ledger_columns = ['play_id', 'file_path', 'status', 'mtime_ns', 'size',
+                          'file_hash', 'valid', 'backfilled']
+        removed = [(play_id,) for play_id in removed_ids]
+        with self._connect() as conn:
+            if removed:
+                conn.executemany('DELETE FROM trade_log WHERE play_id = ?', removed)
+                conn.executemany('DELETE FROM import_ledger WHERE play_id = ?', removed)
+            if entries:
+                conn.executemany(self._upsert_sql(),
+                                 [self._row_values(play_id, entry) for play_id, entry in entries])
+            if ledger_rows:
+                conn.executemany(
+                    f'INSERT OR REPLACE INTO import_ledger ({", ".join(ledger_columns)}) '
+                    f'VALUES ({", ".join("?" for _ in ledger_columns)})',
+                    [tuple(row.get(column) for column in ledger_columns) for row in ledger_rows]
+                )
+
+    def _normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Apply export dtypes; empty strings read back as missing, as they did from CSV"""
+        for column, dtype in TRADE_LOG_COLUMNS.items():
+            if dtype == 'object':
+                df[column] = df[column].astype('object').replace('', None)
+            elif dtype == 'int64':
+                df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0).astype('int64')
+            else:
+                df[column] = pd.to_numeric(df[column], errors='coerce').astype('float64')
+        return df
+
+    def read_dataframe(self) -> pd.DataFrame:
+        """Load the full trade log in insertion order"""
+        return next(self.iter_dataframes(chunksize=None), pd.DataFrame(columns=self.columns))
+
+    def iter_dataframes(self, chunksize: Optional[int] = 10000) -> Iterator[pd.DataFrame]:
+        """Yield the trade log in insertion order, `chunksize` rows at a time (all at once if None)"""
+        query = 'SELECT ' + ', '.join(f'"{c}"' for c in self.columns) + ' FROM trade_log ORDER BY seq'
+        with self._connect() as conn:
+            if chunksize is None:
+                yield self._normalize(pd.read_sql_query(query, conn))
+                return
+            for chunk in pd.read_sql_query(query, conn, chunksize=chunksize):
+                yield self._normalize(chunk)
+
+    def summary(self) -> Dict[str, float]:
+        """Aggregate trade counts and P/L in SQL without loading rows"""
+        with self._connect() as conn:
+            total, winning, total_pl = conn.execute(
+                'SELECT COUNT(*), '
+                'COALESCE(SUM(CASE WHEN profit_loss > 0 THEN 1 ELSE 0 END), 0), '
+                'COALESCE(SUM(profit_loss), 0.0) '
+                'FROM trade_log'
+            ).fetchone()
+        return {
+            'total_trades': int(total),
+            'winning_trades': int(winning),
+            'win_rate': float(winning / total * 100) if total > 0 else 0.0,
+            'total_pl': float(total_pl)
+        }
+
+    def import_csv(self, csv_path: str) -> int:
+        """Load rows from a legacy trade_log.csv, keyed by play_name"""
+        try:
+            df = pd.read_csv(csv_path)
+        except Exception as e:
+            logging.error(f"Error reading legacy trade log {csv_path}: {str(e)}")
+            return 0
+
+        df = df.astype(object).where(pd.notna(df), None)
+        entries = []
+        for record in df.to_dict('records'):
+            play_id = record.get('play_name')
+            if play_id:
+                entries.append((str(play_id), record))
+        return self.upsert_many(entries)
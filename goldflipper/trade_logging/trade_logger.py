@@ -3,8 +3,12 @@ import pandas as pd
 import os
 import json
 import shutil
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any
 import logging
+from .trade_log_store import TradeLogStore
+from .excel_export import write_trade_log_excel
 
 # Import the data backfill helper
 try:
@@ -14,6 +18,55 @@ except ImportError as e:
     logging.warning(f"Data backfill helper not available: {str(e)}")
     BACKFILL_AVAILABLE = False
 
+# Changed-file count above which play files are parsed in a process pool
+PARALLEL_PARSE_THRESHOLD = 200
+
+# import_scope of a store seeded from the legacy CSV; the first import keeps those rows
+LEGACY_CSV_SCOPE = 'legacy_csv'
+
+
+def _parse_play_file(file_path: str, status: str, full_validation: bool) -> Dict[str, Any]:
+    """
+    Read, hash and validate one play file (process pool worker).
+    
+    Returns a dict with the file's stat and content hash, the parsed play_data
+    (None if the file was unreadable or failed validation) and the reason.
+    """
+    result = {'file_path': file_path, 'status': status, 'play_data': None, 'reason': None,
+              'file_hash': None, 'mtime_ns': None, 'size': None}
+    try:
+        stat = os.stat(file_path)
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        result.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size,
+                      file_hash=hashlib.sha1(raw).hexdigest())
+        play_data = json.loads(raw)
+    except Exception as e:
+        result['reason'] = f"Error processing {file_path}: {str(e)}"
+        return result
+    
+    if full_validation:
+        validation_result = PlayLogger._validate_play_data(play_data, status)
+        if not validation_result['valid']:
+            result['reason'] = validation_result['reason']
+            return result
+    elif not (play_data.get('symbol') or '').strip():
+        # Minimal validation: symbol must exist and be non-empty
+        result['reason'] = "missing required 'symbol'"
+        return result
+    
+    result['play_data'] = play_data
+    return result
+
+
+def _parse_datetime(value):
+    """Parse a logged timestamp; ISO strings skip pandas' slower format inference"""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return pd.to_datetime(value)
+
+
 class PlayLogger:
     def __init__(self, base_directory=None, save_to_desktop=True, enable_backfill=True):
         if base_directory is None:
@@ -31,8 +84,17 @@ class PlayLogger:
         if not os.path.exists(self.log_directory):
             os.makedirs(self.log_directory)
         
-        # Current working log file
-        self.csv_path = os.path.join(self.log_directory, "trade_log.csv")
+        # Current working log (one row per play, upserted in place)
+        self.db_path = os.path.join(self.log_directory, "trade_log.db")
+        legacy_csv_path = os.path.join(self.log_directory, "trade_log.csv")
+        is_new_store = not os.path.exists(self.db_path)
+        self.store = TradeLogStore(self.db_path)
+        
+        # Carry over an existing CSV log the first time the store is created
+        if is_new_store and os.path.exists(legacy_csv_path):
+            migrated = self.store.import_csv(legacy_csv_path)
+            self.store.set_meta('import_scope', LEGACY_CSV_SCOPE)
+            logging.info(f"Migrated {migrated} rows from legacy trade log CSV")
         
         # Save to desktop option
         self.save_to_desktop = save_to_desktop
@@ -48,96 +110,148 @@ class PlayLogger:
             except Exception as e:
                 logging.warning(f"Failed to initialize backfill helper: {str(e)}")
                 self.enable_backfill = False
-            
-        # Initialize or load existing CSV
-        if not os.path.exists(self.csv_path):
-            self._create_empty_log()
-    
-    def _create_empty_log(self):
-        """Initialize empty CSV with columns and proper dtypes"""
-        # Define columns and their appropriate dtypes to prevent warnings
-        dtype_dict = {
-            'play_name': 'object',
-            'symbol': 'object', 
-            'trade_type': 'object',
-            'strike_price': 'float64',
-            'expiration_date': 'object',
-            'contracts': 'int64',
-            'date_atOpen': 'object',  # String dates
-            'time_atOpen': 'object',  # String times
-            'date_atClose': 'object',  # String dates
-            'time_atClose': 'object',  # String times
-            'price_atOpen': 'float64',
-            'price_atClose': 'float64', 
-            'premium_atOpen': 'float64',
-            'premium_atClose': 'float64',
-            'delta_atOpen': 'float64',
-            'theta_atOpen': 'float64',
-            'close_type': 'object',  # String values like 'SL', 'TP'
-            'close_condition': 'object',  # String values
-            'profit_loss_pct': 'float64',
-            'profit_loss': 'float64',
-            'status': 'object'  # String values like 'closed', 'expired'
-        }
-        
-        columns = list(dtype_dict.keys())
-        df = pd.DataFrame(columns=columns).astype(dtype_dict)
-        df.to_csv(self.csv_path, index=False)
     
     def reset_log(self):
-        """Reset the log file with correct columns"""
-        self._create_empty_log()
-        print("Log file has been reset with correct columns.")
+        """Remove all rows from the trade log"""
+        self.store.reset()
+        print("Trade log has been reset.")
     
-    def import_closed_plays(self):
-        """Import all plays from CLOSED and EXPIRED folders"""
-        # First reset the log to ensure clean state
-        self.reset_log()
+    def import_closed_plays(self, full_refresh: bool = False):
+        """Import all plays from CLOSED and EXPIRED folders
         
+        Only plays that are new or changed since the last import are parsed and
+        backfilled; pass full_refresh=True to rebuild the log from scratch.
+        """
         print(f"Looking for plays in: {self.base_directory}")
+        return self._import_plays(['closed', 'expired'], scope='closed', full_refresh=full_refresh)
+    
+    def import_all_plays(self, full_refresh: bool = False):
+        """Import plays from ALL subfolders (except 'old'), with minimal validation.
+        Only requires the 'symbol' field to be present. Other fields are optional.
+        Unchanged plays are skipped unless full_refresh=True.
+        """
+        print(f"Scanning all play folders in: {self.base_directory}")
+
+        if not os.path.exists(self.base_directory):
+            print(f"Base plays directory does not exist: {self.base_directory}")
+            return 0
+
+        try:
+            subfolders = [
+                name for name in os.listdir(self.base_directory)
+                if os.path.isdir(os.path.join(self.base_directory, name)) and name.lower() != 'old'
+            ]
+        except Exception as e:
+            print(f"Error reading subfolders: {str(e)}")
+            return 0
+
+        return self._import_plays(subfolders, scope='all', full_refresh=full_refresh)
+    
+    def _import_plays(self, statuses: List[str], scope: str, full_refresh: bool = False) -> int:
+        """
+        Incrementally sync the trade log with the play files in the given folders.
         
-        # Collect all valid play data first
-        all_plays_data = []
-        skipped_count = 0
+        Every imported file is recorded in the store's ledger with its size,
+        mtime and content hash. Files whose stat matches the ledger are skipped
+        without being read; files that changed are parsed (in a process pool
+        for large batches), backfilled and upserted; plays whose files are
+        gone are removed. Switching scope or full_refresh rebuilds the log;
+        rows migrated from the legacy CSV are kept and updated by the first import.
         
-        for status in ['closed', 'expired']:
+        Returns:
+            int: Number of plays written to the log in this import
+        """
+        current_scope = self.store.get_meta('import_scope')
+        if full_refresh or current_scope not in (scope, LEGACY_CSV_SCOPE):
+            self.reset_log()
+        if full_refresh or current_scope != scope:
+            self.store.set_meta('import_scope', scope)
+        
+        ledger = self.store.load_ledger()
+        needs_backfill = bool(self.enable_backfill and self.backfill_helper)
+        
+        # Find files that are new or changed since the last import
+        found_ids = set()
+        to_parse = []
+        unchanged_count = 0
+        for status in statuses:
             folder_path = os.path.join(self.base_directory, status)
             print(f"Checking folder: {folder_path}")
             
             if not os.path.exists(folder_path):
                 print(f"Folder does not exist: {folder_path}")
                 continue
-                
-            for filename in os.listdir(folder_path):
-                if filename.endswith('.json'):
-                    file_path = os.path.join(folder_path, filename)
-                    print(f"Processing file: {file_path}")
-                    try:
-                        with open(file_path, 'r') as f:
-                            play_data = json.load(f)
-                        
-                        # Validate the play data with enhanced validation
-                        validation_result = self._validate_play_data(play_data, status)
-                        if validation_result['valid']:
-                            # Add status and file path for reference
-                            play_data['_status'] = status
-                            play_data['_file_path'] = file_path
-                            all_plays_data.append(play_data)
-                        else:
-                            print(f"⚠ Skipped {filename}: {validation_result['reason']}")
-                            skipped_count += 1
-                            
-                    except Exception as e:
-                        print(f"✗ Error processing {file_path}: {str(e)}")
-                        skipped_count += 1
+            
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.json') or not entry.is_file():
+                        continue
+                    play_id = os.path.splitext(entry.name)[0]
+                    found_ids.add(play_id)
+                    stat = entry.stat()
+                    known = ledger.get(play_id)
+                    if (known and known['file_path'] == entry.path
+                            and known['mtime_ns'] == stat.st_mtime_ns and known['size'] == stat.st_size
+                            and (known['backfilled'] or not needs_backfill or not known['valid'])):
+                        unchanged_count += 1
+                        continue
+                    to_parse.append((entry.path, status, scope == 'closed'))
         
-        print(f"Collected {len(all_plays_data)} valid plays for processing")
+        removed_ids = [play_id for play_id in ledger if play_id not in found_ids]
+        
+        # Parse and validate changed files
+        all_plays_data = []
+        ledger_rows = []
+        processed_rows = []
+        skipped_count = 0
+        invalid_ids = []
+        for result in self._parse_play_files(to_parse):
+            play_id = os.path.splitext(os.path.basename(result['file_path']))[0]
+            known = ledger.get(play_id)
+            ledger_row = {
+                'play_id': play_id,
+                'file_path': result['file_path'],
+                'status': result['status'],
+                'mtime_ns': result['mtime_ns'],
+                'size': result['size'],
+                'file_hash': result['file_hash'],
+                'valid': 1 if result['play_data'] is not None else 0,
+                'backfilled': 0
+            }
+            
+            if result['play_data'] is None:
+                print(f"⚠ Skipped {os.path.basename(result['file_path'])}: {result['reason']}")
+                skipped_count += 1
+                invalid_ids.append(play_id)
+                ledger_rows.append(ledger_row)
+                continue
+            
+            # Touched but identical content: only refresh the recorded stat
+            if (known and known['file_hash'] == result['file_hash'] and known['file_path'] == result['file_path']
+                    and known['valid'] and (known['backfilled'] or not needs_backfill)):
+                ledger_row['backfilled'] = known['backfilled']
+                ledger_rows.append(ledger_row)
+                unchanged_count += 1
+                continue
+            
+            play_data = result['play_data']
+            play_data['_status'] = result['status']
+            play_data['_file_path'] = result['file_path']
+            all_plays_data.append(play_data)
+            ledger_rows.append(ledger_row)
+            processed_rows.append(ledger_row)
+        
+        print(f"Collected {len(all_plays_data)} new or changed plays for processing "
+              f"({unchanged_count} unchanged)")
         
         # Apply data backfill if enabled
-        if self.enable_backfill and self.backfill_helper and all_plays_data:
+        if needs_backfill and all_plays_data:
             print(f"🔄 Starting data backfill process...")
             try:
                 all_plays_data = self.backfill_helper.backfill_multiple_plays(all_plays_data)
+                # Plays whose lookup failed stay unmarked and are retried on the next import
+                for ledger_row, complete in zip(processed_rows, self.backfill_helper.last_results):
+                    ledger_row['backfilled'] = 1 if complete else 0
                 print(f"✅ Data backfill completed")
             except Exception as e:
                 print(f"⚠ Data backfill failed: {str(e)}")
@@ -145,121 +259,63 @@ class PlayLogger:
         elif not self.enable_backfill:
             print(f"ℹ Data backfill disabled")
         
-        # Now log all the plays (with backfilled data if available)
-        imported_count = 0
-        for play_data in all_plays_data:
-            status = play_data.pop('_status')
-            file_path = play_data.pop('_file_path')
-            filename = os.path.basename(file_path)
-            
-            try:
-                self.log_play(play_data, status, source_filename=filename)
-                imported_count += 1
-                # Only show success message every 5 files to reduce spam
-                if imported_count % 5 == 0 or imported_count <= 5:
-                    print(f"✓ Successfully logged: {filename}")
-            except Exception as log_error:
-                print(f"✗ Error logging {filename}: {str(log_error)}")
-                import traceback
-                traceback.print_exc()
+        # Log all the plays (with backfilled data if available) in one transaction.
+        # Invalid files lose their log row but stay in the ledger until they change.
+        entries = self._build_entries(all_plays_data)
+        self.store.apply_import(entries, ledger_rows, removed_ids=removed_ids + invalid_ids)
         
+        imported_count = len(entries)
         print(f"Total plays imported: {imported_count}")
+        if removed_ids:
+            print(f"Total plays removed: {len(removed_ids)}")
         if skipped_count > 0:
             print(f"Total plays skipped: {skipped_count}")
         
         return imported_count
     
-    def import_all_plays(self):
-        """Import plays from ALL subfolders (except 'old'), with minimal validation.
-        Only requires the 'symbol' field to be present. Other fields are optional.
-        """
-        # Reset the log first
-        self.reset_log()
-
-        print(f"Scanning all play folders in: {self.base_directory}")
-
-        if not os.path.exists(self.base_directory):
-            print(f"Base plays directory does not exist: {self.base_directory}")
-            return 0
-
-        all_plays_data = []
-        skipped_count = 0
-
+    def _parse_play_files(self, files: List[tuple]) -> List[Dict[str, Any]]:
+        """Read, hash and validate play files, using a process pool for large batches"""
+        if len(files) < PARALLEL_PARSE_THRESHOLD:
+            return [_parse_play_file(*args) for args in files]
+        
         try:
-            subfolders = [
-                name for name in os.listdir(self.base_directory)
-                if os.path.isdir(os.path.join(self.base_directory, name)) and name.lower() != 'old'
-            ]
+            with ProcessPoolExecutor() as executor:
+                return list(executor.map(_parse_play_file, *zip(*files), chunksize=64))
         except Exception as e:
-            print(f"Error reading subfolders: {str(e)}")
-            return 0
-
-        # Process each subfolder as a status bucket
-        for status in subfolders:
-            folder_path = os.path.join(self.base_directory, status)
-            print(f"Checking folder: {folder_path}")
-
-            for filename in os.listdir(folder_path):
-                if not filename.endswith('.json'):
-                    continue
-
-                file_path = os.path.join(folder_path, filename)
-                try:
-                    with open(file_path, 'r') as f:
-                        play_data = json.load(f)
-
-                    # Minimal validation: symbol must exist and be non-empty
-                    symbol = (play_data.get('symbol') or '').strip()
-                    if not symbol:
-                        print(f"⚠ Skipped {filename}: missing required 'symbol'")
-                        skipped_count += 1
-                        continue
-
-                    play_data['_status'] = status
-                    play_data['_file_path'] = file_path
-                    all_plays_data.append(play_data)
-                except Exception as e:
-                    print(f"✗ Error processing {file_path}: {str(e)}")
-                    skipped_count += 1
-
-        print(f"Collected {len(all_plays_data)} plays for processing (minimal validation)")
-
-        # Apply data backfill if enabled and available
-        if self.enable_backfill and self.backfill_helper and all_plays_data:
-            print("🔄 Starting data backfill process...")
-            try:
-                all_plays_data = self.backfill_helper.backfill_multiple_plays(all_plays_data)
-                print("✅ Data backfill completed")
-            except Exception as e:
-                print(f"⚠ Data backfill failed: {str(e)}")
-                logging.error(f"Backfill error: {str(e)}")
-        elif not self.enable_backfill:
-            print("ℹ Data backfill disabled")
-
-        imported_count = 0
+            logging.warning(f"Parallel play parsing failed, falling back to serial: {str(e)}")
+            return [_parse_play_file(*args) for args in files]
+    
+    def log_play(self, play_data: Dict[str, Any], status: str, source_filename: str = None):
+        """Log a single play, replacing any earlier row for the same play."""
+        play_id, play_entry = self._build_log_entry(play_data, status, source_filename)
+        self.store.upsert(play_id, play_entry)
+    
+    def _build_entries(self, all_plays_data: List[Dict[str, Any]]) -> List[tuple]:
+        """Build (play_id, row) pairs for collected plays"""
+        entries = []
         for play_data in all_plays_data:
             status = play_data.pop('_status')
             file_path = play_data.pop('_file_path')
             filename = os.path.basename(file_path)
+            
             try:
-                self.log_play(play_data, status, source_filename=filename)
-                imported_count += 1
-                if imported_count % 5 == 0 or imported_count <= 5:
+                entries.append(self._build_log_entry(play_data, status, source_filename=filename))
+                # Only show success message every 5 files to reduce spam
+                if len(entries) % 5 == 0 or len(entries) <= 5:
                     print(f"✓ Successfully logged: {filename}")
             except Exception as log_error:
                 print(f"✗ Error logging {filename}: {str(log_error)}")
                 import traceback
                 traceback.print_exc()
-
-        print(f"Total plays imported: {imported_count}")
-        if skipped_count > 0:
-            print(f"Total plays skipped: {skipped_count}")
-
-        return imported_count
+        
+        return entries
     
-    def log_play(self, play_data: Dict[str, Any], status: str, source_filename: str = None):
-        """Log a single play to CSV with enhanced data extraction from multiple sources.
+    def _build_log_entry(self, play_data: Dict[str, Any], status: str, source_filename: str = None):
+        """Build a trade log row with enhanced data extraction from multiple sources.
         This method is resilient to missing fields; only 'symbol' is strictly required.
+        
+        Returns:
+            tuple: (play_id, row dict) where play_id is the play file stem
         """
         logging_data = play_data.get('logging', {})
         entry_point = play_data.get('entry_point', {})
@@ -315,7 +371,7 @@ class PlayLogger:
         
         if datetime_open:
             try:
-                dt_open = pd.to_datetime(datetime_open)
+                dt_open = _parse_datetime(datetime_open)
                 date_open = dt_open.strftime('%Y-%m-%d')
                 time_open = dt_open.strftime('%H:%M:%S')
             except:
@@ -323,7 +379,7 @@ class PlayLogger:
             
         if datetime_close:
             try:
-                dt_close = pd.to_datetime(datetime_close)
+                dt_close = _parse_datetime(datetime_close)
                 date_close = dt_close.strftime('%Y-%m-%d')
                 time_close = dt_close.strftime('%H:%M:%S')
             except:
@@ -366,76 +422,8 @@ class PlayLogger:
             'status': status
         }
         
-        # Read existing DataFrame with proper dtypes to prevent warnings
-        # Define the expected dtypes for consistent behavior
-        dtype_dict = {
-            'play_name': 'object',
-            'symbol': 'object', 
-            'trade_type': 'object',
-            'strike_price': 'float64',
-            'expiration_date': 'object',
-            'contracts': 'int64',
-            'date_atOpen': 'object',
-            'time_atOpen': 'object',
-            'date_atClose': 'object',
-            'time_atClose': 'object',
-            'price_atOpen': 'float64',
-            'price_atClose': 'float64',
-            'premium_atOpen': 'float64',
-            'premium_atClose': 'float64',
-            'delta_atOpen': 'float64',
-            'theta_atOpen': 'float64',
-            'close_type': 'object',
-            'close_condition': 'object',
-            'profit_loss_pct': 'float64',
-            'profit_loss': 'float64',
-            'status': 'object'
-        }
-        
-        try:
-            df = pd.read_csv(self.csv_path, dtype=dtype_dict)
-        except (ValueError, TypeError):
-            # Fallback: read without dtype specification if there are issues
-            df = pd.read_csv(self.csv_path)
-            # Convert string columns to object dtype to prevent warnings
-            string_columns = ['date_atOpen', 'time_atOpen', 'date_atClose', 'time_atClose', 
-                            'close_type', 'close_condition', 'status', 'play_name', 'symbol', 
-                            'trade_type', 'expiration_date']
-            for col in string_columns:
-                if col in df.columns:
-                    df[col] = df[col].astype('object')
-        
-        # Create new DataFrame entry
-        new_entry = pd.DataFrame([play_entry])
-        
-        # Handle DataFrame concatenation to avoid FutureWarning about empty/NA columns
-        # Following pandas best practices to prevent FutureWarning about all-NA columns
-        if df.empty:
-            # If the existing DataFrame is empty, just use the new entry
-            df = new_entry.copy()
-        else:
-            # Ensure column consistency and handle all-NA columns explicitly
-            # Add missing columns to new_entry with appropriate default values
-            for col in df.columns:
-                if col not in new_entry.columns:
-                    new_entry[col] = None
-            
-            # Add any new columns from new_entry to existing df
-            for col in new_entry.columns:
-                if col not in df.columns:
-                    df[col] = None
-            
-            # Ensure both DataFrames have columns in the same order
-            new_entry = new_entry[df.columns]
-            
-            # Use manual row appending to avoid FutureWarning
-            # Since we now create DataFrames with proper dtypes, this should work cleanly
-            new_row_index = len(df)
-            for col in df.columns:
-                df.loc[new_row_index, col] = new_entry.iloc[0][col]
-        
-        # Save to CSV
-        df.to_csv(self.csv_path, index=False)
+        play_id = os.path.splitext(source_filename)[0] if source_filename else play_entry['play_name']
+        return play_id, play_entry
     
     def _calculate_pl(self, play_data: Dict[str, Any]) -> float:
         """Calculate profit/loss in dollars using enhanced data extraction"""
@@ -473,7 +461,8 @@ class PlayLogger:
                 
         return 0.0
 
-    def _validate_play_data(self, play_data: Dict[str, Any], status: str) -> Dict[str, Any]:
+    @staticmethod
+    def _validate_play_data(play_data: Dict[str, Any], status: str) -> Dict[str, Any]:
         """Enhanced validation that accepts files with entry_point data as fallback"""
         required_fields = ['play_name', 'symbol', 'trade_type', 'strike_price', 'expiration_date', 'contracts']
         
@@ -552,7 +541,8 @@ class PlayLogger:
             'csv_file': None,
             'excel_file': None,
             'csv_desktop_file': None,
-            'excel_desktop_file': None
+            'excel_desktop_file': None,
+            'summary': None
         }
         
         # If format is 'both', export both formats
@@ -565,7 +555,8 @@ class PlayLogger:
                 'excel_file': excel_result['main_file'],
                 'csv_desktop_file': csv_result['desktop_file'],
                 'excel_desktop_file': excel_result['desktop_file'],
-                'main_file': excel_result['main_file']  # Default to Excel as main file
+                'main_file': excel_result['main_file'],  # Default to Excel as main file
+                'summary': excel_result['summary']
             })
             
             return result_paths
@@ -585,7 +576,8 @@ class PlayLogger:
             result_paths.update({
                 'excel_file': excel_result['main_file'],
                 'main_file': excel_result['main_file'],
-                'desktop_file': excel_result['desktop_file']
+                'desktop_file': excel_result['desktop_file'],
+                'summary': excel_result['summary']
             })
             
             return result_paths
@@ -600,434 +592,34 @@ class PlayLogger:
         # Main export file
         export_path = os.path.join(export_dir, "trade_log.csv")
         
-        # Read the current CSV and save to the new location
-        df = pd.read_csv(self.csv_path)
-        df.to_csv(export_path, index=False)
+        # Stream the current log to the new location
+        for i, chunk in enumerate(self.store.iter_dataframes()):
+            chunk.to_csv(export_path, index=False, mode='w' if i == 0 else 'a', header=(i == 0))
         
         # Save a copy to the desktop if requested
         if save_to_desktop:
             desktop_file = os.path.join(desktop_path, f"trade_log_{timestamp}.csv")
-            df.to_csv(desktop_file, index=False)
+            shutil.copy(export_path, desktop_file)
             result['desktop_file'] = desktop_file
             
         result['main_file'] = export_path
         return result
         
     def _export_excel(self, export_dir, timestamp, desktop_path, save_to_desktop):
-        """Helper method to export Excel format with formatting"""
+        """Helper method to export Excel format with formatting
+        
+        Rows are streamed from the store into the workbook chunk by chunk, and
+        summary statistics are gathered in the same pass.
+        """
         result = {
             'main_file': None,
-            'desktop_file': None
+            'desktop_file': None,
+            'summary': None
         }
         
         # Main export file
         export_path = os.path.join(export_dir, "trade_log.xlsx")
-        df = pd.read_csv(self.csv_path)
-        
-        # Ensure numeric columns are properly typed
-        numeric_columns = ['strike_price', 'price_atOpen', 'price_atClose', 
-                          'premium_atOpen', 'premium_atClose', 'delta_atOpen', 
-                          'theta_atOpen', 'profit_loss_pct', 'profit_loss']
-        
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Define friendly column names mapping
-        column_mapping = {
-            'play_name': 'Play Name',
-            'symbol': 'Symbol',
-            'trade_type': 'Trade',
-            'strike_price': 'Strike',
-            'expiration_date': 'Expiration',
-            'contracts': '#',
-            'date_atOpen': 'Open Date',
-            'time_atOpen': 'Open Time',
-            'date_atClose': 'Close Date',
-            'time_atClose': 'Close Time',
-            'price_atOpen': 'Open Price',
-            'price_atClose': 'Close Price',
-            'premium_atOpen': 'Open Prem.',
-            'premium_atClose': 'Close Prem.',
-            'delta_atOpen': 'Open Δ',
-            'theta_atOpen': 'Open Θ',
-            'close_type': 'Close',
-            'close_condition': 'Condition',
-            'profit_loss_pct': 'P/L %',
-            'profit_loss': 'P/L $',
-            'status': 'Status'
-        }
-        
-        # Rename columns
-        df = df.rename(columns=column_mapping)
-        
-        # Create Excel writer object with xlsxwriter engine
-        writer = pd.ExcelWriter(
-            export_path,
-            engine='xlsxwriter',
-            engine_kwargs={'options': {'nan_inf_to_errors': True}}
-        )
-        
-        with writer as writer:
-            df.to_excel(writer, index=False, sheet_name='Trade Log')
-            
-            # Get the xlsxwriter workbook and worksheet objects
-            workbook = writer.book
-            worksheet = writer.sheets['Trade Log']
-            
-            # Define border color and profit/loss colors
-            border_color = '#D3D3D3'  # Light gray
-            profit_color = '#E8F4EA'  # Light green
-            loss_color = '#FBE9E7'    # Light red
-            
-            # Money formats with alternating shades
-            money_format_even = workbook.add_format({
-                'num_format': '$#,##0.00',
-                'align': 'center',
-                'bg_color': '#F2F2F2',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            money_format_odd = workbook.add_format({
-                'num_format': '$#,##0.00',
-                'align': 'center',
-                'bg_color': 'white',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            # Strike price format (no cents)
-            strike_format_even = workbook.add_format({
-                'num_format': '$#,##0',
-                'align': 'center',
-                'bg_color': '#F2F2F2',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            strike_format_odd = workbook.add_format({
-                'num_format': '$#,##0',
-                'align': 'center',
-                'bg_color': 'white',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            # Profit/Loss formats with colors
-            profit_format_even = workbook.add_format({
-                'num_format': '+$#,##0.00;-$#,##0.00',
-                'align': 'center',
-                'bg_color': profit_color,
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            profit_format_odd = workbook.add_format({
-                'num_format': '+$#,##0.00;-$#,##0.00',
-                'align': 'center',
-                'bg_color': profit_color,
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            loss_format_even = workbook.add_format({
-                'num_format': '+$#,##0.00;-$#,##0.00',
-                'align': 'center',
-                'bg_color': loss_color,
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            loss_format_odd = workbook.add_format({
-                'num_format': '+$#,##0.00;-$#,##0.00',
-                'align': 'center',
-                'bg_color': loss_color,
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            # Add percentage formats with alternating shades
-            profit_pct_format_even = workbook.add_format({
-                'num_format': '0.00%',
-                'align': 'center',
-                'bg_color': profit_color,
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            profit_pct_format_odd = workbook.add_format({
-                'num_format': '0.00%',
-                'align': 'center',
-                'bg_color': profit_color,
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            loss_pct_format_even = workbook.add_format({
-                'num_format': '0.00%',
-                'align': 'center',
-                'bg_color': loss_color,
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            loss_pct_format_odd = workbook.add_format({
-                'num_format': '0.00%',
-                'align': 'center',
-                'bg_color': loss_color,
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            # Define border color
-            border_color = '#D3D3D3'  # Light gray
-            
-            # Define formats with borders
-            header_format_centered = workbook.add_format({
-                'bold': True,
-                'font_color': 'white',
-                'bg_color': '#2F75B5',
-                'align': 'center',
-                'valign': 'vcenter',
-                'border_color': border_color,
-                'border': 1
-            })
-
-            header_format_left = workbook.add_format({
-                'bold': True,
-                'font_color': 'white',
-                'bg_color': '#2F75B5',
-                'align': 'left',
-                'valign': 'vcenter',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            even_row_format = workbook.add_format({
-                'bg_color': '#F2F2F2',
-                'align': 'center',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            odd_row_format = workbook.add_format({
-                'bg_color': 'white',
-                'align': 'center',
-                'border_color': border_color,
-                'border': 1
-            })
-
-            even_row_format_left = workbook.add_format({
-                'bg_color': '#F2F2F2',
-                'align': 'left',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            odd_row_format_left = workbook.add_format({
-                'bg_color': 'white',
-                'align': 'left',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            date_format = workbook.add_format({
-                'num_format': 'yyyy-mm-dd',
-                'align': 'center',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            time_format = workbook.add_format({
-                'num_format': 'hh:mm:ss',
-                'align': 'center',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            # Add date and time formats with alternating shades
-            date_format_even = workbook.add_format({
-                'num_format': 'yyyy-mm-dd',
-                'align': 'center',
-                'bg_color': '#F2F2F2',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            date_format_odd = workbook.add_format({
-                'num_format': 'yyyy-mm-dd',
-                'align': 'center',
-                'bg_color': 'white',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            time_format_even = workbook.add_format({
-                'num_format': 'hh:mm:ss',
-                'align': 'center',
-                'bg_color': '#F2F2F2',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            time_format_odd = workbook.add_format({
-                'num_format': 'hh:mm:ss',
-                'align': 'center',
-                'bg_color': 'white',
-                'border_color': border_color,
-                'border': 1
-            })
-            
-            # Apply header format
-            for col_num, value in enumerate(df.columns.values):
-                if value == 'Play Name':
-                    worksheet.write(0, col_num, value, header_format_centered)
-                else:
-                    worksheet.write(0, col_num, value, header_format_left)
-            
-            # Apply content row formats (starting from row 1)
-            for row_num in range(len(df)):
-                for col_num, col in enumerate(df.columns):
-                    value = df.iloc[row_num, col_num]
-                    is_even_row = row_num % 2 == 0
-                    
-                    # Handle NaN/None values
-                    if pd.isna(value):
-                        value = ''
-                    
-                    if col == 'Play Name':
-                        row_format = even_row_format_left if is_even_row else odd_row_format_left
-                        worksheet.write(row_num + 1, col_num, value, row_format)
-                    elif 'Strike' in col:
-                        strike_format = strike_format_even if is_even_row else strike_format_odd
-                        if pd.isna(value) or value == '':
-                            worksheet.write_blank(row_num + 1, col_num, None, strike_format)
-                        else:
-                            try:
-                                value = float(value)
-                                worksheet.write_number(row_num + 1, col_num, value, strike_format)
-                            except (ValueError, TypeError):
-                                worksheet.write(row_num + 1, col_num, value, strike_format)
-                    elif 'Profit/Loss' in col:
-                        try:
-                            value = float(value) if not pd.isna(value) else 0.0
-                            if value == 0:
-                                # Write blank cell with even/odd background
-                                pl_format = money_format_even if is_even_row else money_format_odd
-                                worksheet.write_blank(row_num + 1, col_num, None, pl_format)
-                            else:
-                                # Use profit/loss format based on value
-                                if value > 0:
-                                    pl_format = profit_format_even if is_even_row else profit_format_odd
-                                else:
-                                    pl_format = loss_format_even if is_even_row else loss_format_odd
-                                worksheet.write_number(row_num + 1, col_num, value, pl_format)
-                        except (ValueError, TypeError):
-                            worksheet.write(row_num + 1, col_num, value, money_format_even if is_even_row else money_format_odd)
-                    elif any(term in col for term in ['Price', 'Premium', 'Prem.']):
-                        money_format = money_format_even if is_even_row else money_format_odd
-                        if pd.isna(value) or value == '':
-                            worksheet.write_blank(row_num + 1, col_num, None, money_format)
-                        else:
-                            try:
-                                value = float(value)
-                                worksheet.write_number(row_num + 1, col_num, value, money_format)
-                            except (ValueError, TypeError):
-                                worksheet.write(row_num + 1, col_num, value, money_format)
-                    elif 'Date' in col:
-                        date_format = date_format_even if is_even_row else date_format_odd
-                        if pd.isna(value) or value == '':
-                            worksheet.write_blank(row_num + 1, col_num, None, date_format)
-                        else:
-                            worksheet.write(row_num + 1, col_num, value, date_format)
-                    elif 'Time' in col:
-                        time_format = time_format_even if is_even_row else time_format_odd
-                        if pd.isna(value) or value == '':
-                            worksheet.write_blank(row_num + 1, col_num, None, time_format)
-                        else:
-                            worksheet.write(row_num + 1, col_num, value, time_format)
-                    elif 'P/L %' in col:
-                        try:
-                            value = float(value) if not pd.isna(value) else 0.0
-                            if value == 0:
-                                # Write blank cell with even/odd background
-                                pl_format = money_format_even if is_even_row else money_format_odd
-                                worksheet.write_blank(row_num + 1, col_num, None, pl_format)
-                            else:
-                                # Use profit/loss format based on value
-                                if value > 0:
-                                    pl_format = profit_pct_format_even if is_even_row else profit_pct_format_odd
-                                else:
-                                    pl_format = loss_pct_format_even if is_even_row else loss_pct_format_odd
-                                worksheet.write_number(row_num + 1, col_num, value/100, pl_format)
-                        except (ValueError, TypeError):
-                            worksheet.write(row_num + 1, col_num, value, money_format_even if is_even_row else money_format_odd)
-                    elif 'P/L $' in col:
-                        try:
-                            value = float(value) if not pd.isna(value) else 0.0
-                            if value == 0:
-                                # Write blank cell with even/odd background
-                                pl_format = money_format_even if is_even_row else money_format_odd
-                                worksheet.write_blank(row_num + 1, col_num, None, pl_format)
-                            else:
-                                # Use profit/loss format based on value
-                                if value > 0:
-                                    pl_format = profit_format_even if is_even_row else profit_format_odd
-                                else:
-                                    pl_format = loss_format_even if is_even_row else loss_format_odd
-                                worksheet.write_number(row_num + 1, col_num, value, pl_format)
-                        except (ValueError, TypeError):
-                            worksheet.write(row_num + 1, col_num, value, money_format_even if is_even_row else money_format_odd)
-                    else:
-                        row_format = even_row_format if is_even_row else odd_row_format
-                        worksheet.write(row_num + 1, col_num, value, row_format)
-            
-            # Define column width overrides (in characters)
-            column_width_overrides = {
-                'Symbol': 9,
-                'Trade': 7.5,
-                'Strike': 7.5,
-                'Expiration': 11.5,
-                '#': 3.5,
-                'Open Date': 12,
-                'Open Time': 12,
-                'Close Date': 12,
-                'Close Time': 12,
-                'Open Price': 12.25,
-                'Close Price': 12.25,
-                'Open Prem.': 13,
-                'Close Prem.': 13,
-                'Open Δ': 10,
-                'Open Θ': 10,
-                'Status': 10,
-                'Close': 7.5,
-                'Condition': 12,
-                'P/L %': 10,
-                'P/L $': 12,
-                'Status': 8
-            }
-            
-            # Set column widths without setting column formats
-            for i, col in enumerate(df.columns):
-                # Check if column has a width override
-                if col in column_width_overrides:
-                    width = column_width_overrides[col]
-                else:
-                    # Get maximum length of column content
-                    max_length = max(
-                        df[col].astype(str).apply(len).max(),
-                        len(str(col))
-                    ) + 2
-                    width = min(max_length, 40)
-                
-                worksheet.set_column(i, i, width)
-            
-            # Freeze the header row
-            worksheet.freeze_panes(1, 0)
-            
-            # Add autofilter
-            worksheet.autofilter(0, 0, len(df), len(df.columns) - 1)
+        result['summary'] = write_trade_log_excel(export_path, self.store.iter_dataframes(), self.store.columns)
         
         # Save a copy to the desktop if requested
         if save_to_desktop:
@@ -1041,13 +633,12 @@ class PlayLogger:
     def _create_summary_stats(self) -> pd.DataFrame:
         """Create summary statistics from the trade log"""
         try:
-            df = pd.read_csv(self.csv_path)
-            
-            # Calculate basic statistics
-            total_trades = int(len(df))
-            winning_trades = int(len(df[df['profit_loss'] > 0]))
-            win_rate = float(winning_trades / total_trades * 100) if total_trades > 0 else 0.0
-            total_pl = float(df['profit_loss'].sum())
+            # Aggregated in SQL, so the log is never loaded just for the stats
+            stats = self.store.summary()
+            total_trades = stats['total_trades']
+            winning_trades = stats['winning_trades']
+            win_rate = stats['win_rate']
+            total_pl = stats['total_pl']
             
             # Return as a DataFrame with explicit types
             stats_df = pd.DataFrame({
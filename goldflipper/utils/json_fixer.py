@@ -8,26 +8,28 @@ from goldflipper.utils.logging_setup import configure_logging
 class PlayFileFixer:
     """Utility for detecting and repairing corrupted play JSON files."""
     
-    def __init__(self):
+    def __init__(self, plays_root=None, file_filter=None):
         self.logger = logging.getLogger(__name__)
         # Play directories to check
         self.play_dirs = [
-            'plays/new',
-            'plays/open',
-            'plays/pending-opening',
-            'plays/pending-closing',
-            'plays/closed',
-            'plays/expired',
-            'plays/temp'
+            'new',
+            'open',
+            'pending-opening',
+            'pending-closing',
+            'closed',
+            'expired',
+            'temp'
         ]
-        self.base_dir = Path(__file__).parent.parent
+        self.plays_root = Path(plays_root) if plays_root else Path(__file__).parent.parent / 'plays'
+        # Optional predicate on a play file path; only matching files are checked (e.g. one shard's plays)
+        self.file_filter = file_filter
         self.fix_count = 0
         self.reference_templates = {}
     
     def _load_reference_templates(self):
         """Load reference templates from closed plays to use for structure validation only."""
         self.reference_templates = {}
-        closed_dir = self.base_dir / 'plays/closed'
+        closed_dir = self.plays_root / 'closed'
         
         if not closed_dir.exists():
             self.logger.warning("Closed plays directory does not exist, cannot load templates")
@@ -59,11 +61,11 @@ class PlayFileFixer:
         """Get all play JSON files from all play directories."""
         all_play_files = []
         for dir_path in self.play_dirs:
-            full_dir_path = self.base_dir / dir_path
+            full_dir_path = self.plays_root / dir_path
             if full_dir_path.exists():
                 all_play_files.extend([
                     f for f in full_dir_path.glob('*.json')
-                    if f.is_file()
+                    if f.is_file() and (self.file_filter is None or self.file_filter(str(f)))
                 ])
         return all_play_files
     
@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+from zoneinfo import ZoneInfo
+from goldflipper.utils.atomic_io import atomic_write_json
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'state', 'nyse_sessions.json')
+
+MARKET_TZ = ZoneInfo('America/New_York')
+
+# Regular NYSE close; sessions closing earlier are early-close days
+REGULAR_CLOSE = time(16, 0)
+
+
+class SessionTable:
+    """
+    NYSE sessions for a range of years as sorted arrays.
+
+    Built once from pandas_market_calendars (or loaded from the disk cache)
+    so holiday, early-close, next-open and time-to-close queries are bisects
+    over plain integers rather than a DataFrame per call.
+    """
+
+    def __init__(self, days: List[int], opens: List[int], closes: List[int], start: date, end: date):
+        self.days = days        # date.toordinal() of each session
+        self.opens = opens      # open, epoch seconds
+        self.closes = closes    # close, epoch seconds
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def build(cls, start: date, end: date) -> 'SessionTable':
+        import pandas_market_calendars as mcal
+        schedule = mcal.get_calendar('NYSE').schedule(start_date=start, end_date=end)
+        return cls(
+            days=[day.toordinal() for day in schedule.index.date],
+            opens=[int(ts.timestamp()) for ts in schedule['market_open']],
+            closes=[int(ts.timestamp()) for ts in schedule['market_close']],
+            start=start,
+            end=end
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SessionTable':
+        return cls(data['days'], data['opens'], data['closes'],
+                   date.fromisoformat(data['start']), date.fromisoformat(data['end']))
+
+    def to_dict(self) -> dict:
+        return {
+            'start': self.start.isoformat(),
+            'end': self.end.isoformat(),
+            'days': self.days,
+            'opens': self.opens,
+            'closes': self.closes
+        }
+
+    def covers(self, day: date) -> bool:
+        return self.start <= day <= self.end
+
+    def _index(self, day: date) -> Optional[int]:
+        ordinal = day.toordinal()
+        i = bisect_left(self.days, ordinal)
+        return i if i < len(self.days) and self.days[i] == ordinal else None
+
+    def is_session(self, day: date) -> bool:
+        return self._index(day) is not None
+
+    def is_holiday(self, day: date) -> bool:
+        """Weekday without a session"""
+        return day.weekday() < 5 and not self.is_session(day)
+
+    def close_time(self, day: date) -> Optional[datetime]:
+        """Session close (UTC) for a day, or None if the market is closed all day"""
+        i = self._index(day)
+        return datetime.fromtimestamp(self.closes[i], timezone.utc) if i is not None else None
+
+    def is_early_close(self, day: date) -> bool:
+        close = self.close_time(day)
+        return close is not None and close.astimezone(MARKET_TZ).time() < REGULAR_CLOSE
+
+    def next_open(self, at: datetime) -> Optional[datetime]:
+        """Next session open strictly after `at` (UTC), or None past the table's end"""
+        i = bisect_right(self.opens, int(at.timestamp()))
+        return datetime.fromtimestamp(self.opens[i], timezone.utc) if i < len(self.opens) else None
+
+    def seconds_until_close(self, at: datetime) -> Optional[float]:
+        """Seconds until the current session closes, or None outside a session"""
+        ts = at.timestamp()
+        i = bisect_right(self.opens, ts) - 1
+        if i >= 0 and ts < self.closes[i]:
+            return self.closes[i] - ts
+        return None
+
+
+_session_table: Optional[SessionTable] = None
+_session_table_lock = threading.Lock()
+
+
+def get_session_table(cache_file: Optional[str] = DEFAULT_CACHE_FILE, years_back: int = 1,
+                      years_ahead: int = 3) -> SessionTable:
+    """
+    Shared NYSE session table covering today.
+
+    Loaded from the disk cache when it covers today, otherwise rebuilt for
+    years_back .. years_ahead around today and saved.
+    """
+    global _session_table
+    today = date.today()
+    with _session_table_lock:
+        if _session_table is not None and _session_table.covers(today):
+            return _session_table
+
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r') as f:
+                    table = SessionTable.from_dict(json.load(f))
+                if table.covers(today) and table.covers(today + timedelta(days=7)):
+                    _session_table = table
+                    return table
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable session cache {cache_file}: {str(e)}")
+
+        start = date(today.year - years_back, 1, 1)
+        end = date(today.year + years_ahead, 12, 31)
+        table = SessionTable.build(start, end)
+        logging.info(f"Built NYSE session table: {len(table.days)} sessions {start} to {end}")
+        if cache_file:
+            try:
+                atomic_write_json(cache_file, table.to_dict(), indent=None)
+            except Exception as e:
+                logging.warning(f"Could not save session cache: {str(e)}")
+        _session_table = table
+        return table
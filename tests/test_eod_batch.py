@@ -0,0 +1,189 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+from goldflipper.orchestration import eod_batch
+from goldflipper.orchestration.eod_batch import EodBatch, eod_holds_play, run_eod_batch_if_due
+
+
+class FakeTradingClient:
+    """Trading client with a fixed set of orders; open ones are returned by get_orders"""
+
+    def __init__(self, orders, fail_cancels=()):
+        self.orders = {order.id: order for order in orders}
+        self.fail_cancels = set(fail_cancels)
+        self.cancelled = []
+        self.cancel_all_calls = 0
+
+    def get_orders(self, filter=None):
+        return [order for order in self.orders.values() if order.status in ('new', 'accepted', 'partially_filled')]
+
+    def get_order_by_id(self, order_id):
+        if order_id not in self.orders:
+            raise LookupError(f"order {order_id} not found")
+        return self.orders[order_id]
+
+    def cancel_order_by_id(self, order_id):
+        if order_id in self.fail_cancels:
+            raise ConnectionError("cancel failed")
+        self.cancelled.append(order_id)
+
+    def cancel_orders(self):
+        self.cancel_all_calls += 1
+        self.cancelled.extend(order_id for order_id, order in self.orders.items()
+                              if order.status in ('new', 'accepted', 'partially_filled'))
+        return []
+
+
+def order(order_id, status):
+    return SimpleNamespace(id=order_id, status=status, client_order_id=None)
+
+
+class EodBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.plays_dir = tempfile.mkdtemp()
+        for folder in ('new', 'pending-opening', 'open', 'pending-closing'):
+            os.makedirs(os.path.join(self.plays_dir, folder))
+
+    def tearDown(self):
+        shutil.rmtree(self.plays_dir)
+
+    def add_play(self, folder, name, order_id=None):
+        id_field = 'order_id' if folder == 'pending-opening' else 'closing_order_id'
+        play = {'symbol': 'SPY', 'expiration_date': '12/18/2026', 'trade_type': 'CALL', 'strike_price': '600',
+                'status': {'play_status': folder.upper(), id_field: order_id}}
+        path = os.path.join(self.plays_dir, folder, name)
+        with open(path, 'w') as f:
+            json.dump(play, f)
+        return path
+
+    def folder_of(self, name):
+        return [folder for folder in os.listdir(self.plays_dir)
+                if os.path.exists(os.path.join(self.plays_dir, folder, name))]
+
+    def test_plan_by_order_status(self):
+        self.add_play('pending-opening', 'working.json', 'o-working')
+        self.add_play('pending-opening', 'canceled.json', 'o-canceled')
+        self.add_play('pending-opening', 'filled.json', 'o-filled')
+        self.add_play('pending-opening', 'partial.json', 'o-partial')
+        self.add_play('pending-opening', 'unknown.json', 'o-missing')
+        self.add_play('pending-opening', 'no_order.json')
+        self.add_play('pending-closing', 'closing.json', 'o-closing')
+        client = FakeTradingClient([order('o-working', 'new'), order('o-canceled', 'canceled'),
+                                    order('o-filled', 'filled'), order('o-partial', 'partially_filled'),
+                                    order('o-closing', 'accepted')])
+
+        plan = EodBatch(self.plays_dir, client=client).plan()
+
+        moved = {os.path.basename(source): os.path.basename(os.path.dirname(target)) for source, target, _ in plan.moves}
+        self.assertEqual(moved, {'working.json': 'new', 'canceled.json': 'new', 'no_order.json': 'new',
+                                 'closing.json': 'open'})
+        self.assertEqual(set(plan.cancels), {'o-working', 'o-partial', 'o-closing'})
+        self.assertEqual({os.path.basename(p) for p in plan.left_pending},
+                         {'filled.json', 'partial.json', 'unknown.json'})
+        for _, _, play in plan.moves:
+            self.assertIn(play['status']['play_status'], ('NEW', 'OPEN'))
+
+    def test_cancel_all_only_when_every_open_order_is_ours(self):
+        self.add_play('pending-opening', 'a.json', 'o-a')
+        client = FakeTradingClient([order('o-a', 'new')])
+        self.assertTrue(EodBatch(self.plays_dir, client=client).plan().cancel_all)
+        self.assertFalse(EodBatch(self.plays_dir, client=client, allow_cancel_all=False).plan().cancel_all)
+
+        client = FakeTradingClient([order('o-a', 'new'), order('o-other', 'new')])
+        self.assertFalse(EodBatch(self.plays_dir, client=client).plan().cancel_all)
+
+    def test_run_moves_plays_and_keeps_failed_cancels_pending(self):
+        self.add_play('pending-opening', 'ok.json', 'o-ok')
+        self.add_play('pending-closing', 'stuck.json', 'o-stuck')
+        client = FakeTradingClient([order('o-ok', 'new'), order('o-stuck', 'new')], fail_cancels={'o-stuck'})
+
+        batch = EodBatch(self.plays_dir, client=client, allow_cancel_all=False)
+        stats = batch.run()
+
+        self.assertEqual(client.cancelled, ['o-ok'])
+        self.assertEqual(stats['moved'], 1)
+        self.assertEqual(self.folder_of('ok.json'), ['new'])
+        self.assertEqual(self.folder_of('stuck.json'), ['pending-closing'])
+        self.assertEqual(batch.reopened, [])
+
+    def test_failed_write_rolls_back_written_files(self):
+        self.add_play('pending-opening', 'a.json')
+        self.add_play('pending-opening', 'b.json')
+        batch = EodBatch(self.plays_dir, client=FakeTradingClient([]))
+        moves = batch.plan().moves
+        real_write = eod_batch.atomic_write_json
+        writes = []
+
+        def failing_write(target, *args, **kwargs):
+            if writes:
+                raise OSError("disk full")
+            writes.append(target)
+            real_write(target, *args, **kwargs)
+
+        with mock.patch.object(eod_batch, 'atomic_write_json', failing_write):
+            self.assertEqual(batch.apply(moves), 0)
+
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(os.listdir(os.path.join(self.plays_dir, 'new')), [])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.plays_dir, 'pending-opening'))), ['a.json', 'b.json'])
+
+
+class FakeSessionTable:
+    def __init__(self, seconds_left):
+        self.seconds_left = seconds_left
+
+    def seconds_until_close(self, now):
+        return self.seconds_left
+
+
+class EodHoldTest(unittest.TestCase):
+    def setUp(self):
+        self.plays_dir = tempfile.mkdtemp()
+        for folder in ('new', 'pending-opening', 'open', 'pending-closing'):
+            os.makedirs(os.path.join(self.plays_dir, folder))
+        self.new_play = os.path.join(self.plays_dir, 'new', 'entry.json')
+        self.open_play = os.path.join(self.plays_dir, 'open', 'position.json')
+        eod_batch._eod_runs.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.plays_dir)
+        eod_batch._eod_runs.clear()
+
+    def run_batch(self, now, seconds_left):
+        with mock.patch.object(eod_batch, 'get_session_table', return_value=FakeSessionTable(seconds_left)), \
+                mock.patch.object(eod_batch, 'get_alpaca_client', return_value=FakeTradingClient([])):
+            return run_eod_batch_if_due(self.plays_dir, now)
+
+    def test_no_hold_before_the_batch_runs(self):
+        now = datetime(2026, 10, 16, 19, 50, tzinfo=timezone.utc)
+        self.assertIsNone(self.run_batch(now, seconds_left=600))
+        self.assertFalse(eod_holds_play(self.new_play, 'new', now))
+
+    def test_hold_lasts_for_the_session_only(self):
+        now = datetime(2026, 10, 16, 19, 57, tzinfo=timezone.utc)  # 15:57 ET
+        self.assertIsNotNone(self.run_batch(now, seconds_left=180))
+        self.assertIsNone(self.run_batch(now, seconds_left=120))  # once per session
+
+        self.assertTrue(eod_holds_play(self.new_play, 'new', now))
+        self.assertFalse(eod_holds_play(self.open_play, 'open', now))
+
+        next_session = datetime(2026, 10, 19, 13, 35, tzinfo=timezone.utc)
+        self.assertFalse(eod_holds_play(self.new_play, 'new', next_session))
+
+    def test_reopened_plays_are_held(self):
+        eod_batch._eod_runs[os.path.abspath(self.plays_dir)] = (datetime(2026, 10, 16).date(), {'position.json'})
+        now = datetime(2026, 10, 16, 19, 58, tzinfo=timezone.utc)
+        self.assertTrue(eod_holds_play(self.open_play, 'open', now))
+        self.assertFalse(eod_holds_play(os.path.join(self.plays_dir, 'open', 'other.json'), 'open', now))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from goldflipper.brokerage.limit_repricer import LimitRepricer, round_to_tick
+
+SETTINGS = {
+    'timeout_enabled': True,
+    'max_duration_minutes': 5,
+    'check_interval_seconds': 30,
+    'reprice_target': 'mid',
+    'reprice_steps': 5,
+    'max_slippage_pct': 10.0
+}
+
+
+class FakeTradingClient:
+    def __init__(self):
+        self.cancelled = []
+        self.replaced = []
+
+    def cancel_order_by_id(self, order_id):
+        self.cancelled.append(order_id)
+
+    def replace_order_by_id(self, order_id, request):
+        self.replaced.append((order_id, request))
+        return SimpleNamespace(id=f"{order_id}-replacement", status='accepted',
+                               client_order_id=request.client_order_id)
+
+
+class RoundToTickTest(unittest.TestCase):
+    def test_rounds_up_to_penny_below_three_dollars(self):
+        self.assertEqual(round_to_tick(1.001), 1.01)
+        self.assertEqual(round_to_tick(2.50), 2.50)
+
+    def test_rounds_up_to_nickel_from_three_dollars(self):
+        self.assertEqual(round_to_tick(3.01), 3.05)
+        self.assertEqual(round_to_tick(4.10), 4.10)
+
+
+class PlanTest(unittest.TestCase):
+    def setUp(self):
+        self.repricer = LimitRepricer(SETTINGS)
+        self.state = {'initial_price': 1.00}
+        self.quote = {'mid': 1.05, 'ask': 1.10}
+
+    def plan(self, current_limit, elapsed, since_last_check=None, quote=None):
+        return self.repricer.plan(self.state, current_limit, quote or self.quote, elapsed, since_last_check)
+
+    def test_steps_walk_toward_target(self):
+        # 5 steps over 300s: step n moves n/5 of the way from $1.00 to the $1.05 mid
+        prices = [self.plan(1.00, elapsed)['price'] for elapsed in (0, 60, 120, 180, 240)]
+        self.assertEqual(prices, [1.01, 1.02, 1.03, 1.04, 1.05])
+        self.assertEqual(self.plan(1.00, 120)['action'], 'replace')
+
+    def test_holds_when_limit_already_at_step(self):
+        decision = self.plan(1.02, 60)
+        self.assertEqual(decision['action'], 'hold')
+
+    def test_waits_for_check_interval(self):
+        self.assertEqual(self.plan(1.00, 60, since_last_check=10)['action'], 'wait')
+
+    def test_cancels_at_slippage_ceiling(self):
+        # The $1.30 mid is 30% above the $1.00 original; step 3 of 5 would be $1.18, above the 10% ceiling
+        decision = self.plan(1.05, 130, quote={'mid': 1.30})
+        self.assertEqual(decision['action'], 'cancel')
+        self.assertEqual(decision['price'], 1.18)
+        self.assertIn('max slippage', decision['reason'])
+
+    def test_cancels_after_max_duration(self):
+        self.assertEqual(self.plan(1.04, 300)['action'], 'cancel')
+
+    def test_holds_without_quote(self):
+        self.assertEqual(self.plan(1.00, 60, quote={'mid': 0})['action'], 'hold')
+
+
+class RepriceTest(unittest.TestCase):
+    def setUp(self):
+        self.repricer = LimitRepricer(SETTINGS)
+        self.client = FakeTradingClient()
+        self.submitted_at = datetime(2026, 10, 16, 14, 0, tzinfo=timezone.utc)
+        self.play = {'status': {'order_id': 'o-1', 'client_order_id': 'gf-open-abc-1'}}
+
+    def order(self, order_id='o-1', limit_price=1.00):
+        return SimpleNamespace(id=order_id, symbol='SPY261218C00600000', status='new',
+                               limit_price=limit_price, submitted_at=self.submitted_at)
+
+    def test_replace_uses_numbered_client_order_ids(self):
+        action = self.repricer.reprice(self.client, self.play, self.order(), {'mid': 1.05},
+                                       now=self.submitted_at + timedelta(seconds=60))
+        self.assertEqual(action, 'replace')
+        self.assertEqual(self.client.replaced[0][1].client_order_id, 'gf-open-abc-1-r1')
+        self.assertEqual(self.play['status']['order_id'], 'o-1-replacement')
+
+        action = self.repricer.reprice(self.client, self.play, self.order('o-1-replacement', 1.02), {'mid': 1.05},
+                                       now=self.submitted_at + timedelta(seconds=120))
+        self.assertEqual(action, 'replace')
+        # The suffix is added to the original id, not to the previous replacement's id
+        self.assertEqual(self.client.replaced[1][1].client_order_id, 'gf-open-abc-1-r2')
+        self.assertEqual(self.play['status']['reprice']['steps'], 2)
+        self.assertEqual(self.play['status']['reprice']['initial_price'], 1.00)
+
+    def test_cancel_at_ceiling_records_reason(self):
+        action = self.repricer.reprice(self.client, self.play, self.order(), {'mid': 2.00},
+                                       now=self.submitted_at + timedelta(seconds=60))
+        self.assertEqual(action, 'cancel')
+        self.assertEqual(self.client.cancelled, ['o-1'])
+        self.assertEqual(self.client.replaced, [])
+        self.assertIn('max slippage', self.play['status']['reprice']['cancelled_reason'])
+
+    def test_disabled_repricer_does_nothing(self):
+        repricer = LimitRepricer(dict(SETTINGS, timeout_enabled=False))
+        self.assertIsNone(repricer.reprice(self.client, self.play, self.order(), {'mid': 1.05},
+                                           now=self.submitted_at + timedelta(seconds=60)))
+        self.assertEqual((self.client.cancelled, self.client.replaced), ([], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from goldflipper.brokerage.order_submission import MAX_SUBMIT_ATTEMPTS, make_client_order_id, submit_order_idempotent
+
+
+class FakeTradingClient:
+    """Trading client whose submits fail and whose existing orders are keyed by client_order_id"""
+
+    def __init__(self, existing=None, fail_ids=()):
+        self.existing = dict(existing or {})
+        self.fail_ids = set(fail_ids)
+        self.submitted = []
+
+    def submit_order(self, request):
+        self.submitted.append(request.client_order_id)
+        if request.client_order_id in self.fail_ids:
+            raise TimeoutError("read timed out")
+        order = SimpleNamespace(id=f"order-{len(self.submitted)}", client_order_id=request.client_order_id,
+                                status='accepted', submitted_at=datetime.now(timezone.utc))
+        self.existing[request.client_order_id] = order
+        return order
+
+    def get_order_by_client_id(self, client_order_id):
+        if client_order_id not in self.existing:
+            raise LookupError(f"order not found for {client_order_id}")
+        return self.existing[client_order_id]
+
+
+def build_request(client_order_id):
+    return SimpleNamespace(client_order_id=client_order_id)
+
+
+def existing_order(order_id, status, age=timedelta(0)):
+    return SimpleNamespace(id=order_id, status=status, submitted_at=datetime.now(timezone.utc) - age)
+
+
+class MakeClientOrderIdTest(unittest.TestCase):
+    def test_deterministic_per_play_action_and_attempt(self):
+        self.assertEqual(make_client_order_id('play-1', 'open', 2), make_client_order_id('play-1', 'open', 2))
+        ids = {make_client_order_id('play-1', 'open'), make_client_order_id('play-1', 'close'),
+               make_client_order_id('play-1', 'open', 2), make_client_order_id('play-2', 'open')}
+        self.assertEqual(len(ids), 4)
+
+
+class SubmitOrderIdempotentTest(unittest.TestCase):
+    def test_submit_succeeds_with_first_attempt_id(self):
+        client = FakeTradingClient()
+        order, attempt = submit_order_idempotent(client, build_request, 'play-1', 'open')
+        self.assertEqual(attempt, 1)
+        self.assertEqual(order.client_order_id, make_client_order_id('play-1', 'open', 1))
+
+    def test_timed_out_submit_is_found_by_client_order_id(self):
+        client_order_id = make_client_order_id('play-1', 'open', 1)
+        placed = existing_order('order-live', 'new')
+        client = FakeTradingClient(existing={client_order_id: placed}, fail_ids={client_order_id})
+        order, attempt = submit_order_idempotent(client, build_request, 'play-1', 'open')
+        self.assertIs(order, placed)
+        self.assertEqual(attempt, 1)
+        self.assertEqual(client.submitted, [client_order_id])
+
+    def test_old_fill_is_adopted_instead_of_resubmitting(self):
+        client_order_id = make_client_order_id('play-1', 'open', 1)
+        filled = existing_order('order-filled', 'filled', age=timedelta(days=1))
+        client = FakeTradingClient(existing={client_order_id: filled}, fail_ids={client_order_id})
+        order, attempt = submit_order_idempotent(client, build_request, 'play-1', 'open')
+        self.assertIs(order, filled)
+        self.assertEqual(attempt, 1)
+        self.assertEqual(client.submitted, [client_order_id])
+
+    def test_dead_id_moves_on_to_next_attempt(self):
+        first = make_client_order_id('play-1', 'close', 1)
+        second = make_client_order_id('play-1', 'close', 2)
+        client = FakeTradingClient(existing={first: existing_order('order-old', 'canceled')}, fail_ids={first})
+        order, attempt = submit_order_idempotent(client, build_request, 'play-1', 'close')
+        self.assertEqual(attempt, 2)
+        self.assertEqual(order.client_order_id, second)
+        self.assertEqual(client.submitted, [first, second])
+
+    def test_start_attempt_continues_from_play_state(self):
+        client = FakeTradingClient()
+        order, attempt = submit_order_idempotent(client, build_request, 'play-1', 'open', start_attempt=3)
+        self.assertEqual(attempt, 3)
+        self.assertEqual(client.submitted, [make_client_order_id('play-1', 'open', 3)])
+
+    def test_submit_error_is_raised_when_no_order_exists(self):
+        client_order_id = make_client_order_id('play-1', 'open', 1)
+        client = FakeTradingClient(fail_ids={client_order_id})
+        with self.assertRaises(TimeoutError):
+            submit_order_idempotent(client, build_request, 'play-1', 'open')
+
+    def test_gives_up_after_max_attempts(self):
+        ids = [make_client_order_id('play-1', 'open', n) for n in range(1, MAX_SUBMIT_ATTEMPTS + 1)]
+        client = FakeTradingClient(existing={i: existing_order(i, 'rejected') for i in ids}, fail_ids=ids)
+        with self.assertRaises(RuntimeError):
+            submit_order_idempotent(client, build_request, 'play-1', 'open')
+        self.assertEqual(client.submitted, ids)
+
+
+if __name__ == '__main__':
+    unittest.main()